@@ -1,18 +1,79 @@
-from nicegui import ui
+from nicegui import run, ui
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import numpy as np
+import json
 import os
 import sys
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.dataset_store import open_dataset
+from src.downsampling import downsample
+from src.feature_store import FeatureStore
+from src.live_feed import SimulatorFeed, StoreFeed
+from src.policy_export import NumpyPolicy
+from src.ring_buffer import RingBuffer
+
 # -------------------------------------------------------------------
 # Veri yükleme
 # -------------------------------------------------------------------
+# Kolon deposu varsa yalnızca gereken kolonların son satırları memmap'ten
+# okunur; yoksa eski CSV'ye düşülür.
+# (python -m src.dataset_store convert data/simulated/line_data.csv data/simulated/line_data)
+STORE_PATH = "../data/simulated/line_data"
 DATA_PATH = "../data/simulated/line_data.csv"
-df = pd.read_csv(DATA_PATH)
+
+TAIL_COLUMNS = [
+    "time", "lead_time", "queue_length", "energy_consumption", "defects",
+    "operator_load", "machine_status", "wip_total",
+    "machine_A_status", "machine_B_status", "machine_C_status",
+]
 
 # Son 200 adım gösterilecek (Dashboard'da çok daha net görünüyor)
-tail_df = df.tail(200)
+if os.path.isdir(STORE_PATH):
+    tail_df = open_dataset(STORE_PATH).tail(200, columns=TAIL_COLUMNS)
+else:
+    tail_df = pd.read_csv(DATA_PATH, usecols=TAIL_COLUMNS).tail(200)
+
+
+# -------------------------------------------------------------------
+# Canlı mod ayarları
+# -------------------------------------------------------------------
+# DASHBOARD_LIVE=store → STORE_PATH'teki büyüyen depo izlenir
+# DASHBOARD_LIVE=sim   → simülatör arka planda akıtılır
+# (boş)                → yalnızca statik grafikler
+LIVE_MODE = os.environ.get("DASHBOARD_LIVE", "").lower()
+
+LIVE_COLUMNS = [
+    "time", "lead_time", "queue_length",
+    "machine_A_status", "machine_B_status", "machine_C_status",
+    # KPI deposu girdileri
+    "completed_jobs", "defects", "energy_consumption", "shift_id",
+]
+LIVE_CAPACITY = 1_000_000     # halka tamponda tutulan en fazla satır
+LIVE_POINTS = 500             # canlı grafiklerde tutulan son nokta sayısı
+HISTORY_POINTS = 2000         # geçmiş grafiği için seyreltme hedefi
+LIVE_TICK_S = 0.5             # yeni nokta gönderme aralığı
+HISTORY_REFRESH_S = 5.0       # geçmiş grafiğinin yeniden çizim aralığı
+SIM_TICKS_PER_POLL = 50       # sim modunda her tikte üretilen adım
+
+# Kayan KPI'lar (src.feature_store): tik başına O(1) güncellenir
+KPI_WINDOWS = (12, 48, 144)
+KPI_LABELS = [
+    ("Lead time ort. (48)", "lead_time_mean_48", "{:.2f}"),
+    ("Lead time std (48)", "lead_time_std_48", "{:.2f}"),
+    ("Kuyruk ort. (144)", "queue_length_mean_144", "{:.1f}"),
+    ("Throughput / adım (48)", "throughput_48", "{:.2f}"),
+    ("Hata oranı (144)", "defect_rate_144", "{:.1%}"),
+    ("Enerji / iş (144)", "energy_per_job_144", "{:.2f}"),
+    ("Vardiya throughput", "shift_throughput", "{:.2f}"),
+    ("Önceki vardiya", "prev_shift_throughput", "{:.2f}"),
+]
+KPI_TREND = "throughput_48"
 
 
 # -------------------------------------------------------------------
@@ -44,20 +105,73 @@ def plot_defects():
     return fig
 
 
+def live_figure(column, x=(), y=(), title=None):
+    fig = go.Figure(go.Scattergl(x=list(x), y=list(y), mode="lines", name=column))
+    fig.update_layout(title=title or column, margin=dict(l=40, r=10, t=40, b=30),
+                      uirevision=column)
+    return fig
+
+
+def history_figure(buffer):
+    x, y = downsample(buffer.column("time"), buffer.column("lead_time"), HISTORY_POINTS)
+    return live_figure("lead_time", x, y,
+                       title=f"Lead Time Geçmişi ({len(buffer):,} adım → {len(x)} nokta)")
+
+
+def extend_plot(plot, x, y):
+    """Yalnızca yeni noktaları tarayıcıdaki grafiğe ekler (Plotly.extendTraces)."""
+    update = {"x": [np.asarray(x).tolist()], "y": [np.asarray(y).tolist()]}
+    if hasattr(plot, "run_plot_method"):
+        plot.run_plot_method("extendTraces", update, [0], LIVE_POINTS)
+    else:
+        ui.run_javascript(
+            f"Plotly.extendTraces(getHtmlElement({plot.id}), {json.dumps(update)}, [0], {LIVE_POINTS})"
+        )
+
+
 # -------------------------------------------------------------------
-# RL Agent Mock (Gerçek PPO modeliyle bağlanabilir)
+# RL Agent (NumPy'a aktarılmış PPO politikası – torch/SB3 yüklenmez)
 # -------------------------------------------------------------------
+# python -m src.policy_export export ../models/ppo_model.zip ../models/ppo_policy.npz
+# Kayıtlı PPO, gözlem olarak son 24 adımlık wip_total penceresiyle
+# eğitildi (notebooks/05_rl_training.ipynb). Eğitim VecNormalize(norm_obs)
+# arkasındaydı; NumpyPolicy gözlemi dışa aktarılan istatistiklerle
+# standartlaştırır. İstatistikler yoksa (policy.obs_norm_missing: notebook
+# modeli bunları kaydetmedi) ham gözlemle çıkan aksiyon anlamsızdır
+# (hep "Hız Artır"), bu yüzden öneri gösterilmez. Model src.rl_train ile
+# yeniden eğitilip dışa aktarılınca öneri kendiliğinden açılır.
+POLICY_PATH = "../models/ppo_policy.npz"
+POLICY_OBS_COLUMN = "wip_total"
+ACTION_LABELS = ["Hız Azalt", "Sabit", "Hız Artır"]
+
+policy = NumpyPolicy(POLICY_PATH) if os.path.exists(POLICY_PATH) else None
+
+
+def policy_observation():
+    """Politikanın gözlem şekline uygun son pencere."""
+    n = int(np.prod(policy.obs_shape))
+    window = tail_df[POLICY_OBS_COLUMN].to_numpy(dtype=np.float32)[-n:]
+    return window.reshape(policy.obs_shape)
+
+
 def rl_action_suggestion(state_vector):
     """
-    Şimdilik rastgele aksiyon üretiyoruz.
-    Daha sonra gerçek PPO modelini load edip bağlayabilirsin:
-
-    from stable_baselines3 import PPO
-    model = PPO.load("../models/ppo_model.zip")
-    action, _ = model.predict(obs)
+    state_vector: politikanın ham gözlemi (bkz. policy_observation).
+    Dışa aktarılmış politika yoksa rastgele öneri döner; normalizasyon
+    istatistikleri eksikse None (öneri yok).
     """
-    actions = ["Hız Azalt", "Sabit", "Hız Artır"]
-    return np.random.choice(actions)
+    if policy is None:
+        return np.random.choice(ACTION_LABELS)
+    if policy.obs_norm_missing:
+        return None
+
+    action, _ = policy.predict(state_vector, deterministic=True)
+    if policy.discrete:
+        return ACTION_LABELS[int(action)]
+
+    # Sürekli aksiyon [-1, 1] → üç etiket
+    a = float(np.asarray(action).ravel()[0])
+    return ACTION_LABELS[0] if a < -1 / 3 else ACTION_LABELS[2] if a > 1 / 3 else ACTION_LABELS[1]
 
 
 # -------------------------------------------------------------------
@@ -68,6 +182,112 @@ ui.label("Üretim Hattı | RL + Zaman Serisi Kontrol Paneli") \
 
 ui.separator()
 
+# -------------------------------------------------------------------
+# Canlı akış (DASHBOARD_LIVE ayarlıysa)
+# -------------------------------------------------------------------
+if LIVE_MODE:
+    if LIVE_MODE == "store":
+        live_feed = StoreFeed(STORE_PATH, LIVE_COLUMNS, backfill=LIVE_CAPACITY)
+    elif LIVE_MODE == "sim":
+        live_feed = SimulatorFeed(LIVE_COLUMNS, ticks_per_poll=SIM_TICKS_PER_POLL)
+    else:
+        raise ValueError(f"Bilinmeyen DASHBOARD_LIVE: {LIVE_MODE!r} (store | sim)")
+
+    live_buffer = RingBuffer(LIVE_CAPACITY, LIVE_COLUMNS)
+    kpi_store = FeatureStore(KPI_WINDOWS, history=LIVE_POINTS)
+    first_chunk = live_feed.poll()
+    if first_chunk is not None:
+        live_buffer.extend(first_chunk)
+        # Büyük backfill'in tamamı gerekmez: pencereler + trend grafiği kadarı
+        kpi_store.update_chunk(first_chunk, last=max(KPI_WINDOWS) + LIVE_POINTS)
+
+    def live_snapshot(column):
+        return live_figure(column, live_buffer.column("time", LIVE_POINTS),
+                           live_buffer.column(column, LIVE_POINTS),
+                           title=f"{column} (Canlı, son {LIVE_POINTS})")
+
+    ui.label("Canlı Akış").classes("text-2xl font-bold text-center mt-2")
+
+    with ui.row().classes("w-full justify-center"):
+        live_plots = {}
+        for col in ("lead_time", "queue_length"):
+            with ui.card().classes("w-1/3 p-4"):
+                live_plots[col] = ui.plotly(live_snapshot(col))
+
+        with ui.card().classes("w-1/4 p-4"):
+            ui.label("Makine Durumları (Canlı)").classes("text-lg font-semibold")
+            live_status = {m: ui.label() for m in ("A", "B", "C")}
+
+    with ui.row().classes("w-full justify-center"):
+        with ui.card().classes("w-2/3 p-4"):
+            history_plot = ui.plotly(history_figure(live_buffer))
+
+    def kpi_snapshot():
+        return live_figure(KPI_TREND, kpi_store.history_column("tick"),
+                           kpi_store.history_column(KPI_TREND),
+                           title=f"{KPI_TREND} (Canlı KPI)")
+
+    with ui.row().classes("w-full justify-center"):
+        with ui.card().classes("w-1/4 p-4"):
+            ui.label("KPI'lar (Canlı)").classes("text-lg font-semibold")
+            kpi_labels = {name: ui.label() for _, name, _ in KPI_LABELS}
+        with ui.card().classes("w-1/2 p-4"):
+            kpi_plot = ui.plotly(kpi_snapshot())
+
+    live_state = {"seen": live_buffer.total, "kpi_seen": kpi_store.history.total}
+
+    def update_kpis():
+        values = kpi_store.current()
+        for title, name, fmt in KPI_LABELS:
+            v = values[name]
+            kpi_labels[name].set_text(f"{title}: {'—' if np.isnan(v) else fmt.format(v)}")
+
+    def update_status():
+        if live_buffer.total == 0:
+            return
+        for m, label in live_status.items():
+            ok = int(live_buffer.latest(f"machine_{m}_status")) == 1
+            label.set_text(f"{m}: {'Çalışıyor' if ok else 'Arızalı'}")
+            label.classes(replace="text-xl " + ("text-green-600" if ok else "text-red-600"))
+
+    async def live_tick():
+        chunk = await run.io_bound(live_feed.poll)
+        if chunk is not None:
+            live_buffer.extend(chunk)
+            kpi_store.update_chunk(chunk, last=max(KPI_WINDOWS) + LIVE_POINTS)
+
+        kpi_new = kpi_store.since(live_state["kpi_seen"])
+        live_state["kpi_seen"] = kpi_store.history.total
+        if len(kpi_new["tick"]):
+            extend_plot(kpi_plot, kpi_new["tick"], kpi_new[KPI_TREND])
+            update_kpis()
+
+        new = live_buffer.since(live_state["seen"])
+        live_state["seen"] = live_buffer.total
+        if len(new["time"]) == 0:
+            return
+
+        # Grafik zaten LIVE_POINTS ile sınırlı; fazlası gönderilmez
+        x = new["time"][-LIVE_POINTS:]
+        for col, plot in live_plots.items():
+            extend_plot(plot, x, new[col][-LIVE_POINTS:])
+        update_status()
+
+    def refresh_history():
+        # Seyreltilmiş geçmiş + canlı grafiklerin sunucu tarafı kopyası
+        # (yeni bağlanan istemciler güncel görüntüyü alır)
+        history_plot.update_figure(history_figure(live_buffer))
+        for col, plot in live_plots.items():
+            plot.update_figure(live_snapshot(col))
+        kpi_plot.update_figure(kpi_snapshot())
+
+    update_status()
+    update_kpis()
+    ui.timer(LIVE_TICK_S, live_tick)
+    ui.timer(HISTORY_REFRESH_S, refresh_history)
+
+    ui.separator()
+
 with ui.row().classes("w-full justify-center"):
 
     # ----------- Lead Time ------------
@@ -92,19 +312,19 @@ with ui.row().classes("w-full justify-center"):
     # ----------- Machine Status Cards ------------
     with ui.card().classes("w-1/4 p-4"):
         ui.label("Makine A Durum").classes("text-lg font-semibold")
-        statusA = int(df["machine_A_status"].iloc[-1])
+        statusA = int(tail_df["machine_A_status"].iloc[-1])
         ui.label("Çalışıyor" if statusA == 1 else "Arızalı") \
             .classes("text-xl text-green-600" if statusA == 1 else "text-xl text-red-600")
 
     with ui.card().classes("w-1/4 p-4"):
         ui.label("Makine B Durum").classes("text-lg font-semibold")
-        statusB = int(df["machine_B_status"].iloc[-1])
+        statusB = int(tail_df["machine_B_status"].iloc[-1])
         ui.label("Çalışıyor" if statusB == 1 else "Arızalı") \
             .classes("text-xl text-green-600" if statusB == 1 else "text-xl text-red-600")
 
     with ui.card().classes("w-1/4 p-4"):
         ui.label("Makine C Durum").classes("text-lg font-semibold")
-        statusC = int(df["machine_C_status"].iloc[-1])
+        statusC = int(tail_df["machine_C_status"].iloc[-1])
         ui.label("Çalışıyor" if statusC == 1 else "Arızalı") \
             .classes("text-xl text-green-600" if statusC == 1 else "text-xl text-red-600")
 
@@ -121,18 +341,26 @@ with ui.card().classes("w-1/2 mx-auto p-6"):
         .classes("text-lg font-semibold")
 
     # State vector hazırlama
-    last_state = df[["queue_length", "operator_load", "machine_status", "lead_time"]].iloc[-1]
+    last_state = tail_df[["queue_length", "operator_load", "machine_status", "lead_time"]].iloc[-1]
 
     ui.label(f"State → {last_state.values}").classes("mt-2")
 
-    if ui.button("Aksiyon Tahmin Et (PPO ile bağlanabilir)").classes("mt-4"):
-
-        suggestion = rl_action_suggestion(last_state.values)
+    def on_suggest():
+        obs = policy_observation() if policy is not None else last_state.values
+        suggestion = rl_action_suggestion(obs)
+        if suggestion is None:
+            ui.notify("PPO önerisi kullanılamıyor: politikanın gözlem normalizasyonu "
+                      "istatistikleri (VecNormalize) kayıtlı değil",
+                      color="warning",
+                      position="top")
+            return
 
         ui.notify(f"RL Ajanı Önerisi: {suggestion}",
                   color="primary",
                   position="top")
 
+    ui.button("Aksiyon Tahmin Et (PPO)", on_click=on_suggest).classes("mt-4")
+
 ui.separator()
 
 # -------------------------------------------------------------------
@@ -0,0 +1,75 @@
+"""
+RLveZS – üretim hattı simülasyonu, zaman serisi tahmini ve RL.
+
+Alt modüller ve sık kullanılan isimler tembel (PEP 562) yüklenir:
+`import src` hiçbir ağır çerçeveyi (tensorflow, torch, statsmodels,
+scikit-learn, stable-baselines3) içe aktarmaz; bir isim ilk kez
+kullanıldığında yalnızca onun modülü yüklenir.
+
+    from src import ProductionLineEnv      # yalnızca gymnasium + numpy
+    src.LSTMPredictor                      # bu noktada torch yüklenir
+
+İçe aktarma bütçesi: python -m src.import_budget
+"""
+
+import importlib
+
+# isim → tanımlandığı alt modül
+_LAZY_ATTRS = {
+    # simülasyon & veri
+    "simulate_production_line_advanced": "data_simulation",
+    "simulate_production_line_batch": "data_simulation",
+    "iter_production_line_chunks": "data_simulation",
+    "ProductionLineSim": "data_simulation",
+    "simulate_production_line_events": "event_simulation",
+    "open_dataset": "dataset_store",
+    "FeatureStore": "feature_store",
+    "write_dataset": "dataset_store",
+    "cached_simulate": "sim_cache",
+    "run_sweep": "sweep",
+    # ortamlar
+    "ProductionLineEnv": "env_rl",
+    "ProductionLineSimEnv": "env_rl",
+    "ProductionLineVectorEnv": "vec_env_rl",
+    "ProductionLineSB3VecEnv": "vec_env_sb3",
+    # tahminciler
+    "LSTMModel": "lstm_torch",
+    "LSTMPredictor": "lstm_torch",
+    "StreamingLSTMPredictor": "lstm_torch",
+    "create_lstm": "lstm_model",
+    "sarima_forecast": "time_series_models",
+    "RollingSarimaForecaster": "time_series_models",
+    "sliding_windows": "windowing",
+    # politika & metrikler
+    "NumpyPolicy": "policy_export",
+    "evaluate_policies": "evaluation",
+    "compute_mape_rmse": "metrics",
+    "discounted_reward": "metrics",
+    "ForecastAccumulator": "streaming_metrics",
+}
+
+_SUBMODULES = {
+    "benchmarks", "data_simulation", "dataset_store", "downsampling", "env_rl",
+    "evaluation", "event_simulation", "feature_store", "import_budget",
+    "inference_service", "live_feed", "lstm_model", "lstm_search", "lstm_torch",
+    "metrics", "policy_export", "prediction_table", "profiling", "ring_buffer",
+    "rl_train", "seq_utils", "shared_arrays", "sim_cache", "streaming_metrics",
+    "sweep", "time_series_models", "vec_env_rl", "vec_env_sb3", "windowing",
+}
+
+__all__ = sorted(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(f"{__name__}.{_LAZY_ATTRS[name]}"), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value   # sonraki erişimler __getattr__'a uğramaz
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS) | _SUBMODULES)
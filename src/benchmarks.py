@@ -0,0 +1,378 @@
+"""
+============================================================
+ TAHMİN MODELLERİ KIYASLAMA (BENCHMARK) PAKETİ
+============================================================
+
+lead_time için üç tahminciyi aynı simülatör verileri üzerinde,
+artan seri uzunluklarıyla karşılaştırır:
+
+- sarima : statsmodels SARIMAX (time_series_models ile aynı model)
+- keras  : lstm_model.create_lstm (tensorflow kurulu değilse atlanır)
+- torch  : lstm_torch.LSTMModel (torch kurulu değilse atlanır)
+
+Her koşu için ölçülenler:
+- fit_s                : eğitim süresi (saniye)
+- stats                : tek pencere tahmin gecikmesi (min/max/mean/stddev/median, saniye)
+- throughput_per_s     : test penceresinin tamamı tek batch'te → pencere/saniye
+- peak_tracemalloc_mb  : fit sırasında Python yığınının tepe değeri
+                         (torch/tf'nin C++ ayırmaları bu sayıya girmez)
+- max_rss_mb           : sürecin o ana kadarki tepe RSS'i (azalmaz; backend'leri
+                         ayrı ölçmek için --only ile ayrı süreçlerde koşun)
+- mape, rmse           : metrics.compute_mape_rmse, ölçeklenmemiş uzayda
+- mape_nonzero         : aynı MAPE, gerçek değeri 0 olan adımlar hariç
+                         (lead_time'da sıfırlar var; sklearn MAPE'si orada patlar)
+
+Çıktı pytest-benchmark JSON düzenindedir ("benchmarks" listesi, her
+kayıtta name/group/params/stats/extra_info). --compare ile önceki bir
+rapora göre değişimler yazdırılır; eşiği aşan yavaşlamalarda çıkış kodu 1.
+
+Kullanım:
+---------
+python -m src.benchmarks --lengths 1000,2000,5000 --out reports/bench.json
+python -m src.benchmarks --only torch --epochs 5 --compare reports/bench.json
+
+============================================================
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.metrics import compute_mape_rmse
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+WINDOW = 10
+
+
+class BackendUnavailable(Exception):
+    """Backend'in bağımlılığı kurulu değil → kayıt atlanır."""
+
+
+# ============================================================
+# YARDIMCILAR
+# ============================================================
+
+def _timing_stats(fn, rounds=50, warmup=3):
+    for _ in range(warmup):
+        fn()
+    times = np.empty(rounds)
+    for i in range(rounds):
+        t = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - t
+    return {
+        "min": float(times.min()),
+        "max": float(times.max()),
+        "mean": float(times.mean()),
+        "stddev": float(times.std(ddof=1)) if rounds > 1 else 0.0,
+        "median": float(np.median(times)),
+        "rounds": rounds,
+    }
+
+
+def _measure_fit(fit_fn):
+    """fit_fn() → (sonuç, süre, tracemalloc tepe MB)."""
+    tracemalloc.start()
+    t = time.perf_counter()
+    try:
+        result = fit_fn()
+        elapsed = time.perf_counter() - t
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak / 1024**2
+
+
+def _max_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024**2 if sys.platform == "darwin" else rss / 1024
+
+
+def _throughput(fn, n_items, repeat=3):
+    fn()
+    t = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return n_items * repeat / (time.perf_counter() - t)
+
+
+def _scores(true, pred):
+    true, pred = np.asarray(true), np.asarray(pred)
+    mape, rmse = compute_mape_rmse(true, pred)
+    nz = true != 0
+    mape_nz = compute_mape_rmse(true[nz], pred[nz])[0] if nz.any() else float("nan")
+    return {"mape": mape, "mape_nonzero": mape_nz, "rmse": rmse}
+
+
+def load_series(T, seed=42):
+    """Simülatör lead_time serisi (önbellekten)."""
+    from src.sim_cache import cached_simulate
+    return np.asarray(cached_simulate(T=T, seed=seed)["lead_time"], dtype=np.float64)
+
+
+def _scaled_windows(series, split=0.8):
+    """Notebook'taki düzen: MinMax ölçek, 10'luk pencere, %80 eğitim."""
+    from numpy.lib.stride_tricks import sliding_window_view
+    from sklearn.preprocessing import MinMaxScaler
+
+    scaler = MinMaxScaler()
+    scaled = scaler.fit_transform(series.reshape(-1, 1)).ravel().astype(np.float32)
+
+    X = sliding_window_view(scaled, WINDOW)[:-1]
+    y = scaled[WINDOW:]
+    cut = int(len(X) * split)
+    return scaler, X[:cut], y[:cut], np.ascontiguousarray(X[cut:]), series[WINDOW:][cut:]
+
+
+# ============================================================
+# BACKEND'LER
+# ============================================================
+
+def bench_sarima(series, order=(2, 1, 2), seasonal_order=(1, 1, 1, 12), **_):
+    try:
+        from statsmodels.tsa.statespace.sarimax import SARIMAX
+    except ImportError as exc:
+        raise BackendUnavailable(str(exc))
+
+    cut = int(len(series) * 0.8)
+    train, test = series[:cut], series[cut:]
+
+    results, fit_s, peak = _measure_fit(
+        lambda: SARIMAX(train, order=order, seasonal_order=seasonal_order).fit(disp=False)
+    )
+
+    # Tek adım: mevcut durumdan 1 adımlık tahmin
+    stats = _timing_stats(lambda: results.forecast(1), rounds=30)
+    # Batch: test bölgesinin tamamı için parametreler sabit, tek adım ileri tahminler
+    preds = results.extend(test).predict()
+    throughput = _throughput(lambda: results.extend(test).predict(), len(test))
+
+    return stats, {"fit_s": fit_s, "throughput_per_s": throughput,
+                   "peak_tracemalloc_mb": peak, **_scores(test, preds)}
+
+
+def bench_torch(series, epochs=2, batch_size=32, **_):
+    try:
+        import torch
+        import torch.nn as nn
+        from src.lstm_torch import LSTMModel
+    except ImportError as exc:
+        raise BackendUnavailable(str(exc))
+
+    scaler, X_train, y_train, X_test, y_true = _scaled_windows(series)
+    X = torch.from_numpy(np.ascontiguousarray(X_train)).unsqueeze(-1)
+    y = torch.from_numpy(np.ascontiguousarray(y_train))
+
+    def fit(X, y, epochs):
+        torch.manual_seed(0)
+        model = LSTMModel()
+        optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+        loss_fn = nn.MSELoss()
+        gen = torch.Generator().manual_seed(0)
+        for _ in range(epochs):
+            model.train()
+            for idx in torch.randperm(len(X), generator=gen).split(batch_size):
+                optimizer.zero_grad()
+                loss = loss_fn(model(X[idx]).squeeze(-1), y[idx])
+                loss.backward()
+                optimizer.step()
+        return model.eval()
+
+    # İlk backward/optimizer adımı tembel modül yüklemesi yapar; ölçüme girmesin
+    fit(X[:batch_size], y[:batch_size], 1)
+    model, fit_s, peak = _measure_fit(lambda: fit(X, y, epochs))
+
+    x_test = torch.from_numpy(X_test).unsqueeze(-1)
+    one = x_test[:1]
+
+    def predict(x):
+        with torch.inference_mode():
+            return model(x)
+
+    stats = _timing_stats(lambda: predict(one))
+    throughput = _throughput(lambda: predict(x_test), len(x_test))
+
+    preds = predict(x_test).reshape(-1).numpy()
+    preds = scaler.inverse_transform(preds.reshape(-1, 1)).ravel()
+    return stats, {"fit_s": fit_s, "throughput_per_s": throughput,
+                   "peak_tracemalloc_mb": peak, **_scores(y_true, preds)}
+
+
+def bench_keras(series, epochs=2, batch_size=32, **_):
+    try:
+        import tensorflow  # noqa: F401  (create_lstm TF'yi içeride yükler)
+        from src.lstm_model import create_lstm
+    except ImportError as exc:
+        raise BackendUnavailable(str(exc))
+
+    scaler, X_train, y_train, X_test, y_true = _scaled_windows(series)
+    X = X_train[..., None]
+    x_test = X_test[..., None]
+
+    _keras_fit(create_lstm(), X[:batch_size], y_train[:batch_size], 1, batch_size)  # ısınma
+    model, fit_s, peak = _measure_fit(lambda: _keras_fit(create_lstm(), X, y_train, epochs, batch_size))
+
+    one = x_test[:1]
+    # model.predict her çağrıda veri hattı kurar; tek pencere için doğrudan çağrı
+    stats = _timing_stats(lambda: model(one, training=False))
+    throughput = _throughput(lambda: model.predict(x_test, batch_size=len(x_test), verbose=0), len(x_test))
+
+    preds = model.predict(x_test, batch_size=len(x_test), verbose=0).ravel()
+    preds = scaler.inverse_transform(preds.reshape(-1, 1)).ravel()
+    return stats, {"fit_s": fit_s, "throughput_per_s": throughput,
+                   "peak_tracemalloc_mb": peak, **_scores(y_true, preds)}
+
+
+def _keras_fit(model, X, y, epochs, batch_size):
+    model.fit(X, y, epochs=epochs, batch_size=batch_size, verbose=0)
+    return model
+
+
+BENCHMARKS = {
+    "sarima": bench_sarima,
+    "keras": bench_keras,
+    "torch": bench_torch,
+}
+
+
+# ============================================================
+# RAPOR
+# ============================================================
+
+def _commit_info():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT,
+                             capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain"], cwd=PROJECT_ROOT,
+                               capture_output=True, text=True, check=True)
+        return {"id": out.stdout.strip(), "dirty": bool(dirty.stdout.strip())}
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+
+
+def _machine_info():
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python_version": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmarks(lengths=(1000, 2000, 5000), only=None, seed=42, epochs=2, verbose=True):
+    """Tüm (backend, uzunluk) çiftlerini koşturur → pytest-benchmark düzeninde dict."""
+    names = only or list(BENCHMARKS)
+    records, skipped = [], {}
+
+    for T in lengths:
+        series = load_series(T, seed)
+        for name in names:
+            if name in skipped:
+                continue
+            try:
+                stats, extra = BENCHMARKS[name](series, epochs=epochs)
+            except BackendUnavailable as exc:
+                skipped[name] = str(exc)
+                if verbose:
+                    print(f"[atlandı] {name}: {exc}")
+                continue
+
+            extra = {k: float(v) for k, v in extra.items()}
+            extra["max_rss_mb"] = _max_rss_mb()
+            records.append({
+                "name": f"test_{name}[T={T}]",
+                "fullname": f"src/benchmarks.py::test_{name}[T={T}]",
+                "group": name,
+                "params": {"T": T, "seed": seed, "epochs": epochs},
+                "stats": stats,
+                "extra_info": extra,
+            })
+            if verbose:
+                print(f"{name:7s} T={T:6d}  fit {extra['fit_s']:7.2f}s  "
+                      f"tek {stats['median']*1e3:8.3f}ms  "
+                      f"batch {extra['throughput_per_s']:10.0f}/s  "
+                      f"mape(≠0) {extra['mape_nonzero']:.3f}  rmse {extra['rmse']:.2f}")
+
+    return {
+        "machine_info": _machine_info(),
+        "commit_info": _commit_info(),
+        "benchmarks": records,
+        "skipped": skipped,
+        "datetime": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "version": "rlvezs-bench-1",
+    }
+
+
+def compare_reports(old, new, threshold=0.2):
+    """
+    İki raporu isim bazında karşılaştırır. Dönüş: (satırlar, gerileme var mı).
+    Gerileme: tek pencere medyanı ya da fit süresi threshold oranından fazla arttı
+    veya batch verimi aynı oranda düştü.
+    """
+    before = {b["name"]: b for b in old["benchmarks"]}
+    lines, regressed = [], False
+
+    for b in new["benchmarks"]:
+        prev = before.get(b["name"])
+        if prev is None:
+            continue
+        changes = {
+            "median": b["stats"]["median"] / prev["stats"]["median"] - 1,
+            "fit_s": b["extra_info"]["fit_s"] / prev["extra_info"]["fit_s"] - 1,
+            "throughput": 1 - b["extra_info"]["throughput_per_s"] / prev["extra_info"]["throughput_per_s"],
+        }
+        bad = [k for k, v in changes.items() if v > threshold]
+        regressed |= bool(bad)
+        lines.append(
+            f"{b['name']:22s} " + "  ".join(f"{k} {v:+.1%}" for k, v in changes.items())
+            + ("   ← GERİLEME: " + ", ".join(bad) if bad else "")
+        )
+    return lines, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="lead_time tahmincileri kıyaslama paketi")
+    parser.add_argument("--lengths", default="1000,2000,5000")
+    parser.add_argument("--only", default=None, help="virgülle ayrılmış: sarima,keras,torch")
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=os.path.join(PROJECT_ROOT, "reports", "benchmarks.json"))
+    parser.add_argument("--compare", default=None, help="karşılaştırılacak önceki rapor")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    lengths = [int(v) for v in args.lengths.split(",")]
+    only = args.only.split(",") if args.only else None
+    unknown = set(only or []) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Bilinmeyen backend: {', '.join(sorted(unknown))}")
+
+    report = run_benchmarks(lengths, only, args.seed, args.epochs)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Rapor: {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            old = json.load(f)
+        lines, regressed = compare_reports(old, report, args.threshold)
+        print("\n".join(lines))
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -29,12 +29,70 @@ from src.data_simulation import simulate_production_line_advanced
 df = simulate_production_line_advanced(T=2000)
 df.head()
 
+# 200 replikasyon tek seferde (uzun format, "replication" kolonu ile)
+from src.data_simulation import simulate_production_line_batch
+reps = simulate_production_line_batch(n_reps=200, T=2000, seed=42)
+
+# Çok uzun koşular: sabit boyutlu parçalarla akış (sınırlı bellek)
+from src.data_simulation import iter_production_line_chunks
+for chunk in iter_production_line_chunks(T=5_000_000, chunk_size=50_000):
+    ...
+
+# Adım adım, dallanabilir çekirdek (kapalı döngü RL, lookahead)
+from src.data_simulation import ProductionLineSim
+sim = ProductionLineSim(seed=42)
+row = sim.step(action=[1.2, 1.0, 0.8])      # makine hız çarpanları
+branch = sim.clone(rng=np.random.default_rng(0))
+
 ============================================================
 """
 
+import copy
+import inspect
+
 import numpy as np
 import pandas as pd
 
+from src import profiling
+
+
+# Simülasyonun her adımda kaydettiği ham kolonlar (sıra önemli)
+RECORD_COLUMNS = [
+    "time","step","hour","shift_id",
+    "normal_queue","priority_queue","wip_total",
+    "completed_jobs","defect_rate","defects",
+    "energy_consumption",
+    "operator_load","operator_skill","operator_fatigue",
+    "machine_A_status","machine_B_status","machine_C_status",
+    "machine_A_speed","machine_B_speed","machine_C_speed",
+    "maintenance_A","maintenance_B","maintenance_C",
+    "demand_spike_flag",
+]
+
+MACHINES = ("A", "B", "C")
+
+# ProductionLineSim.step() satırında kolon → indeks
+ROW_INDEX = {c: i for i, c in enumerate(RECORD_COLUMNS)}
+
+# Kayıtlardan türetilen RL kolonları
+DERIVED_COLUMNS = ["queue_length", "lead_time", "machine_status"]
+
+OUTPUT_COLUMNS = RECORD_COLUMNS + DERIVED_COLUMNS
+
+# Kolon tamponlarının tipleri: durum/bayrak → int8, hız/kuyruk → float32
+COLUMN_DTYPES = {
+    "time": np.float64, "step": np.int32, "hour": np.int8, "shift_id": np.int8,
+    "normal_queue": np.float32, "priority_queue": np.float32, "wip_total": np.float32,
+    "completed_jobs": np.int32, "defect_rate": np.float32, "defects": np.int32,
+    "energy_consumption": np.float32,
+    "operator_load": np.float32, "operator_skill": np.float32, "operator_fatigue": np.float32,
+    "machine_A_status": np.int8, "machine_B_status": np.int8, "machine_C_status": np.int8,
+    "machine_A_speed": np.float32, "machine_B_speed": np.float32, "machine_C_speed": np.float32,
+    "maintenance_A": np.int8, "maintenance_B": np.int8, "maintenance_C": np.int8,
+    "demand_spike_flag": np.int8,
+    "queue_length": np.float32, "lead_time": np.float32, "machine_status": np.float32,
+}
+
 
 # =====================================================================
 #  ANA GELİŞMİŞ ÜRETİM HATTI SİMÜLASYON FONKSİYONU
@@ -61,61 +119,248 @@ def simulate_production_line_advanced(
     energy_per_speed: float = 0.8,
     noise_level: float = 0.15,
     seed: int | None = 42,
+    rng: np.random.Generator | None = None,
 ) -> pd.DataFrame:
     """
     Gelişmiş üretim hattı dijital ikiz simülasyonu.
+
+    Kayıtlar önceden ayrılmış, tipli kolon tamponlarına yazılır
+    (bkz. COLUMN_DTYPES). Çok uzun koşular için
+    iter_production_line_chunks ile parça parça akış kullanılabilir.
+
+    rng verilirse global np.random durumuna dokunulmaz ve seed yok
+    sayılır; paralel koşular için her işe ayrı Generator verilmelidir.
     """
 
-    if seed is not None:
-        np.random.seed(seed)
+    params = {k: v for k, v in locals().items() if k not in ("T", "seed", "rng")}
+    chunk = next(_production_line_chunks(T, max(T, 1), seed, params, rng))
+    return _chunk_to_frame(chunk)
 
-    steps = np.arange(T)
-    times = steps * dt
-
-    # Operatör parametreleri
-    operator_skill = 0.4
-    operator_fatigue = 0.2
-    operator_load = 0.7
-
-    # Kuyruklar
-    normal_queue = 0.0
-    priority_queue = 0.0
-
-    # Makine parametre setleri
-    machines = ["A", "B", "C"]
-    status = {m: 1 for m in machines}
-    downtime_timer = {m: 0 for m in machines}
-    maintenance_timer = {m: 0 for m in machines}
-
-    base_service = {"A": base_service_A, "B": base_service_B, "C": base_service_C}
-    breakdown_prob = {"A": breakdown_prob_A, "B": breakdown_prob_B, "C": breakdown_prob_C}
-    avg_downtime = {"A": avg_downtime_A, "B": avg_downtime_B, "C": avg_downtime_C}
-    maintenance_interval = {
-        "A": maintenance_interval_A,
-        "B": maintenance_interval_B,
-        "C": maintenance_interval_C,
-    }
 
-    # Kayıt yapısı
-    cols = [
-        "time","step","hour","shift_id",
-        "normal_queue","priority_queue","wip_total",
-        "completed_jobs","defect_rate","defects",
-        "energy_consumption",
-        "operator_load","operator_skill","operator_fatigue",
-        "machine_A_status","machine_B_status","machine_C_status",
-        "machine_A_speed","machine_B_speed","machine_C_speed",
-        "maintenance_A","maintenance_B","maintenance_C",
-        "demand_spike_flag",
-    ]
-    records = {c: [] for c in cols}
-
-    # ============================================================
-    #  ANA ZAMAN DÖNGÜSÜ
-    # ============================================================
-    for idx, t in enumerate(steps):
-
-        current_time = times[idx]
+# =====================================================================
+#  PARÇALI (CHUNKED) AKIŞ
+# =====================================================================
+def iter_production_line_chunks(
+    T: int = 2000,
+    chunk_size: int = 10_000,
+    seed: int | None = 42,
+    as_frame: bool = True,
+    rng: np.random.Generator | None = None,
+    **params,
+):
+    """
+    simulate_production_line_advanced ile aynı koşuyu chunk_size
+    satırlık parçalar halinde üretir (generator). Bellek kullanımı T'den
+    bağımsızdır; parçalar diske ya da ortama akıtılabilir.
+
+    as_frame=True  → her parça DataFrame (index küresel adım numarası)
+    as_frame=False → her parça {kolon: np.ndarray} sözlüğü
+
+    Türetilmiş kolonlar parça sınırları boyunca artımlı hesaplanır:
+    lead_time ffill önceki parçanın son geçerli değerini taşır. Henüz hiç
+    iş tamamlanmamışken kalan baştaki boşluklar, o parçanın wip
+    ortalamasıyla doldurulur (tek parçada tam koşuyla birebir aynı).
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size pozitif olmalı: {chunk_size}")
+
+    p = _simulation_params(params)
+    start = 0
+    for chunk in _production_line_chunks(T, chunk_size, seed, p, rng):
+        yield _chunk_to_frame(chunk, start) if as_frame else chunk
+        start += len(chunk["step"])
+
+
+def _chunk_to_frame(chunk: dict, start: int = 0) -> pd.DataFrame:
+    n = len(chunk["step"])
+    return pd.DataFrame(
+        {c: chunk[c] for c in OUTPUT_COLUMNS},
+        index=pd.RangeIndex(start, start + n),
+    )
+
+
+class _GeneratorRandomState:
+    """
+    np.random.Generator'ı döngünün kullandığı eski np.random arayüzüyle
+    (rand, randn, randint, choice, poisson, binomial) sarar.
+    """
+
+    __slots__ = ("_rng",)
+
+    def __init__(self, rng: np.random.Generator):
+        self._rng = rng
+
+    def rand(self):
+        return self._rng.random()
+
+    def randn(self):
+        return self._rng.standard_normal()
+
+    def randint(self, low, high):
+        return int(self._rng.integers(low, high))
+
+    def choice(self, a, p=None):
+        return self._rng.choice(a, p=p)
+
+    def poisson(self, lam):
+        return self._rng.poisson(lam)
+
+    def binomial(self, n, p):
+        return self._rng.binomial(n, p)
+
+    def get_state(self):
+        return self._rng.bit_generator.state
+
+    def set_state(self, state):
+        self._rng.bit_generator.state = state
+
+
+# =====================================================================
+#  ADIMLANABİLİR SİMÜLATÖR ÇEKİRDEĞİ
+# =====================================================================
+class ProductionLineSim:
+    """
+    simulate_production_line_advanced'ın tek tik dinamiği, durumu
+    açık bir nesnede: kuyruklar, makine zamanlayıcıları, operatör
+    yorgunluğu ve RNG. step() tik başına O(1); clone()/snapshot() ile
+    herhangi bir durumdan ucuz dallanma (Monte Carlo lookahead, kapalı
+    döngü RL).
+
+    action (isteğe bağlı): makine hız çarpanları, skaler ya da (A, B, C).
+    Gürültülü hızdan sonra uygulanır; enerji yeni hızla hesaplanır.
+    action=None → parçalı akışla birebir aynı koşu.
+
+    RNG: random_state (np.random.RandomState ya da eşdeğeri) > rng
+    (np.random.Generator) > seed (yeni RandomState(seed)).
+
+        sim = ProductionLineSim(seed=42)
+        row = sim.step()                      # RECORD_COLUMNS sırasıyla
+        branch = sim.clone(rng=np.random.default_rng(1))
+        snap = sim.snapshot(); ...; sim.restore(snap)
+    """
+
+    __slots__ = (
+        # sabit parametreler (klonlar arasında paylaşılır)
+        "dt", "base_arrival", "operator_fatigue_rate", "defect_base",
+        "energy_idle", "energy_per_speed", "noise_level",
+        "base_service", "breakdown_prob", "avg_downtime", "maintenance_interval",
+        # durum
+        "rs", "t", "normal_queue", "priority_queue",
+        "operator_skill", "operator_fatigue", "operator_load",
+        "status", "downtime_timer", "maintenance_timer",
+        "defect_rate", "lead_time",
+        # son tikin makine bazlı çıktısı (salt-okunur demetler)
+        "machine_processed", "machine_defects",
+    )
+
+    _STATE = (
+        "t", "normal_queue", "priority_queue",
+        "operator_skill", "operator_fatigue", "operator_load",
+        "defect_rate", "lead_time",
+    )
+    _MACHINE_STATE = ("status", "downtime_timer", "maintenance_timer")
+
+    def __init__(self, seed: int | None = 42, rng: np.random.Generator | None = None,
+                 random_state=None, **params):
+        p = _simulation_params(params)
+        self.dt = p["dt"]
+        self.base_arrival = p["base_arrival"]
+        self.operator_fatigue_rate = p["operator_fatigue_rate"]
+        self.defect_base = p["defect_base"]
+        self.energy_idle = p["energy_idle"]
+        self.energy_per_speed = p["energy_per_speed"]
+        self.noise_level = p["noise_level"]
+
+        # Makine parametre setleri (A, B, C sırasıyla)
+        self.base_service = tuple(p[f"base_service_{m}"] for m in MACHINES)
+        self.breakdown_prob = tuple(p[f"breakdown_prob_{m}"] for m in MACHINES)
+        self.avg_downtime = tuple(p[f"avg_downtime_{m}"] for m in MACHINES)
+        self.maintenance_interval = tuple(p[f"maintenance_interval_{m}"] for m in MACHINES)
+
+        if random_state is not None:
+            self.rs = random_state
+        elif rng is not None:
+            self.rs = _GeneratorRandomState(rng)
+        else:
+            self.rs = np.random.RandomState(seed)
+
+        self.t = 0
+        self.normal_queue = 0.0
+        self.priority_queue = 0.0
+
+        # Operatör parametreleri
+        self.operator_skill = 0.4
+        self.operator_fatigue = 0.2
+        self.operator_load = 0.7
+
+        self.status = [1, 1, 1]
+        self.downtime_timer = [0, 0, 0]
+        self.maintenance_timer = [0, 0, 0]
+
+        self.defect_rate = 0.0
+        self.lead_time = None      # son geçerli wip / completed
+
+        # Kayda girmeyen makine bazlı sayımlar (ör. src.feature_store)
+        self.machine_processed = (0, 0, 0)
+        self.machine_defects = (0, 0, 0)
+
+    # ------------------------------------------------------------
+    #  Dallanma
+    # ------------------------------------------------------------
+    def clone(self, rng: np.random.Generator | None = None) -> "ProductionLineSim":
+        """
+        Bağımsız kopya. rng verilmezse RNG durumu da kopyalanır (aynı
+        gelecek); rng verilirse kopya o akışla ilerler.
+        """
+        new = object.__new__(type(self))
+        for name in self.__slots__:
+            setattr(new, name, getattr(self, name))
+        for name in self._MACHINE_STATE:
+            setattr(new, name, list(getattr(self, name)))
+        new.rs = copy.deepcopy(self.rs) if rng is None else _GeneratorRandomState(rng)
+        return new
+
+    def snapshot(self) -> tuple:
+        """Durum + RNG durumu; restore() ile geri yüklenir."""
+        return (
+            tuple(getattr(self, name) for name in self._STATE),
+            tuple(tuple(getattr(self, name)) for name in self._MACHINE_STATE),
+            self.rs.get_state(),
+        )
+
+    def restore(self, snapshot: tuple) -> None:
+        state, machine_state, rng_state = snapshot
+        for name, value in zip(self._STATE, state):
+            setattr(self, name, value)
+        for name, value in zip(self._MACHINE_STATE, machine_state):
+            setattr(self, name, list(value))
+        self.rs.set_state(rng_state)
+
+    # ------------------------------------------------------------
+    #  Tek tik
+    # ------------------------------------------------------------
+    def step(self, action=None) -> tuple:
+        """Bir tik ilerler; kayıt satırını RECORD_COLUMNS sırasıyla döndürür."""
+        prof = profiling.active()           # kapalıyken None (bkz. src.profiling)
+        if prof: t0 = profiling.now()
+
+        rs = self.rs
+        t = self.t
+        dt = self.dt
+        status = self.status
+        downtime_timer = self.downtime_timer
+        maintenance_timer = self.maintenance_timer
+
+        if action is None:
+            speed_scale = None
+        elif np.ndim(action) == 0:
+            speed_scale = (float(action),) * 3
+        else:
+            speed_scale = tuple(float(a) for a in action)
+            if len(speed_scale) != 3:
+                raise ValueError(f"action skaler ya da 3 elemanlı olmalı: {action!r}")
+
+        current_time = t * dt
         hour = (t % 144) // 6
 
         # Vardiya
@@ -130,45 +375,46 @@ def simulate_production_line_advanced(
         daily_pattern = 1 + 0.3*np.sin(2*np.pi*(t/144))
         weekly_pattern = 1 + 0.2*np.sin(2*np.pi*(t/1008))
 
-        if np.random.rand() < 0.02:
+        if rs.rand() < 0.02:
             spike_flag = 1
             spike_factor = 2.5
         else:
             spike_flag = 0
             spike_factor = 1.0
 
-        batch = np.random.choice([0,5,10], p=[0.85,0.1,0.05])
+        batch = rs.choice([0,5,10], p=[0.85,0.1,0.05])
 
-        lam = base_arrival * daily_pattern * weekly_pattern * shift_factor * spike_factor * dt
-        arrivals = np.random.poisson(lam) + batch
+        lam = self.base_arrival * daily_pattern * weekly_pattern * shift_factor * spike_factor * dt
+        arrivals = rs.poisson(lam) + batch
 
         pr_ratio = 0.15 + 0.1*np.sin(2*np.pi*(t/288))
         pr_in = int(arrivals * pr_ratio)
         nr_in = arrivals - pr_in
 
-        normal_queue += nr_in
-        priority_queue += pr_in
+        normal_queue = self.normal_queue + nr_in
+        priority_queue = self.priority_queue + pr_in
 
         # Operatör dinamiği
         time_in_shift = t % 48
         skill_progress = 1 / (1 + np.exp(-0.1*(time_in_shift - 24)))
         operator_skill = 0.3 + 0.7*skill_progress
 
-        operator_fatigue += operator_fatigue_rate * dt
-        operator_fatigue = float(np.clip(operator_fatigue, 0.1, 1.0))
+        operator_fatigue = self.operator_fatigue + self.operator_fatigue_rate * dt
+        operator_fatigue = float(min(max(operator_fatigue, 0.1), 1.0))
 
         if time_in_shift == 0 and t > 0:
-            operator_fatigue = 0.3 + np.random.rand()*0.1
+            operator_fatigue = 0.3 + rs.rand()*0.1
 
         operator_load = float(
-            np.clip(0.5 + 0.4*operator_fatigue - 0.2*(operator_skill - 0.5), 0.1, 1.0)
+            min(max(0.5 + 0.4*operator_fatigue - 0.2*(operator_skill - 0.5), 0.1), 1.0)
         )
+        if prof: t0 = prof.lap("sim.arrivals", t0)
 
         # Makine hızları
-        machine_speed = {}
-        maintenance_flag = {"A":0,"B":0,"C":0}
+        machine_speed = [0.0, 0.0, 0.0]
+        maintenance_flag = [0, 0, 0]
 
-        for m in machines:
+        for m in range(3):
 
             if downtime_timer[m] > 0:
                 status[m] = 0
@@ -180,43 +426,49 @@ def simulate_production_line_advanced(
                 maintenance_flag[m] = 1
 
             else:
-                if t > 0 and t % maintenance_interval[m] == 0:
-                    if np.random.rand() < 0.7:
-                        maintenance_timer[m] = np.random.randint(5,20)
+                if t > 0 and t % self.maintenance_interval[m] == 0:
+                    if rs.rand() < 0.7:
+                        maintenance_timer[m] = rs.randint(5,20)
                         status[m] = 0
                         maintenance_flag[m] = 1
                     else:
-                        if np.random.rand() < breakdown_prob[m]*2:
+                        if rs.rand() < self.breakdown_prob[m]*2:
                             status[m] = 0
-                            downtime_timer[m] = np.random.poisson(avg_downtime[m])
+                            downtime_timer[m] = rs.poisson(self.avg_downtime[m])
                         else:
                             status[m] = 1
                 else:
-                    if np.random.rand() < breakdown_prob[m]:
+                    if rs.rand() < self.breakdown_prob[m]:
                         status[m] = 0
-                        downtime_timer[m] = np.random.poisson(avg_downtime[m])
+                        downtime_timer[m] = rs.poisson(self.avg_downtime[m])
                     else:
                         status[m] = 1
 
             # Hız
             if status[m] == 1:
                 speed = (
-                    base_service[m]
+                    self.base_service[m]
                     * shift_factor
                     * (0.8 + 0.4*operator_skill)
                     * (1.1 - 0.3*operator_fatigue)
                 )
-                speed = max(speed + np.random.randn()*noise_level, 0)
+                speed = max(speed + rs.randn()*self.noise_level, 0)
+                if speed_scale is not None:
+                    speed *= speed_scale[m]
             else:
                 speed = 0.0
 
             machine_speed[m] = speed
+        if prof: t0 = prof.lap("sim.machines", t0)
 
         # İşleme
         total_completed = 0
         total_defects = 0
+        defect_rate = self.defect_rate
+        machine_processed = [0, 0, 0]
+        machine_defects = [0, 0, 0]
 
-        for m in machines:
+        for m in range(3):
 
             if machine_speed[m] <= 0:
                 continue
@@ -234,75 +486,385 @@ def simulate_production_line_advanced(
             if processed <= 0:
                 continue
 
-            avg_status = np.mean([status[x] for x in machines])
+            avg_status = (status[0] + status[1] + status[2]) / 3
 
-            defect_rate = defect_base
+            defect_rate = self.defect_base
             defect_rate += 0.1*operator_fatigue
             defect_rate += 0.05*(1-operator_skill)
             defect_rate += 0.05*(1-avg_status)
-            defect_rate = float(np.clip(defect_rate, 0, 0.4))
+            defect_rate = float(min(max(defect_rate, 0), 0.4))
 
-            defects = np.random.binomial(processed, defect_rate)
+            defects = rs.binomial(processed, defect_rate)
 
             normal_queue += defects  # rework
 
             total_completed += (processed - defects)
             total_defects += defects
+            machine_processed[m] = processed
+            machine_defects[m] = defects
 
         wip_total = normal_queue + priority_queue
 
         # Enerji
         energy = 0
-        for m in machines:
+        for m in range(3):
             if status[m] == 0:
-                energy += energy_idle*0.3*dt
+                energy += self.energy_idle*0.3*dt
             else:
-                energy += (energy_idle + energy_per_speed*machine_speed[m]) * dt
+                energy += (self.energy_idle + self.energy_per_speed*machine_speed[m]) * dt
+        if prof: prof.lap("sim.processing", t0)
+
+        # Durum
+        self.t = t + 1
+        self.normal_queue = normal_queue
+        self.priority_queue = priority_queue
+        self.operator_skill = operator_skill
+        self.operator_fatigue = operator_fatigue
+        self.operator_load = operator_load
+        self.defect_rate = defect_rate
+        self.machine_processed = tuple(machine_processed)
+        self.machine_defects = tuple(machine_defects)
+        if total_completed > 0:
+            self.lead_time = wip_total / total_completed
+
+        # Kayıt (RECORD_COLUMNS sırasıyla)
+        return (
+            current_time, t, hour, shift_id,
+            normal_queue, priority_queue, wip_total,
+            total_completed, defect_rate if total_completed > 0 else 0, total_defects,
+            energy,
+            operator_load, operator_skill, operator_fatigue,
+            status[0], status[1], status[2],
+            machine_speed[0], machine_speed[1], machine_speed[2],
+            maintenance_flag[0], maintenance_flag[1], maintenance_flag[2],
+            spike_flag,
+        )
 
-        # Kayıt
-        rec = records
-        rec["time"].append(current_time)
-        rec["step"].append(int(t))
-        rec["hour"].append(int(hour))
-        rec["shift_id"].append(int(shift_id))
-        rec["normal_queue"].append(float(normal_queue))
-        rec["priority_queue"].append(float(priority_queue))
-        rec["wip_total"].append(float(wip_total))
-        rec["completed_jobs"].append(int(total_completed))
-        rec["defect_rate"].append(float(defect_rate if total_completed > 0 else 0))
-        rec["defects"].append(int(total_defects))
-        rec["energy_consumption"].append(float(energy))
-        rec["operator_load"].append(float(operator_load))
-        rec["operator_skill"].append(float(operator_skill))
-        rec["operator_fatigue"].append(float(operator_fatigue))
-        rec["machine_A_status"].append(int(status["A"]))
-        rec["machine_B_status"].append(int(status["B"]))
-        rec["machine_C_status"].append(int(status["C"]))
-        rec["machine_A_speed"].append(float(machine_speed["A"]))
-        rec["machine_B_speed"].append(float(machine_speed["B"]))
-        rec["machine_C_speed"].append(float(machine_speed["C"]))
-        rec["maintenance_A"].append(int(maintenance_flag["A"]))
-        rec["maintenance_B"].append(int(maintenance_flag["B"]))
-        rec["maintenance_C"].append(int(maintenance_flag["C"]))
-        rec["demand_spike_flag"].append(int(spike_flag))
-
-    # ============================================================
-    #  ÇIKTI DATAFRAME
-    # ============================================================
-    df = pd.DataFrame(records)
-
-    df["queue_length"] = df["wip_total"]
-    safe_completed = df["completed_jobs"].replace(0, np.nan)
-    df["lead_time"] = (df["wip_total"] / safe_completed).fillna(method="ffill").fillna(
-        df["wip_total"].mean()
-    )
 
-    df["machine_status"] = (
-        df["machine_A_status"]
-        + df["machine_B_status"]
-        + df["machine_C_status"]
-    ) / 3
+def _production_line_chunks(T: int, chunk_size: int, seed, p: dict, rng=None):
+    """
+    Ana zaman döngüsü (ProductionLineSim üzerinde). Her parçada tipli
+    tamponları doldurup türetilmiş kolonlarla birlikte sözlük olarak
+    verir. T == 0 ise tek boş parça.
+    """
+
+    if rng is not None:
+        rs = _GeneratorRandomState(rng)
+    else:
+        if seed is not None:
+            np.random.seed(seed)
+        rs = np.random.mtrand._rand     # np.random.* fonksiyonlarının durumu
 
+    sim = ProductionLineSim(random_state=rs, **p)
+
+    # Parçalar arası taşınan lead_time (son geçerli wip/completed)
+    last_lead = None
+
+    t = 0
+    n_chunks = max(1, -(-T // chunk_size))
+
+    for _ in range(n_chunks):
+
+        n = min(chunk_size, T - t)
+
+        # Kayıt yapısı: tipli, önceden ayrılmış kolonlar
+        rec = {c: np.empty(n, dtype=COLUMN_DTYPES[c]) for c in RECORD_COLUMNS}
+        columns = [rec[c] for c in RECORD_COLUMNS]
+
+        # Profilleme kapalıyken None (bkz. src.profiling)
+        prof = profiling.active()
+
+        # ============================================================
+        #  ANA ZAMAN DÖNGÜSÜ
+        # ============================================================
+        for i in range(n):
+            row = sim.step()
+
+            if prof: t0 = profiling.now()
+            for arr, value in zip(columns, row):
+                arr[i] = value
+            if prof: prof.lap("sim.record", t0)
+
+        t += n
+
+        # ============================================================
+        #  TÜRETİLMİŞ KOLONLAR (parça sınırında artımlı)
+        # ============================================================
+        if prof: t0 = profiling.now()
+        completed = rec["completed_jobs"]
+        rec["queue_length"] = rec["wip_total"].copy()
+        rec["lead_time"] = _lead_time(
+            rec["wip_total"], completed, last=last_lead
+        ).astype(COLUMN_DTYPES["lead_time"])
+
+        done = np.flatnonzero(completed)
+        if len(done):
+            last_lead = rec["wip_total"][done[-1]] / completed[done[-1]]
+
+        rec["machine_status"] = (
+            (rec["machine_A_status"] + rec["machine_B_status"] + rec["machine_C_status"])
+            / 3
+        ).astype(COLUMN_DTYPES["machine_status"])
+        if prof: prof.lap("sim.derived", t0)
+
+        yield rec
+
+
+# =====================================================================
+#  PARAMETRE ÇÖZÜMLEME
+# =====================================================================
+def _simulation_params(overrides: dict) -> dict:
+    """
+    simulate_production_line_advanced varsayılanlarını verilen
+    değerlerle birleştirir (T ve seed hariç).
+    """
+    sig = inspect.signature(simulate_production_line_advanced)
+    params = {
+        k: p.default for k, p in sig.parameters.items()
+        if k not in ("T", "seed", "rng")
+    }
+    unknown = set(overrides) - set(params)
+    if unknown:
+        raise TypeError(f"Bilinmeyen simülasyon parametresi: {sorted(unknown)}")
+    params.update(overrides)
+    return params
+
+
+def _lead_time(wip: np.ndarray, completed: np.ndarray, last: float | None = None) -> np.ndarray:
+    """
+    lead_time = wip / completed; completed == 0 olan adımlar bir önceki
+    değerle doldurulur (ffill), baştaki boşluklar `last` (önceki parçadan
+    taşınan değer) ya da yoksa wip ortalamasıyla.
+    Son eksen zaman eksenidir (1-D veya (N, T)).
+    """
+    wip = np.asarray(wip, dtype=np.float64)
+    completed = np.asarray(completed, dtype=np.float64)
+
+    valid = completed != 0
+    ratio = np.divide(wip, completed, out=np.zeros_like(wip), where=valid)
+
+    # ffill: her adım için son geçerli indeks
+    idx = np.where(valid, np.arange(wip.shape[-1]), -1)
+    idx = np.maximum.accumulate(idx, axis=-1)
+    filled = np.take_along_axis(ratio, np.maximum(idx, 0), axis=-1)
+
+    if last is None:
+        fallback = wip.mean(axis=-1, keepdims=True) if wip.shape[-1] else 0.0
+    else:
+        fallback = last
+    return np.where(idx >= 0, filled, fallback)
+
+
+# =====================================================================
+#  TOPLU (BATCHED) SİMÜLASYON – N REPLİKASYON AYNI ANDA
+# =====================================================================
+def simulate_production_line_batch(
+    n_reps: int = 100,
+    T: int = 2000,
+    seed: int | None = 42,
+    output: str = "frame",
+    rng: np.random.Generator | None = None,
+    **params,
+):
+    """
+    N bağımsız üretim hattını aynı zaman döngüsünde (lockstep) ilerletir.
+
+    Kuyruklar, makine sayaçları, yorgunluk ve hızlar replikasyon ekseni
+    olan NumPy dizilerinde tutulur; her adımda skaler np.random çağrıları
+    yerine (N,) / (N, 3) boyutlu tek çekilişler yapılır. Dinamikler
+    simulate_production_line_advanced ile birebir aynıdır.
+
+    Rastgele sayı akışı replikasyonlar arasında paylaşılan tek bir
+    Generator'dan gelir. Bu yüzden yalnızca batch bütün olarak
+    tekrarlanabilir (aynı seed + n_reps → aynı sonuç). Tek bir
+    replikasyon ne kendi başına ne de farklı n_reps ile yeniden
+    üretilebilir; tek-koşuyla eşdeğerlik bit düzeyinde değil,
+    dağılımsaldır. Replikasyon başına tekrarlanabilirlik gerekiyorsa
+    simulate_production_line_advanced'i SeedSequence(seed).spawn(n)
+    tohumlarıyla ayrı ayrı çağırın.
+
+    Maliyet: 200 replikasyon x 20000 adım, tek koşunun ~11-12 katı sürer
+    (ölçüm: ~14-16 s'ye karşı ~1.2-1.4 s).
+
+    output:
+      "frame" → uzun format DataFrame (ilk kolon "replication")
+      "array" → (n_reps, T, len(OUTPUT_COLUMNS)) float64 dizi
+    """
+    p = _simulation_params(params)
+    if rng is None:
+        rng = np.random.default_rng(np.random.SeedSequence(seed))
+
+    N = int(n_reps)
+    dt = p["dt"]
+
+    # ---- Zamana bağlı deterministik bileşenler (tüm T için bir kerede)
+    steps = np.arange(T)
+    hour = (steps % 144) // 6
+    shift_id = np.where((hour >= 6) & (hour < 14), 1,
+                        np.where((hour >= 14) & (hour < 22), 2, 3))
+    shift_factor = np.select([shift_id == 1, shift_id == 2], [1.20, 1.00], 0.85)
+    daily_pattern = 1 + 0.3*np.sin(2*np.pi*(steps/144))
+    weekly_pattern = 1 + 0.2*np.sin(2*np.pi*(steps/1008))
+    pr_ratio = 0.15 + 0.1*np.sin(2*np.pi*(steps/288))
+    time_in_shift = steps % 48
+    operator_skill = 0.3 + 0.7 / (1 + np.exp(-0.1*(time_in_shift - 24)))
+
+    base_lam = p["base_arrival"] * daily_pattern * weekly_pattern * shift_factor * dt
+    speed_base = shift_factor * (0.8 + 0.4*operator_skill)
+    defect_skill = p["defect_base"] + 0.05*(1 - operator_skill)
+
+    # ---- Makine parametreleri (3,)
+    base_service = np.array([p["base_service_A"], p["base_service_B"], p["base_service_C"]])
+    breakdown_prob = np.array([p["breakdown_prob_A"], p["breakdown_prob_B"], p["breakdown_prob_C"]])
+    avg_downtime = np.array([p["avg_downtime_A"], p["avg_downtime_B"], p["avg_downtime_C"]])
+    maintenance_interval = np.array([
+        p["maintenance_interval_A"], p["maintenance_interval_B"], p["maintenance_interval_C"],
+    ])
+
+    # ---- Durum dizileri
+    normal_queue = np.zeros(N)
+    priority_queue = np.zeros(N)
+    operator_fatigue = np.full(N, 0.2)
+    status = np.ones((N, 3), dtype=bool)
+    downtime_timer = np.zeros((N, 3), dtype=np.int64)
+    maintenance_timer = np.zeros((N, 3), dtype=np.int64)
+
+    # ---- Kayıt: (T, N) satır-ardışık tamponlar
+    rec = {c: np.empty((T, N)) for c in RECORD_COLUMNS}
+    status_rec = np.empty((T, N, 3))
+    speed_rec = np.empty((T, N, 3))
+    maint_rec = np.empty((T, N, 3))
+
+    batch_values = np.array([0, 5, 10])
+    batch_p = [0.85, 0.1, 0.05]
+
+    for t in range(T):
+
+        # Arrival
+        spike = rng.random(N) < 0.02
+        batch = rng.choice(batch_values, size=N, p=batch_p)
+        lam = base_lam[t] * np.where(spike, 2.5, 1.0)
+        arrivals = rng.poisson(lam) + batch
+
+        pr_in = np.floor(arrivals * pr_ratio[t])
+        normal_queue += arrivals - pr_in
+        priority_queue += pr_in
+
+        # Operatör dinamiği
+        operator_fatigue = np.clip(
+            operator_fatigue + p["operator_fatigue_rate"] * dt, 0.1, 1.0
+        )
+        if time_in_shift[t] == 0 and t > 0:
+            operator_fatigue = 0.3 + rng.random(N)*0.1
+
+        operator_load = np.clip(
+            0.5 + 0.4*operator_fatigue - 0.2*(operator_skill[t] - 0.5), 0.1, 1.0
+        )
+
+        # Makine durumları
+        down = downtime_timer > 0
+        downtime_timer -= down
+        in_maint = ~down & (maintenance_timer > 0)
+        maintenance_timer -= in_maint
+        free = ~(down | in_maint)
+
+        scheduled = (t > 0) & (t % maintenance_interval == 0)
+        u_maint = rng.random((N, 3))
+        u_break = rng.random((N, 3))
+
+        start_maint = free & scheduled & (u_maint < 0.7)
+        p_break = np.where(scheduled, breakdown_prob*2, breakdown_prob)
+        breakdown = free & ~start_maint & (u_break < p_break)
+
+        if start_maint.any():
+            maintenance_timer[start_maint] = rng.integers(5, 20, size=start_maint.sum())
+        if breakdown.any():
+            downtime_timer[breakdown] = rng.poisson(
+                np.broadcast_to(avg_downtime, (N, 3))[breakdown]
+            )
+
+        status = free & ~start_maint & ~breakdown
+        maintenance_flag = in_maint | start_maint
+
+        # Hız
+        speed = (
+            base_service * speed_base[t]
+            * (1.1 - 0.3*operator_fatigue)[:, None]
+        )
+        speed = speed + rng.standard_normal((N, 3))*p["noise_level"]
+        speed = np.where(status, np.maximum(speed, 0), 0.0)
+
+        # İşleme (makineler sırayla aynı kuyruğu tüketir)
+        defect_rate = np.clip(
+            defect_skill[t] + 0.1*operator_fatigue + 0.05*(1 - status.mean(axis=1)),
+            0, 0.4,
+        )
+        total_completed = np.zeros(N)
+        total_defects = np.zeros(N)
+
+        for m in range(3):
+            cap = np.round(speed[:, m]*dt)
+
+            from_pr = np.minimum(priority_queue, cap)
+            priority_queue -= from_pr
+            from_nr = np.minimum(normal_queue, cap - from_pr)
+            normal_queue -= from_nr
+
+            processed = from_pr + from_nr
+            defects = rng.binomial(processed.astype(np.int64), defect_rate)
+
+            normal_queue += defects  # rework
+            total_completed += processed - defects
+            total_defects += defects
+
+        # Enerji
+        energy = np.where(
+            status,
+            (p["energy_idle"] + p["energy_per_speed"]*speed) * dt,
+            p["energy_idle"]*0.3*dt,
+        ).sum(axis=1)
+
+        # Kayıt
+        rec["normal_queue"][t] = normal_queue
+        rec["priority_queue"][t] = priority_queue
+        rec["wip_total"][t] = normal_queue + priority_queue
+        rec["completed_jobs"][t] = total_completed
+        rec["defect_rate"][t] = np.where(total_completed > 0, defect_rate, 0)
+        rec["defects"][t] = total_defects
+        rec["energy_consumption"][t] = energy
+        rec["operator_load"][t] = operator_load
+        rec["operator_fatigue"][t] = operator_fatigue
+        rec["demand_spike_flag"][t] = spike
+        status_rec[t] = status
+        speed_rec[t] = speed
+        maint_rec[t] = maintenance_flag
+
+    # ---- Deterministik ve makine kolonlarını yerleştir
+    for name, values in (
+        ("time", steps*dt), ("step", steps), ("hour", hour),
+        ("shift_id", shift_id), ("operator_skill", operator_skill),
+    ):
+        rec[name][:] = values[:, None]
+    for m, name in enumerate("ABC"):
+        rec[f"machine_{name}_status"] = status_rec[:, :, m]
+        rec[f"machine_{name}_speed"] = speed_rec[:, :, m]
+        rec[f"maintenance_{name}"] = maint_rec[:, :, m]
+
+    # (N, T) görünümü + türetilmiş kolonlar
+    out = {c: rec[c].T for c in RECORD_COLUMNS}
+    out["queue_length"] = out["wip_total"]
+    out["lead_time"] = _lead_time(out["wip_total"], out["completed_jobs"])
+    out["machine_status"] = status_rec.mean(axis=2).T
+
+    if output == "array":
+        return np.stack([out[c] for c in OUTPUT_COLUMNS], axis=-1)
+    if output != "frame":
+        raise ValueError(f"output 'frame' veya 'array' olmalı: {output!r}")
+
+    df = pd.DataFrame({
+        c: out[c].ravel().astype(COLUMN_DTYPES[c]) for c in OUTPUT_COLUMNS
+    })
+    df.insert(0, "replication", np.repeat(np.arange(N, dtype=np.int32), T))
     return df
 
 
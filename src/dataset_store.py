@@ -0,0 +1,274 @@
+"""
+============================================================
+ KOLON BAZLI, BELLEĞE EŞLENEN (MEMMAP) VERİ DEPOSU
+============================================================
+
+Simülasyon çıktısını CSV yerine kolon başına ham ikili dosya olarak
+saklar; okuyucular yalnızca istedikleri kolonları ve satır aralığını
+np.memmap üzerinden tembel (lazy) olarak yükler.
+
+Klasör yapısı:
+    <path>/meta.json       → şema (kolon → dtype), satır sayısı, parametreler
+    <path>/<kolon>.bin     → kolonun ham verisi (C sıralı, little-endian)
+
+- Yazıcı parça parça ekleme (append) yapar → uzun koşular diske akıtılabilir
+- meta.json her eklemeden sonra atomik güncellenir → büyüyen bir veri seti
+  yazılırken de okunabilir (okuyucu refresh() ile yeni satırları görür)
+
+Kullanım:
+---------
+from src.dataset_store import write_dataset, open_dataset
+from src.data_simulation import iter_production_line_chunks
+
+write_dataset("data/simulated/line_data", iter_production_line_chunks(T=1_000_000),
+              params={"T": 1_000_000, "seed": 42})
+
+ds = open_dataset("data/simulated/line_data")
+ds.tail(200, columns=["time", "lead_time"])      # yalnızca 2 kolon, 200 satır
+ds["lead_time"][5000:5010]                        # memmap dilimi
+
+CSV dönüştürme:
+python -m src.dataset_store convert data/simulated/line_data.csv data/simulated/line_data
+
+============================================================
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+
+
+def _to_columns(chunk) -> dict:
+    if isinstance(chunk, pd.DataFrame):
+        return {c: chunk[c].to_numpy() for c in chunk.columns}
+    return {c: np.asarray(v) for c, v in chunk.items()}
+
+
+def _write_json_atomic(path: str, obj) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(obj, f, indent=2)
+    os.replace(tmp, path)
+
+
+# =====================================================================
+#  YAZICI
+# =====================================================================
+class DatasetWriter:
+    """
+    Parça parça ekleme yapan kolon deposu yazıcısı. İlk parça şemayı
+    (kolon sırası ve dtype) belirler; sonraki parçalar bu tiplere çevrilir.
+    """
+
+    def __init__(self, path: str, params: dict | None = None, overwrite: bool = False):
+        if os.path.exists(path):
+            if not overwrite:
+                raise FileExistsError(f"Veri seti zaten var: {path}")
+            shutil.rmtree(path)
+        os.makedirs(path)
+
+        self.path = path
+        self.params = params or {}
+        self.schema: dict[str, str] | None = None
+        self.n_rows = 0
+        self._files = {}
+
+    def append(self, chunk) -> None:
+        cols = _to_columns(chunk)
+
+        if self.schema is None:
+            self.schema = {c: np.asarray(v).dtype.newbyteorder("<").str for c, v in cols.items()}
+            self._files = {
+                c: open(os.path.join(self.path, f"{c}.bin"), "ab") for c in self.schema
+            }
+        elif set(cols) != set(self.schema):
+            raise ValueError(f"Parça kolonları şemayla uyuşmuyor: {sorted(cols)}")
+
+        lengths = {len(v) for v in cols.values()}
+        if len(lengths) > 1:
+            raise ValueError("Parçadaki kolon uzunlukları farklı")
+        n = lengths.pop() if lengths else 0
+
+        for c, dtype in self.schema.items():
+            arr = np.ascontiguousarray(cols[c], dtype=dtype)
+            self._files[c].write(arr.tobytes())
+            self._files[c].flush()
+
+        self.n_rows += n
+        self._write_meta()
+
+    def _write_meta(self) -> None:
+        _write_json_atomic(os.path.join(self.path, META_FILE), {
+            "format_version": FORMAT_VERSION,
+            "n_rows": self.n_rows,
+            "schema": self.schema or {},
+            "params": self.params,
+            "updated": time.time(),
+        })
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        self._write_meta()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_dataset(path: str, data, params: dict | None = None, overwrite: bool = False) -> str:
+    """
+    DataFrame, {kolon: dizi} sözlüğü ya da bunların yinelenebilir
+    parçalarını (ör. iter_production_line_chunks) depoya yazar.
+    """
+    chunks = [data] if isinstance(data, (pd.DataFrame, dict)) else data
+    with DatasetWriter(path, params=params, overwrite=overwrite) as writer:
+        for chunk in chunks:
+            writer.append(chunk)
+    return path
+
+
+# =====================================================================
+#  OKUYUCU
+# =====================================================================
+class ColumnarDataset:
+    """
+    Depoya salt-okunur erişim. Kolonlar ilk erişimde memmap olarak açılır;
+    read()/tail() yalnızca istenen kolon ve satırları kopyalar.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._maps = {}
+        self.refresh()
+
+    def refresh(self) -> int:
+        """meta.json'u yeniden okur (büyüyen veri setleri için). Satır sayısını döndürür."""
+        with open(os.path.join(self.path, META_FILE)) as f:
+            meta = json.load(f)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Desteklenmeyen depo sürümü: {meta.get('format_version')}")
+
+        if meta["n_rows"] != getattr(self, "n_rows", None):
+            self._maps = {}
+        self.schema = meta["schema"]
+        self.params = meta["params"]
+        self.n_rows = meta["n_rows"]
+        return self.n_rows
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.schema)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def column(self, name: str) -> np.ndarray:
+        """Kolonun tamamını salt-okunur memmap olarak verir (veri kopyalanmaz)."""
+        if name not in self.schema:
+            raise KeyError(name)
+        if name not in self._maps:
+            dtype = np.dtype(self.schema[name])
+            if self.n_rows == 0:
+                self._maps[name] = np.empty(0, dtype=dtype)
+            else:
+                self._maps[name] = np.memmap(
+                    os.path.join(self.path, f"{name}.bin"),
+                    dtype=dtype, mode="r", shape=(self.n_rows,),
+                )
+        return self._maps[name]
+
+    __getitem__ = column
+
+    def read(self, columns: list[str] | None = None, start: int | None = None,
+             stop: int | None = None) -> pd.DataFrame:
+        """İstenen kolonları [start, stop) aralığında DataFrame olarak okur."""
+        columns = self.columns if columns is None else list(columns)
+        start, stop, _ = slice(start, stop).indices(self.n_rows)
+        return pd.DataFrame(
+            {c: np.array(self.column(c)[start:stop]) for c in columns},
+            index=pd.RangeIndex(start, max(start, stop)),
+        )
+
+    def tail(self, n: int = 5, columns: list[str] | None = None) -> pd.DataFrame:
+        return self.read(columns, start=max(self.n_rows - n, 0))
+
+
+def open_dataset(path: str) -> ColumnarDataset:
+    return ColumnarDataset(path)
+
+
+def convert_csv(csv_path: str, out_path: str, chunksize: int = 100_000,
+                params: dict | None = None, overwrite: bool = False) -> str:
+    """
+    CSV'yi parça parça okuyup depoya yazar. Simülasyon kolonları
+    COLUMN_DTYPES'taki kompakt tiplere çevrilir.
+    """
+    from src.data_simulation import COLUMN_DTYPES
+
+    def chunks():
+        for df in pd.read_csv(csv_path, chunksize=chunksize):
+            yield {
+                c: df[c].to_numpy(dtype=COLUMN_DTYPES.get(c, df[c].dtype))
+                for c in df.columns
+            }
+
+    params = dict(params or {}, source=os.path.basename(csv_path))
+    return write_dataset(out_path, chunks(), params=params, overwrite=overwrite)
+
+
+# =====================================================================
+#  CLI
+# =====================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kolon bazlı veri deposu araçları")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    conv = sub.add_parser("convert", help="CSV → kolon deposu")
+    conv.add_argument("csv")
+    conv.add_argument("out")
+    conv.add_argument("--overwrite", action="store_true")
+
+    sim = sub.add_parser("simulate", help="simülasyonu doğrudan depoya akıt")
+    sim.add_argument("out")
+    sim.add_argument("--T", type=int, default=2000)
+    sim.add_argument("--chunk-size", type=int, default=50_000)
+    sim.add_argument("--seed", type=int, default=42)
+    sim.add_argument("--overwrite", action="store_true")
+
+    info = sub.add_parser("info", help="şema ve parametreleri yazdır")
+    info.add_argument("path")
+
+    args = parser.parse_args(argv)
+
+    if args.cmd == "convert":
+        convert_csv(args.csv, args.out, overwrite=args.overwrite)
+    elif args.cmd == "simulate":
+        from src.data_simulation import _simulation_params, iter_production_line_chunks
+        chunks = iter_production_line_chunks(
+            T=args.T, chunk_size=args.chunk_size, seed=args.seed, as_frame=False
+        )
+        params = {"T": args.T, "seed": args.seed, **_simulation_params({})}
+        write_dataset(args.out, chunks, params=params, overwrite=args.overwrite)
+    else:
+        ds = open_dataset(args.path)
+        print(f"{ds.path}: {ds.n_rows} satır")
+        for c, dtype in ds.schema.items():
+            print(f"  {c:<22} {dtype}")
+        print("params:", json.dumps(ds.params))
+
+
+if __name__ == "__main__":
+    main()
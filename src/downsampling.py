@@ -0,0 +1,87 @@
+"""
+============================================================
+ GÖRSELLEŞTİRME İÇİN SEYRELTME (DOWNSAMPLING)
+============================================================
+
+Milyonlarca noktalık geçmişi grafiğe vermeden önce n_out noktaya
+indirir; görsel şekil (tepeler, çukurlar) korunur.
+
+- minmax_downsample : her kovadan min ve max noktası (tam vektörel, hızlı)
+- lttb              : Largest-Triangle-Three-Buckets (Steinarsson, 2013);
+                      her kovadan komşu kovalarla en büyük üçgeni kuran nokta
+- downsample        : büyük serilerde önce min-max ile 4·n_out'a, sonra LTTB
+                      (MinMaxLTTB) – LTTB döngüsü kısa kalır
+
+x artan sıralı olmalıdır. Dönüş: (x_alt, y_alt) kopyalar.
+
+============================================================
+"""
+
+import numpy as np
+
+
+def minmax_downsample(x, y, n_out: int):
+    x, y = np.asarray(x), np.asarray(y)
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_buckets < 1 or n <= n_out:
+        return x.copy(), y.copy()
+
+    # Eşit genişlikli kovalar; kalan uç noktalar son kovaya dahil
+    size = n // n_buckets
+    body = y[: size * n_buckets].reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    lo = offsets + body.argmin(axis=1)
+    hi = offsets + body.argmax(axis=1)
+
+    tail = n - size * n_buckets
+    if tail:
+        last = slice((n_buckets - 1) * size, n)
+        lo[-1] = last.start + np.argmin(y[last])
+        hi[-1] = last.start + np.argmax(y[last])
+
+    idx = np.unique(np.concatenate([lo, hi]))   # sıralı, çift noktasız
+    return x[idx], y[idx]
+
+
+def lttb(x, y, n_out: int):
+    x, y = np.asarray(x), np.asarray(y)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return x.copy(), y.copy()
+    xf, yf = x.astype(np.float64), y.astype(np.float64)
+
+    # Kova sınırları: ilk ve son nokta sabit, aradaki n-2 nokta n_out-2 kovaya
+    every = (n - 2) / (n_out - 2)
+    edges = (np.arange(n_out - 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        nxt_start = end
+        nxt_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = xf[nxt_start:nxt_end].mean()
+        avg_y = yf[nxt_start:nxt_end].mean()
+
+        xs, ys = xf[start:end], yf[start:end]
+        area = np.abs((xf[a] - avg_x) * (ys - yf[a]) - (xf[a] - xs) * (avg_y - yf[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+
+    return x[idx], y[idx]
+
+
+def downsample(x, y, n_out: int = 2000, method: str = "minmaxlttb"):
+    if method == "minmax":
+        return minmax_downsample(x, y, n_out)
+    if method == "lttb":
+        return lttb(x, y, n_out)
+    if method == "minmaxlttb":
+        if len(y) > 8 * n_out:
+            x, y = minmax_downsample(x, y, 4 * n_out)
+        return lttb(x, y, n_out)
+    raise ValueError(f"Bilinmeyen yöntem: {method!r}")
@@ -1,15 +1,132 @@
+import os
+import pickle
+
 import gymnasium as gym
 import numpy as np
 
+from src import profiling
+from src.prediction_table import load_or_compute
+
+
+DEFAULT_SCALER = os.path.join(os.path.dirname(__file__), "..", "models", "lstm_scaler.pkl")
+
+
+def _target_column(columns, target_col=None):
+    """
+    Hedef kolon: verilmezse "lead_time" (varsa), yoksa ilk kolon.
+    Tek ve vektör ortam aynı kuralı kullanır (simülatör çerçevesinde ilk kolon "time").
+    """
+    columns = list(columns)
+    if target_col is None:
+        target_col = "lead_time" if "lead_time" in columns else columns[0]
+    if target_col not in columns:
+        raise KeyError(f"Hedef kolon bulunamadı: {target_col!r} (kolonlar: {columns})")
+    return target_col
+
+
+def _feature_matrix(df, feature_cols, target_col, scaler=None, val_frac=0.2):
+    """
+    Özellik kolonları → ölçeklenmiş, bitişik, salt-okunur (n, f) float32 matris.
+    Burada fit edilen min/max yalnızca ilk (1 - val_frac) satırdan alınır
+    (lstm_search ile aynı bölme); gözlemlere gelecek tiklerin bilgisi sızmaz.
+    """
+    if scaler is None and len(feature_cols) == 1:
+        col = np.asarray(df[feature_cols[0]])
+        if col.dtype == np.float32 and col.flags.c_contiguous:
+            # Ör. paylaşımlı bellekteki seri: kopya yok, yalnızca görünüm
+            X = col.reshape(-1, 1).view()
+            X.flags.writeable = False
+            return X
+
+    X = np.empty((len(df[feature_cols[0]]), len(feature_cols)), dtype=np.float32)
+    for j, col in enumerate(feature_cols):
+        X[:, j] = np.asarray(df[col], dtype=np.float32)
+
+    if scaler is not None:
+        if isinstance(scaler, (str, os.PathLike)):
+            with open(scaler, "rb") as f:
+                scaler = pickle.load(f)
+        n_in = getattr(scaler, "n_features_in_", 1)
+        if n_in == len(feature_cols):
+            X[:] = scaler.transform(X)
+        elif n_in == 1:
+            for j, col in enumerate(feature_cols):
+                if col == target_col:
+                    X[:, j] = scaler.transform(X[:, j:j + 1]).ravel()
+                else:
+                    cut = max(1, int(len(X) * (1 - val_frac)))
+                    lo, hi = X[:cut, j].min(), X[:cut, j].max()
+                    X[:, j] = (X[:, j] - lo) / ((hi - lo) or 1.0)
+        else:
+            raise ValueError(
+                f"Ölçekleyici {n_in} özellik bekliyor; feature_cols {len(feature_cols)} kolon"
+            )
+
+    X.flags.writeable = False
+    return X
+
 
 class ProductionLineEnv(gym.Env):
-    def __init__(self, df, predict_fn, window_size=10):
+    """
+    Kaydedilmiş seriyi oynatan tahmin düzeltme ortamı.
+
+    target_col   : ödül ve tahmin hedefi (varsayılan "lead_time", yoksa ilk kolon)
+    feature_cols : gözlem kolonları (varsayılan yalnızca hedef), ör.
+                   ["lead_time", "queue_length", "machine_status", "operator_load"]
+    scaler       : fit edilmiş ölçekleyici ya da .pkl yolu (ör. DEFAULT_SCALER).
+                   Tek özellikli ise (kaydedilmiş lead_time MinMaxScaler'ı)
+                   yalnızca hedef kolona uygulanır, diğer kolonlar eğitim
+                   kısmındaki min/max aralığına göre [0, 1]'e çekilir;
+                   len(feature_cols) özellikliyse tüm matrise uygulanır.
+                   None → ham değerler. Ölçekleyici önceden fit edilmiş
+                   olmalıdır (ör. yalnızca eğitim kısmına, bkz. lstm_search).
+    val_frac     : diğer kolonların min/max'ı yalnızca ilk (1 - val_frac)
+                   satırdan hesaplanır; sonrası bu aralığın dışına taşabilir.
+
+    Gözlem matrisi kurulumda bir kez (n, özellik) bitişik float32 olarak
+    kurulup ölçeklenir; her gözlem bu matrisin salt-okunur (window,
+    özellik) dilimidir (adım başına kopya / pandas yok). predict_fn ve
+    ödül ham hedef serisini görür.
+
+    Ardışık gözlemler aynı belleği paylaşan, örtüşen görünümlerdir. Bu
+    bilinçli bir tercihtir; sonuçları:
+    - gymnasium.utils.env_checker.check_env "observations ... share an
+      object" hatasıyla başarısız olur.
+    - Gözlemi adımdan sonra saklayan çağıranlar (replay buffer, gözlem
+      biriktiren değerlendirme betikleri) np.array(obs) ile kopyalamalıdır.
+      SB3 VecEnv'leri gözlemi zaten kendi tamponuna kopyalar.
+    """
+
+    def __init__(self, df, predict_fn, window_size=10, precompute=False,
+                 batch_predict_fn=None, model_id=None, cache_dir=None, predictions=None,
+                 target_col=None, feature_cols=None, scaler=None, val_frac=0.2):
         super().__init__()
 
-        self.df = df.reset_index(drop=True)
+        # df: pandas DataFrame ya da src.dataset_store.ColumnarDataset.
+        # Yalnızca hedef ve özellik kolonları okunur (depoda memmap → tüm veri RAM'e alınmaz).
+        self.df = df.reset_index(drop=True) if hasattr(df, "reset_index") else df
         self.predict_fn = predict_fn
         self.window_size = window_size
-        self.target_col = df.columns[0]
+        self.target_col = target_col = _target_column(df.columns, target_col)
+        self.feature_cols = list(feature_cols) if feature_cols is not None else [target_col]
+        self.series = np.asarray(df[self.target_col])
+        self._target_windows = self.series.reshape(-1, 1)        # görünüm, (n, 1)
+        self.features = _feature_matrix(df, self.feature_cols, self.target_col, scaler,
+                                        val_frac)
+
+        # precompute=True: tüm pencerelerin tahmini kurulumda tek seferde
+        # (batch_predict_fn ile) hesaplanır; step() yalnızca tablodan okur.
+        # model_id (ör. checkpoint yolu) verilirse tablo diskte saklanır.
+        # predictions: önceden hesaplanmış tablo (ör. paylaşımlı bellekte);
+        # verilirse predict_fn hiç çağrılmaz.
+        self.predictions = predictions
+        if predictions is None and precompute:
+            kwargs = {"cache_dir": cache_dir} if cache_dir is not None else {}
+            self.predictions = load_or_compute(
+                self.series, window_size,
+                batch_predict_fn=batch_predict_fn, predict_fn=predict_fn,
+                model_id=model_id, **kwargs,
+            )
 
         self.current_step = window_size
 
@@ -20,16 +137,13 @@ class ProductionLineEnv(gym.Env):
         self.observation_space = gym.spaces.Box(
             low=-np.inf,
             high=np.inf,
-            shape=(window_size, 1),
+            shape=(window_size, len(self.feature_cols)),
             dtype=np.float32
         )
 
     def _obs(self):
-        window = self.df.iloc[
-            self.current_step - self.window_size : self.current_step
-        ][self.target_col].values
-
-        return window.reshape(-1, 1).astype(np.float32)  # (T,1)
+        # Salt-okunur görünüm (T, özellik); saklanacaksa çağıran kopyalamalı
+        return self.features[self.current_step - self.window_size : self.current_step]
 
     def reset(self, seed=None, options=None):
         super().reset(seed=seed)
@@ -37,12 +151,20 @@ class ProductionLineEnv(gym.Env):
         return self._obs(), {}
 
     def step(self, action):
-        obs_window = self._obs()            # (T,1)
-        true_val = float(
-            self.df.iloc[self.current_step][self.target_col]
-        )
+        prof = profiling.active()           # kapalıyken None (bkz. src.profiling)
+        if prof: t0 = profiling.now()
 
-        pred_val = float(self.predict_fn(obs_window))  # LSTM çağrısı
+        obs_window = self._obs()            # (T, özellik)
+        true_val = float(self.series[self.current_step])
+        if prof: t0 = prof.lap("env.obs", t0)
+
+        if self.predictions is not None:
+            pred_val = float(self.predictions[self.current_step - self.window_size])
+        else:
+            # Tahminci ham hedef penceresini görür (T,1); önhesaplı tabloyla aynı girdi
+            target_window = self._target_windows[self.current_step - self.window_size : self.current_step]
+            pred_val = float(self.predict_fn(target_window))  # LSTM çağrısı
+        if prof: t0 = prof.lap("env.predict", t0)
 
         # continuous action: [-1,1]
         a = float(np.asarray(action)[0])
@@ -52,9 +174,150 @@ class ProductionLineEnv(gym.Env):
         reward = -error
 
         self.current_step += 1
-        terminated = self.current_step >= len(self.df) - 1
+        terminated = self.current_step >= len(self.series) - 1
         truncated = False
+        if prof: t0 = prof.lap("env.reward", t0)
 
         next_obs = self._obs() if not terminated else obs_window
+        if prof: prof.lap("env.next_obs", t0)
 
         return next_obs, reward, terminated, truncated, {}
+
+
+# ============================================================
+# KAPALI DÖNGÜ: CANLI SİMÜLATÖR ORTAMI
+# ============================================================
+
+def sim_reward(sim, row, energy_weight=0.1):
+    """-(lead_time + energy_weight * enerji); lead_time son geçerli wip/completed."""
+    from src.data_simulation import ROW_INDEX
+
+    lead = sim.lead_time if sim.lead_time is not None else row[ROW_INDEX["wip_total"]]
+    return -(float(lead) + energy_weight * float(row[ROW_INDEX["energy_consumption"]]))
+
+
+def mc_lookahead(sim, candidates, horizon=20, n_rollouts=16, policy=None,
+                 energy_weight=0.1, gamma=1.0, seed=None):
+    """
+    Herhangi bir simülatör durumundan Monte Carlo ileri bakış.
+
+    Her aday aksiyon için sim n_rollouts kez klonlanır ve horizon tik
+    ilerletilir: ilk tik aday, sonrası policy(sim) (None → aday sabit
+    tutulur). Adaylar aynı rollout tohumlarını paylaşır (ortak rastgele
+    sayılar → farklar daha az gürültülü). sim değişmez.
+
+    Dönüş: (en iyi aday indeksi, ortalama getiriler (K,), std (K,))
+    """
+    seeds = np.random.SeedSequence(seed).spawn(n_rollouts)
+    returns = np.empty((len(candidates), n_rollouts))
+
+    for k, action in enumerate(candidates):
+        for r, s in enumerate(seeds):
+            branch = sim.clone(rng=np.random.default_rng(s))
+            total, discount, a = 0.0, 1.0, action
+            for h in range(horizon):
+                if h and policy is not None:
+                    a = policy(branch)
+                total += discount * sim_reward(branch, branch.step(a), energy_weight)
+                discount *= gamma
+            returns[k, r] = total
+
+    mean = returns.mean(axis=1)
+    return int(mean.argmax()), mean, returns.std(axis=1)
+
+
+class ProductionLineSimEnv(gym.Env):
+    """
+    Önceden hesaplanmış seriyi oynatmak yerine ProductionLineSim'i
+    canlı ilerletir; aksiyon makine hızlarını değiştirir ve sonraki
+    durumları etkiler.
+
+    action      : Box(-1, 1, (3,)) → hız çarpanı 1 + speed_range * a (A, B, C)
+    observation : kuyruklar, yorgunluk/beceri, makine durumu ve
+                  zamanlayıcıları, günün saati (sin/cos) → float32 vektör
+    reward      : sim_reward = -(lead_time + energy_weight * enerji)
+
+    kpis        : src.feature_store özellik adları (ör. "throughput_48",
+                  "defect_rate_A_144"); verilirse gözlemin sonuna eklenir
+                  (ham birimlerde, NaN → 0). Depo her tikte O(1) güncellenir,
+                  env.kpi_store üzerinden tüm KPI'lar okunabilir.
+
+    lookahead(candidates, ...) → mc_lookahead(self.sim, ...)
+    """
+
+    metadata = {"render_modes": []}
+
+    def __init__(self, episode_length=1000, speed_range=0.5, energy_weight=0.1,
+                 warmup=0, queue_scale=100.0, kpis=None, kpi_windows=(12, 48, 144),
+                 **sim_params):
+        super().__init__()
+        from src.data_simulation import ProductionLineSim
+
+        self._sim_cls = ProductionLineSim
+        self.sim_params = sim_params
+        self.episode_length = episode_length
+        self.speed_range = speed_range
+        self.energy_weight = energy_weight
+        self.warmup = warmup
+        self.queue_scale = queue_scale
+        self.sim = None
+        self._t0 = 0
+
+        self.kpi_store = None
+        self.kpis = list(kpis or ())
+        if self.kpis:
+            from src.feature_store import FeatureStore
+            self.kpi_store = FeatureStore(kpi_windows, history=0)
+            self._kpi_idx = self.kpi_store.indices(self.kpis)   # bilinmeyen ad → KeyError
+
+        self.action_space = gym.spaces.Box(low=-1.0, high=1.0, shape=(3,), dtype=np.float32)
+        self.observation_space = gym.spaces.Box(
+            low=-np.inf, high=np.inf, shape=(15 + len(self.kpis),), dtype=np.float32
+        )
+
+    def _obs(self):
+        sim = self.sim
+        hour = 2 * np.pi * ((sim.t % 144) / 144)
+        obs = np.array(
+            [sim.normal_queue / self.queue_scale, sim.priority_queue / self.queue_scale,
+             sim.operator_fatigue, sim.operator_skill,
+             *sim.status,
+             *(x / 50.0 for x in sim.downtime_timer),
+             *(x / 20.0 for x in sim.maintenance_timer),
+             np.sin(hour), np.cos(hour)],
+            dtype=np.float32,
+        )
+        if self.kpi_store is None:
+            return obs
+        return np.concatenate([obs, self.kpi_store.vector(self._kpi_idx)])
+
+    def _advance(self, speed_scale=None):
+        row = self.sim.step(speed_scale)
+        if self.kpi_store is not None:
+            self.kpi_store.update_from_sim(self.sim, row)
+        return row
+
+    def speed_scale(self, action):
+        return 1.0 + self.speed_range * np.clip(np.asarray(action, dtype=np.float64), -1.0, 1.0)
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        self.sim = self._sim_cls(rng=self.np_random, **self.sim_params)
+        if self.kpi_store is not None:
+            self.kpi_store.clear()
+        for _ in range(self.warmup):
+            self._advance()
+        self._t0 = self.sim.t
+        return self._obs(), {}
+
+    def step(self, action):
+        row = self._advance(self.speed_scale(action))
+        reward = sim_reward(self.sim, row, self.energy_weight)
+        truncated = self.sim.t - self._t0 >= self.episode_length
+        return self._obs(), reward, False, truncated, {"row": row}
+
+    def lookahead(self, candidates, horizon=20, n_rollouts=16, seed=None, **kwargs):
+        """Ham aksiyonlar ([-1, 1]) için mc_lookahead; ortamın ödül ağırlığıyla."""
+        scaled = [self.speed_scale(a) for a in candidates]
+        return mc_lookahead(self.sim, scaled, horizon, n_rollouts,
+                            energy_weight=self.energy_weight, seed=seed, **kwargs)
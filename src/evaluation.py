@@ -0,0 +1,375 @@
+"""
+============================================================
+ ÇOK TOHUMLU POLİTİKA DEĞERLENDİRMESİ (PPO vs TEMEL POLİTİKALAR)
+============================================================
+
+Kaydedilmiş PPO politikasını ve temel politikaları birçok tohum ve
+veri seti üzerinde aynı anda koşturur:
+
+- Süreç içinde vektörel: her iş ProductionLineVectorEnv ile n_envs
+  bölümü tek NumPy adımında ilerletir.
+- Süreçler arası: (veri seti, tohum) işleri ProcessPoolExecutor'a dağıtılır.
+- Akan istatistik: adım ödülleri ve bölüm getirileri RunningMean'lere
+  yazılır (tüm ödül dizisi saklanmaz), işçi sonuçları merge() ile
+  birleşir; güven aralıkları bölüm getirilerinin standart hatasından.
+- Aynı iş içindeki tüm politikalar aynı bölüm başlangıçlarını görür
+  (ortak rastgele sayılar); referans politikaya göre eşleştirilmiş fark
+  ve güven aralığı da raporlanır.
+
+Politikalar:
+  ppo           : models/ppo_model.zip → NumpyPolicy (.npz; .zip verilirse
+                  data/cache/policies altına içerik adresli dışa aktarılır,
+                  depodaki .npz'ye dokunulmaz; işçilerde torch/SB3
+                  yüklenmez). Gözlemler
+                  eğitimdeki VecNormalize istatistikleriyle standartlaştırılır;
+                  istatistikleri olmayan politika (obs_norm_missing) geçersiz
+                  sayılır, uyarıyla değerlendirmeden ve rapordan çıkarılır
+  random        : aksiyon uzayından düzgün örnek
+  zero          : aksiyon 0 → tahmin olduğu gibi kullanılır
+  forecast_only : öğrenilmiş politika yok; bölüm içinde gerçekleşen
+                  değer / tahmin oranının ortalamasıyla tahmini ölçekler
+                  (yalnızca tahmin geçmişinden çevrimiçi yanlılık düzeltmesi)
+
+Ayrık aksiyonlu politikalar (kaydedilmiş PPO: 0 azalt / 1 sabit / 2 artır)
+ortamın [-1, 1] aksiyonuna eşit aralıklı eşlenir (-1, 0, 1). Pencere
+boyu, ppo değerlendiriliyorsa dışa aktarılmış .npz'nin meta verisindeki
+gözlem şeklinden, değilse window_size'dan (varsayılan 10) alınır.
+
+Kullanım:
+---------
+python -m src.evaluation --seeds 16 --n-envs 32 --sim 4
+python -m src.evaluation --data data/simulated/line_data.csv --column wip_total \\
+       --policies ppo random zero forecast_only --workers 8
+
+from src.evaluation import evaluate_policies
+report = evaluate_policies({"line": series}, seeds=range(8))
+
+============================================================
+"""
+
+import argparse
+import functools
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from src.streaming_metrics import RunningMean, discounted_returns
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_DATA = os.path.join(PROJECT_ROOT, "data", "simulated", "line_data.csv")
+DEFAULT_PPO = os.path.join(PROJECT_ROOT, "models", "ppo_model.zip")
+DEFAULT_OUT = os.path.join(PROJECT_ROOT, "reports", "evaluation.csv")
+DEFAULT_POLICY_CACHE = os.path.join(PROJECT_ROOT, "data", "cache", "policies")
+
+BASELINES = ("random", "zero", "forecast_only")
+
+
+# ============================================================
+# POLİTİKALAR
+# ============================================================
+
+def numpy_policy_path(path, cache_dir=DEFAULT_POLICY_CACHE):
+    """
+    .npz → olduğu gibi. .zip (SB3) → cache_dir altında model ve
+    VecNormalize istatistiklerinin içerik özetiyle adlanan .npz; yoksa
+    dışa aktarılır. Dosya zamanlarına bakılmaz ve depodaki
+    models/ppo_policy.npz hiçbir zaman üzerine yazılmaz.
+    """
+    if path.endswith(".npz"):
+        return path
+    from src.policy_export import vecnormalize_path
+    from src.prediction_table import model_fingerprint
+
+    stats = vecnormalize_path(path)
+    key = model_fingerprint(path) + (model_fingerprint(stats) if os.path.exists(stats) else "")
+    npz = os.path.join(cache_dir, f"ppo_{key}.npz")
+    if not os.path.exists(npz):
+        from src.policy_export import export_policy
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{npz[:-4]}.tmp{os.getpid()}.npz"
+        export_policy(path, tmp, stats if os.path.exists(stats) else None)
+        os.replace(tmp, npz)
+    return npz
+
+
+@functools.lru_cache(maxsize=None)
+def _load_policy(npz_path):
+    from src.policy_export import NumpyPolicy
+    return NumpyPolicy(npz_path)
+
+
+def policy_window(npz_path, default=10):
+    """Dışa aktarılmış meta verideki gözlem şekli (düz pencere) → ortam pencere boyu."""
+    return int(np.prod(_load_policy(npz_path).meta["obs_shape"])) if npz_path else default
+
+
+class _Actor:
+    """
+    Bir politikayı vektör ortama bağlar: (N, w, 1) gözlem → (N, 1) aksiyon.
+    forecast_only için bölüm içi oran ortalamasını tutar.
+    """
+
+    def __init__(self, name, n_envs, rng, npz_path=None):
+        self.name = name
+        self.rng = rng
+        self.policy = _load_policy(npz_path) if name == "ppo" else None
+        self.ratio_sum = np.zeros(n_envs)
+        self.ratio_n = np.zeros(n_envs)
+        if name not in BASELINES and name != "ppo":
+            raise ValueError(f"Bilinmeyen politika: {name!r}")
+
+    def reset(self):
+        self.ratio_sum[:] = 0.0
+        self.ratio_n[:] = 0.0
+
+    def act(self, obs):
+        n = len(obs)
+        if self.name == "zero":
+            a = np.zeros(n)
+        elif self.name == "random":
+            a = self.rng.uniform(-1.0, 1.0, n)
+        elif self.name == "forecast_only":
+            a = np.divide(self.ratio_sum, self.ratio_n,
+                          out=np.zeros(n), where=self.ratio_n > 0)
+        else:
+            # NumpyPolicy.predict ham gözlemi eğitimdeki gibi normalize eder
+            p = self.policy
+            out, _ = p.predict(obs.reshape((n,) + p.obs_shape), deterministic=True)
+            if p.discrete:
+                a = np.linspace(-1.0, 1.0, p.meta["action"]["n"])[out]
+            else:
+                a = np.asarray(out, dtype=np.float64).reshape(n, -1)[:, 0]
+        return np.clip(a, -1.0, 1.0).reshape(n, 1)
+
+    def observe(self, true, pred):
+        """Adım sonrası gerçekleşen değer (forecast_only yanlılık tahmini)."""
+        if self.name != "forecast_only":
+            return
+        ok = np.abs(pred) > 1e-9
+        self.ratio_sum += np.where(ok, true / np.where(ok, pred, 1.0) - 1.0, 0.0)
+        self.ratio_n += ok
+
+
+# ============================================================
+# İŞÇİ
+# ============================================================
+
+class _Frame:
+    """ProductionLineVectorEnv için en küçük DataFrame arayüzü."""
+
+    def __init__(self, name, values):
+        self.columns = [name]
+        self._values = values
+
+    def __getitem__(self, name):
+        return self._values
+
+
+def _evaluate_job(job):
+    """
+    Tek (veri seti, tohum) işi: her politika aynı bölüm başlangıçlarıyla
+    n_envs x episodes bölüm koşar. Dönüş: satır sözlükleri (birikimcilerle).
+    """
+    from src.vec_env_rl import ProductionLineVectorEnv
+
+    dataset, series, predictions, policies, seed, cfg = job
+    n_envs, length, window = cfg["n_envs"], cfg["episode_length"], cfg["window_size"]
+    ref = cfg["reference"]
+
+    rows, all_returns = [], {}
+    for name in policies:
+        venv = ProductionLineVectorEnv(
+            _Frame("target", series), num_envs=n_envs, window_size=window,
+            predictions=predictions, episode_length=length, random_offsets=True,
+        )
+        actor = _Actor(name, n_envs, np.random.default_rng([seed, 1]), cfg["npz_path"])
+        obs, _ = venv.reset(seed=seed)
+
+        step_reward = RunningMean()
+        returns = RunningMean()
+        disc_returns = RunningMean()
+        episode_returns = []
+        rewards = np.empty((length, n_envs))
+
+        for _ in range(cfg["episodes"]):
+            actor.reset()
+            for t in range(length):
+                steps = venv.current_step.copy()
+                pred = np.asarray(predictions[steps - window], dtype=np.float64)
+                obs, r, _, _, _ = venv.step(actor.act(obs))
+                actor.observe(series[steps], pred)
+                rewards[t] = r
+            step_reward.update(rewards)
+            ep = rewards.sum(axis=0)
+            returns.update(ep)
+            disc_returns.update(discounted_returns(rewards.T, cfg["gamma"]))
+            episode_returns.append(ep)
+
+        all_returns[name] = np.concatenate(episode_returns)
+        rows.append({"policy": name, "dataset": dataset, "seed": seed,
+                     "step_reward": step_reward, "return": returns,
+                     "discounted": disc_returns})
+
+    if ref in all_returns:
+        for row in rows:
+            row["diff"] = RunningMean().update(all_returns[row["policy"]] - all_returns[ref])
+    return rows
+
+
+# ============================================================
+# DEĞERLENDİRME
+# ============================================================
+
+def _ci(acc, z):
+    half = z * acc.sem
+    return acc.mean - half, acc.mean + half
+
+
+def summarize(rows, confidence=0.95, reference="zero"):
+    """İşçi satırlarını (politika, veri seti) ve (politika, ALL) düzeyinde birleştirir."""
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    groups = {}
+    for row in rows:
+        for key in ((row["policy"], row["dataset"]), (row["policy"], "ALL")):
+            g = groups.setdefault(key, {"step_reward": RunningMean(), "return": RunningMean(),
+                                        "discounted": RunningMean(), "diff": RunningMean()})
+            for k in g:
+                if k in row:
+                    g[k].merge(row[k])
+
+    out = []
+    for (policy, dataset), g in groups.items():
+        lo, hi = _ci(g["return"], z)
+        d_lo, d_hi = _ci(g["diff"], z)
+        out.append({
+            "policy": policy, "dataset": dataset,
+            "episodes": g["return"].n, "steps": g["step_reward"].n,
+            "step_reward": g["step_reward"].mean,
+            "return_mean": g["return"].mean, "return_ci_low": lo, "return_ci_high": hi,
+            "discounted_mean": g["discounted"].mean,
+            f"diff_vs_{reference}": g["diff"].mean, "diff_ci_low": d_lo, "diff_ci_high": d_hi,
+        })
+    df = pd.DataFrame(out)
+    df["_all"] = df["dataset"].eq("ALL")      # birleşik satırlar en sonda
+    df = df.sort_values(["_all", "dataset", "return_mean"], ascending=[True, True, False])
+    return df.drop(columns="_all").reset_index(drop=True)
+
+
+def evaluate_policies(
+    datasets,
+    policies=("ppo",) + BASELINES,
+    seeds=range(8),
+    n_envs=32,
+    episode_length=200,
+    episodes=1,
+    window_size=None,
+    ppo_path=DEFAULT_PPO,
+    predictor="mean",
+    gamma=0.99,
+    reference="zero",
+    confidence=0.95,
+    n_workers=None,
+):
+    """
+    datasets: {ad: 1-D seri}. Tahmin tabloları ana süreçte bir kez
+    hesaplanır (build_prediction_table) ve işlerle gönderilir.
+    window_size=None → ppo değerlendiriliyorsa .npz meta verisindeki gözlem
+    boyu, değilse (ppo geçersiz sayılıp çıkarıldıysa da) 10.
+    n_workers=1 → süreç havuzu kullanılmaz.
+    Dönüş: summarize() DataFrame'i (güven aralıklı).
+    """
+    from src.rl_train import build_prediction_table
+
+    policies = list(policies)
+    npz_path = numpy_policy_path(ppo_path) if "ppo" in policies else None
+    if npz_path is not None and _load_policy(npz_path).obs_norm_missing:
+        # Ham gözlemle normalizasyonlu eğitilmiş ağın aksiyonları anlamsız
+        warnings.warn(f"{npz_path}: gözlem normalizasyonu istatistikleri yok; "
+                      "ppo geçersiz, değerlendirmeden çıkarıldı")
+        policies.remove("ppo")
+        npz_path = None
+    window = window_size or policy_window(npz_path)
+    if not policies:
+        raise ValueError("Değerlendirilecek geçerli politika yok")
+
+    cfg = {"n_envs": n_envs, "episode_length": episode_length, "episodes": episodes,
+           "window_size": window, "gamma": gamma, "reference": reference,
+           "npz_path": npz_path}
+
+    jobs = []
+    for name, series in datasets.items():
+        series = np.asarray(series, dtype=np.float64)
+        if len(series) - 2 - window < episode_length:
+            raise ValueError(f"{name}: seri bölüm uzunluğu için kısa ({len(series)})")
+        predictions = np.asarray(build_prediction_table(series, window, predictor), dtype=np.float32)
+        jobs += [(name, series, predictions, policies, int(s), cfg) for s in seeds]
+
+    if n_workers == 1:
+        results = map(_evaluate_job, jobs)
+        rows = [r for job_rows in results for r in job_rows]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            rows = [r for job_rows in pool.map(_evaluate_job, jobs) for r in job_rows]
+
+    return summarize(rows, confidence, reference)
+
+
+def load_datasets(paths=(), column="lead_time", n_sim=0, sim_T=5000, sim_seed=1000):
+    """CSV dosyaları + olay güdümlü simülatörden n_sim ek seri → {ad: seri}."""
+    datasets = {}
+    for path in paths:
+        datasets[os.path.splitext(os.path.basename(path))[0]] = \
+            pd.read_csv(path, usecols=[column])[column].to_numpy(np.float64)
+    if n_sim:
+        from src.event_simulation import simulate_production_line_events
+        for i in range(n_sim):
+            df = simulate_production_line_events(T=sim_T, seed=sim_seed + i)
+            datasets[f"sim_{sim_seed + i}"] = df[column].to_numpy(np.float64)
+    return datasets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PPO vs temel politikalar, çok tohumlu değerlendirme")
+    parser.add_argument("--data", nargs="*", default=[DEFAULT_DATA], help="CSV yolları")
+    parser.add_argument("--column", default="lead_time")
+    parser.add_argument("--sim", type=int, default=0, help="ek simüle veri seti sayısı")
+    parser.add_argument("--sim-T", type=int, default=5000)
+    parser.add_argument("--policies", nargs="+", default=["ppo", *BASELINES])
+    parser.add_argument("--ppo", default=DEFAULT_PPO, help=".zip ya da .npz")
+    parser.add_argument("--seeds", type=int, default=8)
+    parser.add_argument("--n-envs", type=int, default=32)
+    parser.add_argument("--episode-length", type=int, default=200)
+    parser.add_argument("--episodes", type=int, default=1, help="ortam başına bölüm")
+    parser.add_argument("--window", type=int, default=None)
+    parser.add_argument("--predictor", choices=["mean", "lstm"], default="mean")
+    parser.add_argument("--reference", default="zero")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    args = parser.parse_args(argv)
+
+    datasets = load_datasets(args.data, args.column, args.sim, args.sim_T)
+    report = evaluate_policies(
+        datasets, policies=args.policies, seeds=range(args.seeds), n_envs=args.n_envs,
+        episode_length=args.episode_length, episodes=args.episodes, window_size=args.window,
+        ppo_path=args.ppo, predictor=args.predictor, reference=args.reference,
+        confidence=args.confidence, n_workers=args.workers,
+    )
+
+    with pd.option_context("display.width", 200, "display.max_columns", None,
+                           "display.float_format", "{:.4g}".format):
+        print(report)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        report.to_csv(args.out, index=False)
+        print(f"\nKaydedildi: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,423 @@
+"""
+============================================================
+ OLAY GÜDÜMLÜ (DISCRETE-EVENT) ÜRETİM HATTI SİMÜLASYONU
+============================================================
+
+simulate_production_line_advanced ile istatistiksel olarak eşdeğer,
+alternatif motor. Tik motoru her adımda her makine için Bernoulli
+arıza çekilişi yapar; arızalar (%1.5–3) ve bakımlar seyrek olduğundan
+bu işin çoğu "hiçbir şey olmadı"yı yeniden keşfetmektir.
+
+Burada:
+- Her makinenin bir sonraki arıza anı doğrudan geometrik dağılımdan
+  çekilir, bir sonraki bakım kontrolü bakım aralığının katıdır; olaylar
+  tek bir heap'te (tik, makine, tür) sırasıyla işlenir. Duruşlar
+  (Poisson arıza süresi / randint(5, 20) bakım) dilimle yazılır.
+- Durumdan bağımsız her şey (varış, spike, batch, vardiya, yorgunluk,
+  hız gürültüsü, tam kapasitedeki defect sayısı) parça başına tek
+  seferde vektörel çekilir.
+- Kuyruk tüketimi doğrusal olmadığından (min(kuyruk, kapasite) + rework)
+  yalnızca bu kısım skaler, ucuz bir Python döngüsüdür. Kuyruk
+  kapasiteden kısa kaldığında defect, önceden çekilmiş tam kapasite
+  binomundan hipergeometrik inceltmeyle alınır (marjinali aynı binom).
+
+Rastgele akışlar her bileşen için ayrı Generator'dan gelir; bu yüzden
+çekilen sayılar chunk_size'dan bağımsızdır (aynı seed → aynı koşu).
+Tek istisna lead_time'ın baştaki boşluğudur: koşunun ilk tamamlanan
+işinden önceki adımlar, tik motorundaki gibi o anki parçanın wip
+ortalamasıyla doldurulur, bu yüzden bu birkaç satır chunk_size'a
+bağlıdır (ör. T=5000, seed=1: chunk_size=700 ile tek parça 0. satırda
+ayrışır). Diğer tüm kolonlar ve ilk tamamlanmadan sonraki lead_time
+birebir aynıdır.
+
+Tik motoruyla aynı seed aynı sayıları vermez; eşdeğerlik dağılımsaldır.
+Depoda test paketi yok; doğrulama compare_distributions'tır (CLI:
+--validate; seed'li, kolon başına replikasyon ortalamalarına KS ve
+Welch testleri).
+Motorda değişiklik yapınca çalıştırılmalıdır.
+
+Kullanım:
+---------
+from src.event_simulation import simulate_production_line_events
+df = simulate_production_line_events(T=1_000_000, seed=42)
+
+for chunk in iter_event_chunks(T=50_000_000, chunk_size=1_000_000):
+    ...
+
+python -m src.event_simulation --validate --reps 30 --T 2000
+python -m src.event_simulation --bench --T 200000
+
+============================================================
+"""
+
+import argparse
+import heapq
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data_simulation import (
+    COLUMN_DTYPES,
+    RECORD_COLUMNS,
+    _chunk_to_frame,
+    _lead_time,
+    _simulation_params,
+    simulate_production_line_advanced,
+)
+
+
+_BREAKDOWN, _MAINTENANCE = 0, 1
+_NEVER = 2**62
+
+# Ayrı rastgele akışlar (sıra sabit: seed → aynı koşu)
+_STREAMS = ("events", "spike", "batch", "arrivals", "fatigue", "noise", "defects", "thinning")
+
+
+# =====================================================================
+#  MAKİNE OLAYLARI (HEAP)
+# =====================================================================
+class _MachineEvents:
+    """
+    Üç makinenin arıza / bakım olaylarını tek heap'te sıralar ve
+    parça parça durum (status) ile bakım bayrağı dizilerine yazar.
+
+    Tik motorundaki kurallar:
+    - Boştaki makine her tikte p olasılıkla arızalanır → Poisson(avg)
+      ek tik duruş (arıza tiki dahil d + 1 tik, bakım bayrağı 0).
+    - t > 0 ve t % interval == 0 ise (makine boştaysa) 0.7 olasılıkla
+      bakım: randint(5, 20) ek tik, bayrak 1; yoksa 2p ile arıza.
+    - Duruştaki makine bakım kontrolünü kaçırır.
+    """
+
+    def __init__(self, p: dict, rng: np.random.Generator):
+        self.rng = rng
+        self.prob = [p[f"breakdown_prob_{m}"] for m in "ABC"]
+        self.avg_downtime = [p[f"avg_downtime_{m}"] for m in "ABC"]
+        self.interval = [int(p[f"maintenance_interval_{m}"]) for m in "ABC"]
+        self.heap = []
+        self.down_until = [-1, -1, -1]       # son duruş tiki (dahil)
+        self.down_maint = [False, False, False]
+        self.n_events = 0
+        for m in range(3):
+            self._schedule(m, 0)
+
+    def _schedule(self, m: int, s: int) -> None:
+        """s tikinden itibaren boştaki makinenin bir sonraki olayı."""
+        p = self.prob[m]
+        b = s + int(self.rng.geometric(p)) - 1 if p > 0 else _NEVER
+        iv = self.interval[m]
+        mt = max(-(-s // iv), 1) * iv
+        heapq.heappush(self.heap, (b, m, _BREAKDOWN) if b < mt else (mt, m, _MAINTENANCE))
+
+    def fill(self, a: int, b: int, status: np.ndarray, flag: np.ndarray) -> None:
+        """[a, b) tiklerinin (n, 3) status/flag dizilerini yazar (status önceden 1)."""
+        # Önceki parçadan taşan duruşlar
+        for m in range(3):
+            end = self.down_until[m]
+            if end >= a:
+                hi = min(end, b - 1) - a + 1
+                status[:hi, m] = 0
+                if self.down_maint[m]:
+                    flag[:hi, m] = 1
+
+        rng = self.rng
+        while self.heap and self.heap[0][0] < b:
+            t, m, kind = heapq.heappop(self.heap)
+            self.n_events += 1
+
+            if kind == _MAINTENANCE:
+                if rng.random() < 0.7:
+                    end, maint = t + int(rng.integers(5, 20)), True
+                elif rng.random() < self.prob[m] * 2:
+                    end, maint = t + int(rng.poisson(self.avg_downtime[m])), False
+                else:
+                    self._schedule(m, t + 1)
+                    continue
+            else:
+                end, maint = t + int(rng.poisson(self.avg_downtime[m])), False
+
+            lo, hi = t - a, min(end, b - 1) - a + 1
+            status[lo:hi, m] = 0
+            if maint:
+                flag[lo:hi, m] = 1
+            self.down_until[m], self.down_maint[m] = end, maint
+            self._schedule(m, end + 1)
+
+
+# =====================================================================
+#  PARÇALI MOTOR
+# =====================================================================
+def _event_chunks(T: int, chunk_size: int, p: dict, rng: np.random.Generator):
+    streams = dict(zip(_STREAMS, rng.spawn(len(_STREAMS))))
+    events = _MachineEvents(p, streams["events"])
+
+    dt = p["dt"]
+    base_service = np.array([p["base_service_A"], p["base_service_B"], p["base_service_C"]])
+    batch_values = np.array([0, 5, 10])
+    batch_p = [0.85, 0.1, 0.05]
+    fatigue_step = p["operator_fatigue_rate"] * dt
+    thinning = streams["thinning"]
+
+    normal_queue = 0.0
+    priority_queue = 0.0
+    fatigue_prev, fatigue_anchor = 0.2, -1   # son yorgunluk değeri ve tiki
+    last_lead = None
+
+    a = 0
+    for _ in range(max(1, -(-T // chunk_size))):
+        n = min(chunk_size, T - a)
+        steps = np.arange(a, a + n)
+
+        # ---- Zamana bağlı deterministik bileşenler
+        hour = (steps % 144) // 6
+        shift_id = np.where((hour >= 6) & (hour < 14), 1,
+                            np.where((hour >= 14) & (hour < 22), 2, 3))
+        shift_factor = np.select([shift_id == 1, shift_id == 2], [1.20, 1.00], 0.85)
+        daily_pattern = 1 + 0.3*np.sin(2*np.pi*(steps/144))
+        weekly_pattern = 1 + 0.2*np.sin(2*np.pi*(steps/1008))
+        pr_ratio = 0.15 + 0.1*np.sin(2*np.pi*(steps/288))
+        time_in_shift = steps % 48
+        operator_skill = 0.3 + 0.7 / (1 + np.exp(-0.1*(time_in_shift - 24)))
+
+        # ---- Varışlar (durumdan bağımsız → tek çekiliş)
+        spike = streams["spike"].random(n) < 0.02
+        batch = streams["batch"].choice(batch_values, size=n, p=batch_p)
+        lam = p["base_arrival"] * daily_pattern * weekly_pattern * shift_factor \
+            * np.where(spike, 2.5, 1.0) * dt
+        arrivals = streams["arrivals"].poisson(lam) + batch
+        pr_in = np.floor(arrivals * pr_ratio)
+        nr_in = arrivals - pr_in
+
+        # ---- Yorgunluk: vardiya başında sıfırlanan kırpılmış doğrusal artış
+        reset = (time_in_shift == 0) & (steps > 0)
+        reset_value = 0.3 + streams["fatigue"].random(n)*0.1
+        seg = np.maximum.accumulate(np.where(reset, np.arange(n), -1))
+        anchor = np.where(seg >= 0, a + seg, fatigue_anchor)
+        base = np.where(seg >= 0, reset_value[np.maximum(seg, 0)], fatigue_prev)
+        operator_fatigue = np.where(
+            reset, reset_value, np.clip(base + fatigue_step*(steps - anchor), 0.1, 1.0)
+        )
+        fatigue_prev, fatigue_anchor = float(operator_fatigue[-1]), a + n - 1
+        operator_load = np.clip(
+            0.5 + 0.4*operator_fatigue - 0.2*(operator_skill - 0.5), 0.1, 1.0
+        )
+
+        # ---- Makine durumları: heap'teki seyrek olaylardan
+        status = np.ones((n, 3), dtype=np.int8)
+        maint_flag = np.zeros((n, 3), dtype=np.int8)
+        events.fill(a, a + n, status, maint_flag)
+
+        # ---- Hızlar, kapasite, defect oranı, enerji
+        speed = (
+            base_service * (shift_factor * (0.8 + 0.4*operator_skill)
+                            * (1.1 - 0.3*operator_fatigue))[:, None]
+            + streams["noise"].standard_normal((n, 3))*p["noise_level"]
+        )
+        speed = np.where(status == 1, np.maximum(speed, 0), 0.0)
+        cap = np.maximum(np.rint(speed*dt), 0).astype(np.int64)
+
+        defect_rate = np.clip(
+            p["defect_base"] + 0.1*operator_fatigue + 0.05*(1 - operator_skill)
+            + 0.05*(1 - status.mean(axis=1)),
+            0, 0.4,
+        )
+        full_defects = streams["defects"].binomial(cap, defect_rate[:, None])
+
+        energy = np.where(
+            status == 1,
+            (p["energy_idle"] + p["energy_per_speed"]*speed) * dt,
+            p["energy_idle"]*0.3*dt,
+        ).sum(axis=1)
+
+        # ---- Kuyruk tüketimi (skaler döngü; makineler sırayla aynı kuyruğu)
+        nq_rec = np.empty(n)
+        pq_rec = np.empty(n)
+        completed = np.zeros(n, dtype=np.int64)
+        defects_rec = np.zeros(n, dtype=np.int64)
+
+        caps = cap.tolist()
+        fulls = full_defects.tolist()
+        nr_list = nr_in.tolist()
+        pr_list = pr_in.tolist()
+        for i in range(n):
+            normal_queue += nr_list[i]
+            priority_queue += pr_list[i]
+            done = 0
+            bad = 0
+            cap_i = caps[i]
+            for m in range(3):
+                c = cap_i[m]
+                if c <= 0:
+                    continue
+                from_pr = min(priority_queue, c)
+                priority_queue -= from_pr
+                from_nr = min(normal_queue, c - from_pr)
+                normal_queue -= from_nr
+                processed = int(from_pr + from_nr)
+                if processed <= 0:
+                    continue
+                d = fulls[i][m]
+                if processed < c and d:
+                    d = int(thinning.hypergeometric(d, c - d, processed))
+                normal_queue += d   # rework
+                done += processed - d
+                bad += d
+            nq_rec[i] = normal_queue
+            pq_rec[i] = priority_queue
+            completed[i] = done
+            defects_rec[i] = bad
+
+        # ---- Kayıt
+        wip = nq_rec + pq_rec
+        rec = {
+            "time": steps*dt, "step": steps, "hour": hour, "shift_id": shift_id,
+            "normal_queue": nq_rec, "priority_queue": pq_rec, "wip_total": wip,
+            "completed_jobs": completed,
+            "defect_rate": np.where(completed > 0, defect_rate, 0),
+            "defects": defects_rec,
+            "energy_consumption": energy,
+            "operator_load": operator_load, "operator_skill": operator_skill,
+            "operator_fatigue": operator_fatigue,
+            "demand_spike_flag": spike,
+        }
+        for m, name in enumerate("ABC"):
+            rec[f"machine_{name}_status"] = status[:, m]
+            rec[f"machine_{name}_speed"] = speed[:, m]
+            rec[f"maintenance_{name}"] = maint_flag[:, m]
+        rec = {c: np.asarray(rec[c]).astype(COLUMN_DTYPES[c]) for c in RECORD_COLUMNS}
+
+        rec["queue_length"] = rec["wip_total"].copy()
+        rec["lead_time"] = _lead_time(
+            rec["wip_total"], completed, last=last_lead
+        ).astype(COLUMN_DTYPES["lead_time"])
+        done_idx = np.flatnonzero(completed)
+        if len(done_idx):
+            last_lead = rec["wip_total"][done_idx[-1]] / completed[done_idx[-1]]
+        rec["machine_status"] = status.mean(axis=1).astype(COLUMN_DTYPES["machine_status"])
+
+        yield rec
+        a += n
+
+
+def iter_event_chunks(
+    T: int = 2000,
+    chunk_size: int = 1_000_000,
+    seed: int | None = 42,
+    as_frame: bool = True,
+    rng: np.random.Generator | None = None,
+    **params,
+):
+    """
+    iter_production_line_chunks'ın olay güdümlü karşılığı (aynı kolonlar,
+    aynı tipler). Sonuç chunk_size'dan bağımsızdır; yalnızca ilk
+    tamamlanan işten önceki lead_time satırları parçanın wip
+    ortalamasıyla doldurulduğundan chunk_size'a bağlıdır.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size pozitif olmalı: {chunk_size}")
+
+    p = _simulation_params(params)
+    if rng is None:
+        rng = np.random.default_rng(np.random.SeedSequence(seed))
+    start = 0
+    for chunk in _event_chunks(T, chunk_size, p, rng):
+        yield _chunk_to_frame(chunk, start) if as_frame else chunk
+        start += len(chunk["step"])
+
+
+def simulate_production_line_events(
+    T: int = 2000,
+    seed: int | None = 42,
+    rng: np.random.Generator | None = None,
+    chunk_size: int = 1_000_000,
+    **params,
+) -> pd.DataFrame:
+    """simulate_production_line_advanced ile aynı imza/kolonlar, olay güdümlü motor."""
+    frames = list(iter_event_chunks(T, chunk_size, seed, True, rng, **params))
+    return frames[0] if len(frames) == 1 else pd.concat(frames)
+
+
+# =====================================================================
+#  DOĞRULAMA: DAĞILIMSAL EŞDEĞERLİK
+# =====================================================================
+COMPARE_COLUMNS = [
+    "wip_total", "completed_jobs", "defects", "defect_rate", "energy_consumption",
+    "operator_fatigue", "machine_A_status", "machine_B_status", "machine_C_status",
+    "maintenance_A", "maintenance_B", "maintenance_C", "machine_A_speed", "lead_time",
+]
+
+
+def compare_distributions(n_reps=30, T=2000, seed=0, columns=None, alpha=0.01, **params):
+    """
+    Her iki motoru n_reps bağımsız seed ile koşturur ve kolon başına
+    karşılaştırır:
+    - pooled_*  : tüm tiklerin ortalaması (bilgi)
+    - ks_p      : replikasyon ortalamalarının iki örneklem KS testi
+    - welch_p   : aynı ortalamalar için Welch t testi
+    Dönüş: (DataFrame, ok) — ok: her kolonda iki p > alpha.
+    """
+    from scipy import stats
+
+    columns = columns or COMPARE_COLUMNS
+    seeds = np.random.SeedSequence(seed).spawn(2 * n_reps)
+
+    def rep_means(simulate, seqs):
+        rows = [simulate(T=T, rng=np.random.default_rng(s), **params)[columns] for s in seqs]
+        return (pd.DataFrame([r.mean() for r in rows]),
+                pd.concat(rows, ignore_index=True))
+
+    tick_means, tick_all = rep_means(simulate_production_line_advanced, seeds[:n_reps])
+    event_means, event_all = rep_means(simulate_production_line_events, seeds[n_reps:])
+
+    out = []
+    for c in columns:
+        a, b = tick_means[c].to_numpy(), event_means[c].to_numpy()
+        same = np.allclose(a, a[0]) and np.allclose(b, b[0]) and np.isclose(a[0], b[0])
+        out.append({
+            "column": c,
+            "pooled_tick": float(tick_all[c].mean()),
+            "pooled_event": float(event_all[c].mean()),
+            "std_tick": float(tick_all[c].std()),
+            "std_event": float(event_all[c].std()),
+            "ks_p": 1.0 if same else float(stats.ks_2samp(a, b).pvalue),
+            "welch_p": 1.0 if same else float(stats.ttest_ind(a, b, equal_var=False).pvalue),
+        })
+    report = pd.DataFrame(out).set_index("column")
+    ok = bool(((report["ks_p"] > alpha) & (report["welch_p"] > alpha)).all())
+    return report, ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Olay güdümlü simülasyon: doğrulama / hız")
+    parser.add_argument("--validate", action="store_true")
+    parser.add_argument("--bench", action="store_true")
+    parser.add_argument("--reps", type=int, default=30)
+    parser.add_argument("--T", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    status = 0
+    if args.validate:
+        report, ok = compare_distributions(args.reps, args.T, args.seed)
+        with pd.option_context("display.width", 160, "display.max_columns", None,
+                               "display.float_format", "{:.4g}".format):
+            print(report)
+        print("\nDağılımsal eşdeğerlik:", "OK" if ok else "BAŞARISIZ")
+        status = 0 if ok else 1
+
+    if args.bench or not args.validate:
+        t = time.perf_counter()
+        simulate_production_line_events(T=args.T, seed=args.seed)
+        event_s = time.perf_counter() - t
+        tick_T = min(args.T, 20_000)
+        t = time.perf_counter()
+        simulate_production_line_advanced(T=tick_T, seed=args.seed)
+        tick_s = (time.perf_counter() - t) * args.T / tick_T
+        print(f"T={args.T}: olay {event_s:.2f}s, tik {tick_s:.2f}s"
+              f"{' (tahmini)' if tick_T < args.T else ''} → {tick_s / event_s:.0f}x")
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,425 @@
+"""
+============================================================
+ ARTIMLI KPI ÖZELLİK DEPOSU (KAYAN PENCERELER + VARDİYALAR)
+============================================================
+
+Simülatörün her yeni tikinde kayan KPI'ları O(1) günceller; tüm
+DataFrame'i yeniden taramaz.
+
+- Ham girdiler max(windows) kapasiteli bir halka dizide tutulur; her
+  pencere için kolon toplamları ve kare toplamları yürütülür. Yeni
+  değer eklenir, pencereden çıkan değer halkadan okunup düşülür
+  (tüm pencereler tek NumPy adımında).
+- Kayan toplamlardaki yuvarlama birikimi recompute_every tikte bir
+  halkadan baştan toplanarak sıfırlanır (amortize O(1)).
+- Vardiya kovaları shift_id değiştiğinde kapanır ve shifts halka
+  tamponuna (src.ring_buffer.RingBuffer) yazılır.
+- Her tikin özellik değerleri history halka tamponunda tutulur:
+  dashboard since(seen) ile yalnızca yeni satırları, ortam vector()
+  ile yalnızca son değerleri alır.
+
+Pencere başına özellikler (ad_{w}):
+  lead_time_mean / lead_time_std / queue_length_mean / queue_length_std
+  throughput        : tik başına tamamlanan iş
+  defect_rate       : hatalı / işlenen (işlenen = tamamlanan + hatalı)
+  defect_rate_A/B/C : makine bazlı; yalnızca ProductionLineSim'den
+                      beslenirken (kayıtlı veride makine kırılımı yok → NaN)
+  energy_per_job    : enerji / tamamlanan iş
+Vardiya özellikleri:
+  shift_ticks, shift_throughput, shift_defect_rate, shift_energy_per_job
+  (süren vardiya), prev_shift_throughput (son kapanan vardiya)
+
+Kullanım:
+---------
+store = FeatureStore(windows=(12, 48, 144))
+sim = ProductionLineSim(seed=0)
+for _ in range(1000):
+    store.update_from_sim(sim, sim.step())
+store.current()["lead_time_mean_48"]
+store.vector(["throughput_12", "energy_per_job_144"])     # float32, ortam için
+store.history_column("throughput_48", last=200)          # dashboard grafiği
+store.update_chunk(feed.poll())                          # {kolon: dizi} / DataFrame
+
+python -m src.feature_store --T 20000       # artımlı ↔ pandas rolling doğrulaması
+
+============================================================
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from src.ring_buffer import RingBuffer
+
+
+MACHINES = ("A", "B", "C")
+
+STAT_COLUMNS = ("lead_time", "queue_length")
+SUM_COLUMNS = (
+    "completed_jobs", "defects", "processed", "energy_consumption",
+    *(f"processed_{m}" for m in MACHINES), *(f"defects_{m}" for m in MACHINES),
+)
+
+SHIFT_COLUMNS = [
+    "shift_id", "start_tick", "ticks", "completed", "defects", "energy",
+    "throughput", "defect_rate", "energy_per_job",
+]
+
+_SHIFT_INDEX = 3       # RECORD_COLUMNS'ta shift_id (data_simulation import edilmeden)
+
+SHIFT_FEATURES = [
+    "shift_ticks", "shift_throughput", "shift_defect_rate", "shift_energy_per_job",
+    "prev_shift_throughput",
+]
+
+
+_RATIO, _MEAN, _STD = range(3)     # özellik planı türleri
+
+
+def sim_values(sim, row) -> dict:
+    """ProductionLineSim.step() satırı → depo girdileri (makine kırılımı simden)."""
+    from src.data_simulation import ROW_INDEX
+
+    wip = row[ROW_INDEX["wip_total"]]
+    values = {
+        "lead_time": sim.lead_time if sim.lead_time is not None else wip,
+        "queue_length": wip,
+        "completed_jobs": row[ROW_INDEX["completed_jobs"]],
+        "defects": row[ROW_INDEX["defects"]],
+        "energy_consumption": row[ROW_INDEX["energy_consumption"]],
+    }
+    for m, processed, defects in zip(MACHINES, sim.machine_processed, sim.machine_defects):
+        values[f"processed_{m}"] = processed
+        values[f"defects_{m}"] = defects
+    return values
+
+
+def _ratio(num, den):
+    return num / den if den > 0 else math.nan
+
+
+class FeatureStore:
+    def __init__(self, windows=(12, 48, 144), stat_columns=STAT_COLUMNS,
+                 history: int = 4096, shift_history: int = 256,
+                 recompute_every: int | None = None):
+        if not windows or min(windows) < 1:
+            raise ValueError(f"windows pozitif olmalı: {windows}")
+
+        self.windows = tuple(sorted(set(int(w) for w in windows)))
+        self.stat_columns = tuple(stat_columns)
+        if set(self.stat_columns) & set(SUM_COLUMNS):
+            # Stat kolonları referansa göre kaydırılır; oranlar ham toplam ister
+            raise ValueError(f"stat_columns oran girdileriyle çakışamaz: {SUM_COLUMNS}")
+        self.inputs = list(self.stat_columns) + list(SUM_COLUMNS)
+        self._col = {c: i for i, c in enumerate(self.inputs)}
+
+        self.capacity = self.windows[-1]
+        self.recompute_every = max(recompute_every or 16 * self.capacity, self.capacity)
+        self._wins = np.array(self.windows)
+
+        self._build_layout()
+        self.names = [
+            f"{name}_{w}" for w in self.windows for name in self._window_names
+        ] + SHIFT_FEATURES
+        self._index = {name: i for i, name in enumerate(self.names)}
+
+        # history=0 → tik başına özellik kaydı yok; özellikler yalnızca okunurken hesaplanır
+        self.history = RingBuffer(history, ["tick", *self.names]) if history else None
+        self.shifts = RingBuffer(shift_history, SHIFT_COLUMNS)
+        self.clear()
+
+    def _build_layout(self):
+        """
+        Pencere özellik planı: (tür, a, b) demetleri. Diziler küçük
+        (pencere × kolon) olduğundan özellikler düz Python ile hesaplanır;
+        bu boyutta onlarca küçük NumPy çağrısından hızlıdır.
+        """
+        c = self._col
+        names, plan = [], []
+        for col in self.stat_columns:
+            names += [f"{col}_mean", f"{col}_std"]
+            plan += [(_MEAN, c[col], None), (_STD, c[col], None)]
+        names += ["throughput", "defect_rate"]
+        plan += [(_MEAN, c["completed_jobs"], None), (_RATIO, c["defects"], c["processed"])]
+        for m in MACHINES:
+            names.append(f"defect_rate_{m}")
+            plan.append((_RATIO, c[f"defects_{m}"], c[f"processed_{m}"]))
+        names.append("energy_per_job")
+        plan.append((_RATIO, c["energy_consumption"], c["completed_jobs"]))
+
+        self._window_names = names
+        self._plan = plan
+        self._stat_idx = np.array([c[col] for col in self.stat_columns], dtype=np.intp)
+
+    def clear(self) -> None:
+        n_w, n_c = len(self.windows), len(self.inputs)
+        self._ring = np.zeros((self.capacity, n_c))
+        self._sum = np.zeros((n_w, n_c + 1))      # son sütun: _n
+        self._sumsq = np.zeros((n_w, n_c))
+        # Ortalama/varyans için referans kaydırma: toplamlar (x - ref) üzerinden
+        # tutulur, sıfıra yakın varyansta sumsq - sum² iptali küçülür
+        self._ref = np.zeros(n_c)
+        self._values = np.full(len(self.names), np.nan)
+        self.total = 0
+        self._dirty = False
+
+        self._shift_id = None
+        self._shift_start = 0
+        self._shift_sums = [0, 0.0, 0.0, 0.0]     # tik, tamamlanan, hatalı, enerji
+        self._prev_throughput = math.nan
+
+        if self.history is not None:
+            self.history.clear()
+        self.shifts.clear()
+
+    def __len__(self) -> int:
+        return self.total
+
+    # ------------------------------------------------------------
+    #  Güncelleme (tik başına O(pencere × kolon), veri boyundan bağımsız)
+    # ------------------------------------------------------------
+    def update(self, values, shift_id=None) -> None:
+        """
+        values: girdi kolonu → değer (eksik kolonlar 0 sayılır).
+        processed verilmezse completed_jobs + defects alınır.
+        """
+        x = np.array([values.get(c, 0.0) for c in self.inputs], dtype=np.float64)
+        if "processed" not in values:
+            c = self._col
+            x[c["processed"]] = x[c["completed_jobs"]] + x[c["defects"]]
+        self._push(x)
+        self._update_shift(shift_id, x)
+        if self.history is not None:
+            self._refresh()
+            row = dict(zip(self.names, self._values.tolist()))
+            row["tick"] = self.total - 1
+            self.history.append(row)
+
+    def update_from_sim(self, sim, row) -> None:
+        """ProductionLineSim.step() satırı + simin makine bazlı sayımları."""
+        self.update(sim_values(sim, row), shift_id=row[_SHIFT_INDEX])
+
+    def update_chunk(self, chunk, last: int | None = None) -> None:
+        """
+        {kolon: dizi} ya da DataFrame parçasını satır satır işler (ör. canlı
+        akış). last: yalnızca son last satır (ör. büyük ilk backfill'de
+        max(windows) + geçmiş kadarı yeterli).
+        """
+        if chunk is None:
+            return
+        present = [c for c in self.inputs if c in chunk]
+        if not present:
+            return
+        start = 0 if last is None else max(0, len(chunk[present[0]]) - last)
+        cols = {c: np.asarray(chunk[c], dtype=np.float64)[start:].tolist() for c in present}
+        shift = np.asarray(chunk["shift_id"])[start:].tolist() if "shift_id" in chunk else None
+        for i in range(len(cols[present[0]])):
+            self.update({c: v[i] for c, v in cols.items()},
+                        shift_id=None if shift is None else shift[i])
+
+    def _push(self, x) -> None:
+        # Halka (x - ref) tutar; pencereden çıkan değer mutlak numarası
+        # total - w olan satır. Henüz dolmamış pencerede o yuva hiç
+        # yazılmamıştır (sıfır), maske gerekmez.
+        d = x - self._ref
+        leaving = self._ring[(self.total - self._wins) % self.capacity]
+        diff = d - leaving
+        self._sum[:, :-1] += diff
+        self._sumsq += diff * (d + leaving)
+
+        self._ring[self.total % self.capacity] = d
+        self.total += 1
+        if self.total <= self.capacity:
+            self._sum[:, -1] = np.minimum(self.total, self._wins)
+        if self.total % self.recompute_every == 0:
+            self._recompute()
+        self._dirty = True
+
+    def _recompute(self) -> None:
+        """
+        Kayan toplamları halkadan baştan hesaplar (yuvarlama birikimini
+        siler) ve referansı en uzun pencerenin ortalamasına taşır.
+        recompute_every >= capacity olduğundan halka bu noktada doludur.
+        """
+        stat = self._stat_idx
+        shift = np.zeros_like(self._ref)
+        shift[stat] = self._ring[:, stat].mean(axis=0)
+        self._ring -= shift
+        self._ref += shift
+
+        ordered = np.roll(self._ring, -(self.total % self.capacity), axis=0)
+        for k, w in enumerate(self.windows):
+            tail = ordered[self.capacity - w:]
+            self._sum[k, :-1] = tail.sum(axis=0)
+            self._sumsq[k] = (tail * tail).sum(axis=0)
+
+    def _update_shift(self, shift_id, x) -> None:
+        if shift_id is None:
+            return
+        if self._shift_id is not None and shift_id != self._shift_id:
+            self._close_shift()
+        if self._shift_id != shift_id:
+            self._shift_id = shift_id
+            self._shift_start = self.total - 1
+
+        c = self._col
+        sums = self._shift_sums
+        sums[0] += 1
+        sums[1] += x[c["completed_jobs"]]
+        sums[2] += x[c["defects"]]
+        sums[3] += x[c["energy_consumption"]]
+
+    def _close_shift(self) -> None:
+        ticks, completed, defects, energy = self._shift_sums
+        throughput = completed / ticks
+        self.shifts.append({
+            "shift_id": self._shift_id, "start_tick": self._shift_start, "ticks": ticks,
+            "completed": completed, "defects": defects, "energy": energy,
+            "throughput": throughput,
+            "defect_rate": _ratio(defects, completed + defects),
+            "energy_per_job": _ratio(energy, completed),
+        })
+        self._prev_throughput = throughput
+        self._shift_sums = [0, 0.0, 0.0, 0.0]
+
+    def _refresh(self) -> None:
+        """Özellikleri kayan toplamlardan hesaplar (okunurken ya da history için)."""
+        nan = math.nan
+        ref = self._ref.tolist()
+        vals = []
+        # Ortalama = ref + kaydırılmış ortalama; varyans kaydırmadan bağımsız
+        for s, q in zip(self._sum.tolist(), self._sumsq.tolist()):
+            n = s[-1]
+            for kind, a, b in self._plan:
+                if kind == _RATIO:
+                    vals.append(s[a] / s[b] if s[b] > 0 else nan)
+                elif n <= 0:
+                    vals.append(nan)
+                elif kind == _MEAN:
+                    vals.append(ref[a] + s[a] / n)
+                else:
+                    m = s[a] / n
+                    vals.append(math.sqrt(max(q[a] / n - m * m, 0.0)))
+
+        ticks, completed, defects, energy = self._shift_sums
+        vals += (
+            ticks, _ratio(completed, ticks), _ratio(defects, completed + defects),
+            _ratio(energy, completed), self._prev_throughput,
+        )
+        self._values[:] = vals
+        self._dirty = False
+
+    # ------------------------------------------------------------
+    #  Sunum
+    # ------------------------------------------------------------
+    def _latest(self) -> np.ndarray:
+        if self._dirty:
+            self._refresh()
+        return self._values
+
+    def current(self) -> dict:
+        return dict(zip(self.names, self._latest().tolist()))
+
+    def get(self, name: str) -> float:
+        return float(self._latest()[self._index[name]])
+
+    def indices(self, names) -> np.ndarray:
+        """vector() için önceden çözülmüş özellik indeksleri."""
+        return np.array([self._index[n] for n in names], dtype=np.intp)
+
+    def vector(self, names=None, nan=0.0) -> np.ndarray:
+        """Seçili özelliklerin (isimler ya da indices()) son değerleri → float32, NaN → nan."""
+        values = self._latest()
+        if names is not None:
+            idx = names if isinstance(names, np.ndarray) else self.indices(names)
+            values = values[idx]
+        return np.where(values == values, values, nan).astype(np.float32)
+
+    def history_column(self, name: str, last: int | None = None) -> np.ndarray:
+        return self._require_history().column(name, last)
+
+    def since(self, seen: int) -> dict:
+        """Dashboard için: history'de seen'den sonra eklenen satırlar."""
+        return self._require_history().since(seen)
+
+    def _require_history(self) -> RingBuffer:
+        if self.history is None:
+            raise ValueError("history=0 ile kuruldu; özellik geçmişi tutulmuyor")
+        return self.history
+
+    def shift_table(self, last: int | None = None) -> dict:
+        return self.shifts.to_dict(last)
+
+
+# ============================================================
+# DOĞRULAMA & HIZ
+# ============================================================
+
+def check_against_pandas(T=20_000, windows=(12, 48, 144), seed=0, atol=1e-5):
+    """
+    Artımlı değerleri pandas rolling ile karşılaştırır.
+    Dönüş: {"per_tick_us" (yalnızca depo), "max_rel_err": {özellik: hata}, "ok"}.
+    Sabit pencerelerde std ~1e-6 mertebesinde sıfırdan sapabilir (kare
+    toplamı yuvarlaması); atol buna göre seçili.
+    """
+    import pandas as pd
+    from src.data_simulation import ProductionLineSim
+
+    sim = ProductionLineSim(seed=seed)
+    rows, shifts = [], []
+    for _ in range(T):
+        row = sim.step()
+        rows.append(sim_values(sim, row))
+        shifts.append(row[_SHIFT_INDEX])
+
+    store = FeatureStore(windows, history=T, recompute_every=4 * max(windows))
+    t0 = time.perf_counter()
+    for values, shift_id in zip(rows, shifts):
+        store.update(values, shift_id=shift_id)
+    per_tick_us = (time.perf_counter() - t0) / T * 1e6
+
+    raw = pd.DataFrame(rows, dtype=np.float64)
+    errors = {}
+    for w in windows:
+        roll = raw.rolling(w, min_periods=1)
+        sums, n = roll.sum(), raw.index.to_series().clip(upper=w - 1) + 1
+        expected = {
+            f"lead_time_mean_{w}": roll.mean()["lead_time"],
+            f"lead_time_std_{w}": roll.std(ddof=0)["lead_time"],
+            f"queue_length_mean_{w}": roll.mean()["queue_length"],
+            f"queue_length_std_{w}": roll.std(ddof=0)["queue_length"],
+            f"throughput_{w}": sums["completed_jobs"] / n,
+            f"energy_per_job_{w}": sums["energy_consumption"] / sums["completed_jobs"].where(sums["completed_jobs"] > 0),
+            f"defect_rate_A_{w}": sums["defects_A"] / sums["processed_A"].where(sums["processed_A"] > 0),
+        }
+        for name, exp in expected.items():
+            got = store.history_column(name)
+            exp = exp.to_numpy()
+            scale = np.maximum(np.abs(exp), 1.0)
+            err = np.abs(got - exp) / scale
+            errors[name] = float(np.nanmax(err))
+            if (np.isnan(got) != np.isnan(exp)).any():
+                errors[name] = math.inf
+
+    return {"per_tick_us": per_tick_us, "max_rel_err": errors,
+            "ok": all(e <= atol for e in errors.values())}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Artımlı KPI deposu: pandas rolling doğrulaması")
+    parser.add_argument("--T", type=int, default=20_000)
+    parser.add_argument("--windows", type=int, nargs="+", default=[12, 48, 144])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    report = check_against_pandas(args.T, tuple(args.windows), args.seed)
+    for name, err in report["max_rel_err"].items():
+        print(f"{name:28s} {err:.2e}")
+    print(f"Depo güncellemesi (tik başına): {report['per_tick_us']:.1f} µs   ok={report['ok']}")
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
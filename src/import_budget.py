@@ -0,0 +1,120 @@
+"""
+============================================================
+ İÇE AKTARMA SÜRESİ VE BELLEK BÜTÇESİ
+============================================================
+
+Her içe aktarma yolunu temiz bir alt süreçte (python -c) ölçer:
+- import_s : yalnızca import ifadelerinin süresi (yorumlayıcı açılışı hariç)
+- rss_mb   : alt sürecin tepe RSS'i (ru_maxrss)
+- heavy    : yüklenmiş ağır çerçeveler (tensorflow, torch, ...)
+
+Bütçeli yollar (package, env, vec_env, metrics) bütçeyi aşarsa ya da bir
+ağır çerçeve yüklenirse çıkış kodu 1 olur; RL alt süreç işçileri yalnızca
+ortam yolunu kullandığı için bu yol hafif kalmalıdır.
+
+Kullanım:
+---------
+python -m src.import_budget                    # bütçeli yollar
+python -m src.import_budget --all              # + bilgi amaçlı ağır yollar
+python -m src.import_budget --time-budget 1.0 --rss-budget 200
+
+============================================================
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+HEAVY_MODULES = ["tensorflow", "torch", "statsmodels", "sklearn", "stable_baselines3", "scipy"]
+
+# yol adı → (import ifadeleri, bütçe uygulanır mı)
+IMPORT_PATHS = {
+    "package": ("import src", True),
+    "env": ("from src.env_rl import ProductionLineEnv", True),
+    "vec_env": ("from src.vec_env_rl import ProductionLineVectorEnv", True),
+    "metrics": ("from src.metrics import discounted_reward", True),
+    "simulation": ("from src.data_simulation import simulate_production_line_advanced", False),
+    "lstm_torch": ("from src.lstm_torch import LSTMPredictor", False),
+    "time_series": ("from src.time_series_models import RollingSarimaForecaster", False),
+}
+
+_CHILD = """
+import json, resource, sys, time
+t = time.perf_counter()
+exec({stmt!r})
+elapsed = time.perf_counter() - t
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+rss_mb = rss / 1024**2 if sys.platform == "darwin" else rss / 1024
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"import_s": elapsed, "rss_mb": rss_mb, "heavy": heavy}}))
+"""
+
+
+def measure(stmt, repeat=5):
+    """stmt'i repeat kez temiz süreçte çalıştırır → medyan süre, en büyük RSS."""
+    runs = []
+    env = {**os.environ, "PYTHONPATH": PROJECT_ROOT + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _CHILD.format(stmt=stmt, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, cwd=PROJECT_ROOT, env=env, check=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "import_s": float(np.median([r["import_s"] for r in runs])),
+        "rss_mb": float(max(r["rss_mb"] for r in runs)),
+        "heavy": runs[-1]["heavy"],
+    }
+
+
+def check_budget(time_budget=0.75, rss_budget=150.0, repeat=5, include_all=False):
+    """Dönüş: ({yol: ölçüm}, ihlaller listesi)."""
+    results, violations = {}, []
+    for name, (stmt, budgeted) in IMPORT_PATHS.items():
+        if not budgeted and not include_all:
+            continue
+        r = measure(stmt, repeat)
+        r["budgeted"] = budgeted
+        results[name] = r
+        if not budgeted:
+            continue
+        if r["heavy"]:
+            violations.append(f"{name}: ağır modül yüklendi → {', '.join(r['heavy'])}")
+        if r["import_s"] > time_budget:
+            violations.append(f"{name}: içe aktarma {r['import_s']:.2f}s > {time_budget:.2f}s")
+        if r["rss_mb"] > rss_budget:
+            violations.append(f"{name}: RSS {r['rss_mb']:.0f} MB > {rss_budget:.0f} MB")
+    return results, violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="src içe aktarma süresi / RSS bütçesi")
+    parser.add_argument("--time-budget", type=float, default=0.75, help="saniye")
+    parser.add_argument("--rss-budget", type=float, default=150.0, help="MB")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--all", action="store_true", help="bütçesiz ağır yolları da ölç")
+    args = parser.parse_args(argv)
+
+    results, violations = check_budget(args.time_budget, args.rss_budget, args.repeat, args.all)
+
+    for name, r in results.items():
+        tag = "bütçe" if r["budgeted"] else "bilgi"
+        heavy = ", ".join(r["heavy"]) or "-"
+        print(f"[{tag}] {name:12s} {r['import_s']*1e3:8.1f} ms  {r['rss_mb']:7.1f} MB  ağır: {heavy}")
+
+    if violations:
+        print("\nBÜTÇE AŞILDI:\n  " + "\n  ".join(violations))
+        return 1
+    print("\nBütçe içinde.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
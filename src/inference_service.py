@@ -0,0 +1,330 @@
+"""
+============================================================
+ MİKRO-BATCH ÇIKARIM SERVİSİ (asyncio)
+============================================================
+
+Dashboard, değerlendirme betikleri ve ortam işçileri lead-time
+LSTM'ini aynı anda, her istekte tek pencereyle çağırır. Bu servis
+gelen predict isteklerini kuyruğa alır ve bunları mikro-batch'lerde
+birleştirir:
+
+- batch, max_batch_size dolunca ya da ilk istekten itibaren
+  max_wait_ms geçince kapanır → tek ileri geçiş (predict_batch)
+- her isteğin kendi future'ı sonuçla tamamlanır
+- stats(): kuyruk derinliği, batch boyutu histogramı, p50/p99 gecikme
+
+Kullanım:
+---------
+# Süreç içi (asyncio)
+predictor = LSTMPredictor("models/lstm_lead_time.pt")
+batcher = MicroBatcher(predictor.predict_batch, window=predictor.window)
+await batcher.start()
+pred = await batcher.predict(window)
+
+# Süreç içi (senkron kod, ör. dashboard / thread'ler)
+service = BackgroundInferenceService(predictor.predict_batch).start()
+pred = service.predict(window)
+
+# Unix soketi üzerinden
+python -m src.inference_service --socket /tmp/rlvezs_lstm.sock --max-batch 64 --max-wait-ms 2
+client = InferenceClient("/tmp/rlvezs_lstm.sock"); client.predict(window)
+
+============================================================
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+# =====================================================================
+#  METRİKLER
+# =====================================================================
+class ServiceStats:
+    def __init__(self, latency_window: int = 10_000):
+        self.batch_sizes = Counter()
+        self.latencies = deque(maxlen=latency_window)   # saniye
+        self.requests = 0
+        self.batches = 0
+        self.max_queue_depth = 0
+
+    def record_batch(self, size: int, latencies) -> None:
+        self.batch_sizes[size] += 1
+        self.batches += 1
+        self.requests += size
+        self.latencies.extend(latencies)
+
+    def snapshot(self, queue_depth: int) -> dict:
+        lat = np.fromiter(self.latencies, dtype=np.float64) * 1e3
+        p50, p99 = np.percentile(lat, [50, 99]) if len(lat) else (0.0, 0.0)
+        return {
+            "queue_depth": queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "batch_size_hist": dict(sorted(self.batch_sizes.items())),
+            "latency_ms_p50": float(p50),
+            "latency_ms_p99": float(p99),
+        }
+
+
+# =====================================================================
+#  MİKRO-BATCHER
+# =====================================================================
+class MicroBatcher:
+    """
+    predict_batch_fn: (B, T) ya da (B, T, 1) float32 → (B,).
+    İleri geçişler tek işçili bir thread havuzunda sırayla çalışır;
+    olay döngüsü bu sırada yeni istekleri kuyruğa almaya devam eder.
+
+    window: beklenen pencere uzunluğu T. None ise ilk geçerli istek
+    belirler. Uzunluğu tutmayan pencere kuyruğa alınmadan ValueError
+    ile reddedilir; böylece tek hatalı istek batch'i bozamaz.
+    """
+
+    def __init__(self, predict_batch_fn, max_batch_size: int = 64, max_wait_ms: float = 2.0,
+                 window: int | None = None):
+        self.predict_batch_fn = predict_batch_fn
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1e3
+        self.stats_ = ServiceStats()
+        self._queue = None
+        self._task = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lstm-batch")
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=False)
+
+    def _validate(self, window) -> np.ndarray:
+        """(T,) ya da (T, 1) → (T,) float32; şekil uymazsa ValueError."""
+        arr = np.asarray(window, dtype=np.float32)
+        if arr.ndim == 2 and arr.shape[1] == 1:
+            arr = arr[:, 0]
+        if arr.ndim != 1 or arr.size == 0:
+            raise ValueError(f"Pencere (T,) ya da (T, 1) olmalı, gelen şekil: {np.shape(window)}")
+        if self.window is None:
+            self.window = len(arr)
+        elif len(arr) != self.window:
+            raise ValueError(f"Pencere uzunluğu {self.window} olmalı, gelen: {len(arr)}")
+        return arr
+
+    async def predict(self, window) -> float:
+        arr = self._validate(window)
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((arr, fut, time.perf_counter()))
+        self.stats_.max_queue_depth = max(self.stats_.max_queue_depth, self._queue.qsize())
+        return await fut
+
+    def stats(self) -> dict:
+        return self.stats_.snapshot(self._queue.qsize() if self._queue is not None else 0)
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Kuyrukta bekleyenleri beklemeden al
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            remaining = deadline - time.perf_counter()
+            if len(batch) >= self.max_batch_size or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+
+            try:
+                windows = np.stack([item[0] for item in batch])
+                preds = await loop.run_in_executor(self._executor, self.predict_batch_fn, windows)
+                preds = np.asarray(preds, dtype=np.float64).reshape(-1)
+                if len(preds) != len(batch):
+                    raise RuntimeError(
+                        f"predict_batch_fn {len(batch)} pencere için {len(preds)} tahmin döndürdü"
+                    )
+            except Exception as exc:  # hata yalnızca bu batch'e iletilir; döngü sürer
+                for _, fut, _ in batch:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                continue
+
+            now = time.perf_counter()
+            for (_, fut, t0), p in zip(batch, preds):
+                if not fut.done():
+                    fut.set_result(float(p))
+            self.stats_.record_batch(len(batch), [now - t0 for _, _, t0 in batch])
+
+
+# =====================================================================
+#  SENKRON SARMALAYICI (arka plan thread'inde olay döngüsü)
+# =====================================================================
+class BackgroundInferenceService:
+    def __init__(self, predict_batch_fn, max_batch_size: int = 64, max_wait_ms: float = 2.0,
+                 window: int | None = None):
+        self.batcher = MicroBatcher(predict_batch_fn, max_batch_size, max_wait_ms, window)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.batcher.start(), self._loop).result()
+        return self
+
+    def predict(self, window, timeout: float | None = None) -> float:
+        return asyncio.run_coroutine_threadsafe(
+            self.batcher.predict(window), self._loop
+        ).result(timeout)
+
+    def stats(self) -> dict:
+        return asyncio.run_coroutine_threadsafe(self._stats(), self._loop).result()
+
+    async def _stats(self):
+        return self.batcher.stats()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.batcher.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+# =====================================================================
+#  UNIX SOKETİ (satır başına bir JSON mesajı)
+# =====================================================================
+#  istek : {"id": 1, "window": [..]}   → {"id": 1, "prediction": 12.3}
+#          {"id": 2, "cmd": "stats"}   → {"id": 2, "stats": {...}}
+async def _handle_connection(batcher: MicroBatcher, reader, writer):
+    lock = asyncio.Lock()
+
+    async def reply(msg):
+        async with lock:
+            writer.write((json.dumps(msg) + "\n").encode())
+            await writer.drain()
+
+    async def handle(req):
+        try:
+            if req.get("cmd") == "stats":
+                await reply({"id": req.get("id"), "stats": batcher.stats()})
+            elif "window" not in req:
+                raise ValueError("İstekte 'window' alanı yok")
+            else:
+                pred = await batcher.predict(req["window"])
+                await reply({"id": req.get("id"), "prediction": pred})
+        except Exception as exc:
+            await reply({"id": req.get("id"), "error": repr(exc)})
+
+    tasks = set()
+    try:
+        while line := await reader.readline():
+            # Bozuk satır bağlantıyı kapatmaz; istemci hatayı yanıt olarak alır
+            try:
+                req = json.loads(line)
+            except json.JSONDecodeError as exc:
+                await reply({"id": None, "error": f"Geçersiz JSON: {exc}"})
+                continue
+            if not isinstance(req, dict):
+                await reply({"id": None, "error": "İstek bir JSON nesnesi olmalı"})
+                continue
+            task = asyncio.create_task(handle(req))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        writer.close()
+
+
+async def serve_unix(batcher: MicroBatcher, path: str):
+    if os.path.exists(path):
+        os.unlink(path)
+    await batcher.start()
+    server = await asyncio.start_unix_server(
+        lambda r, w: _handle_connection(batcher, r, w), path=path
+    )
+    async with server:
+        await server.serve_forever()
+
+
+class InferenceClient:
+    """Unix soketi üzerinden basit, senkron istemci (bağlantı başına sıralı)."""
+
+    def __init__(self, path: str):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(path)
+        self._file = self._sock.makefile("rwb")
+        self._next_id = 0
+
+    def _call(self, msg: dict) -> dict:
+        self._next_id += 1
+        msg["id"] = self._next_id
+        self._file.write((json.dumps(msg) + "\n").encode())
+        self._file.flush()
+        resp = json.loads(self._file.readline())
+        if "error" in resp:
+            raise RuntimeError(resp["error"])
+        return resp
+
+    def predict(self, window) -> float:
+        return self._call({"window": np.asarray(window, dtype=float).ravel().tolist()})["prediction"]
+
+    def stats(self) -> dict:
+        return self._call({"cmd": "stats"})["stats"]
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LSTM mikro-batch çıkarım servisi")
+    parser.add_argument("--model", default=os.path.join(
+        os.path.dirname(__file__), "..", "models", "lstm_lead_time.pt"))
+    parser.add_argument("--backend", default="eager")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--socket", default="/tmp/rlvezs_lstm.sock")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    from src.lstm_torch import LSTMPredictor
+    predictor = LSTMPredictor(args.model, backend=args.backend, num_threads=args.threads)
+    # Pencere uzunluğu checkpoint sidecar'ından; uymayan istekler reddedilir
+    batcher = MicroBatcher(predictor.predict_batch, args.max_batch, args.max_wait_ms,
+                           window=predictor.window)
+
+    print(f"Servis dinliyor: {args.socket}")
+    try:
+        asyncio.run(serve_unix(batcher, args.socket))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+============================================================
+ CANLI VERİ KAYNAKLARI (DASHBOARD CANLI MODU)
+============================================================
+
+poll() her çağrıda yalnızca yeni satırları {kolon: np.ndarray}
+olarak döndürür (yoksa None). Dashboard bu parçaları bir RingBuffer'a
+ekler ve grafiklere yalnızca yeni noktaları gönderir.
+
+- StoreFeed     : büyüyen bir kolon deposunu (src.dataset_store) izler;
+                  refresh() ile yeni satır sayısını okur, yalnızca eklenen
+                  aralığı memmap'ten dilimler
+- SimulatorFeed : iter_production_line_chunks ile sonsuz akan simülasyon;
+                  her poll() ticks_per_poll adım üretir
+
+============================================================
+"""
+
+import numpy as np
+
+from src.data_simulation import iter_production_line_chunks
+from src.dataset_store import open_dataset
+
+
+class StoreFeed:
+    def __init__(self, path: str, columns, backfill: int = 1_000_000):
+        """backfill: ilk poll()'da depodaki en fazla kaç eski satırın okunacağı."""
+        self.dataset = open_dataset(path)
+        self.columns = list(columns)
+        self.pos = max(0, len(self.dataset) - backfill)
+
+    def poll(self):
+        n = self.dataset.refresh()
+        if n <= self.pos:
+            return None
+        chunk = {c: np.array(self.dataset.column(c)[self.pos:n]) for c in self.columns}
+        self.pos = n
+        return chunk
+
+
+class SimulatorFeed:
+    def __init__(self, columns, ticks_per_poll: int = 50, seed=None, **params):
+        self.columns = list(columns)
+        # T pratikte sınırsız; bellek yalnızca parça boyuna bağlı
+        self._chunks = iter_production_line_chunks(
+            T=2**62, chunk_size=ticks_per_poll, seed=seed, as_frame=False, **params
+        )
+
+    def poll(self):
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return None
+        return {c: chunk[c] for c in self.columns}
@@ -1,7 +1,6 @@
 import numpy as np
-import tensorflow as tf
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense
+
+from src.windowing import sliding_windows
 
 # ============================================================
 # LSTM MODELİ
@@ -11,7 +10,11 @@ from tensorflow.keras.layers import LSTM, Dense
 def create_lstm():
     """
     10 adımlık geçmişten 1 adımlık tahmin yapan LSTM modeli.
+    TensorFlow yalnızca burada yüklenir; prepare_sequences TF gerektirmez.
     """
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense
+
     model = Sequential([
         LSTM(64, return_sequences=True, input_shape=(10, 1)),
         LSTM(32),
@@ -22,16 +25,14 @@ def create_lstm():
     return model
 
 
-def prepare_sequences(series, window=10):
+def prepare_sequences(series, window=10, copy=False):
     """
     Zaman serisini LSTM’in anlayacağı sequence yapısına çevirir.
+    X: (n - window, window, 1), y: (n - window,) – varsayılan kopyasız,
+    salt-okunur görünümler (bkz. src.windowing); yerinde değiştirilecekse
+    copy=True ile yazılabilir kopyalar alın.
     """
-    X, y = [], []
-
-    for i in range(len(series) - window):
-        X.append(series[i:i+window])
-        y.append(series[i+window])
-
-    X = np.array(X).reshape(-1, window, 1)
-    y = np.array(y)
+    X, y = sliding_windows(np.asarray(series), window=window)
+    if copy:
+        return np.array(X), np.array(y)
     return X, y
@@ -0,0 +1,357 @@
+"""
+============================================================
+ PARALEL LSTM HİPERPARAMETRE ARAMASI (ARDIŞIK YARILAMA)
+============================================================
+
+src.lstm_torch.LSTMModel için gizli boyut, katman sayısı, pencere ve
+öğrenme oranı adaylarını süreç havuzunda eğitir; kötü adayları
+ardışık yarılama (successive halving) ile erken eler.
+
+- Basamaklar: min_epochs, min_epochs·eta, ... , max_epochs. Her
+  basamakta hayatta kalan denemeler kaldıkları epoch'tan devam eder
+  (model + optimizer durumu işçiden döner), en iyi 1/eta'lık kısım bir
+  sonraki basamağa geçer. Tam bütçeyi yalnızca birkaç deneme harcar.
+- İşçi başına iş parçacığı sınırlanır (torch.set_num_threads ve
+  OMP/MKL ortam değişkenleri): n_workers × threads ≈ çekirdek sayısı,
+  böylece süreçler birbirinin çekirdeklerini ezmez.
+- Seri bir kez ölçeklenip işçilere başlatıcıda (initializer) verilir;
+  pencereler src.windowing.sliding_windows görünümleridir, batch'ler
+  iter_batches ile yalnızca o an kopyalanır.
+- Tüm pencereler aynı doğrulama hedeflerini görür (serinin son
+  val_frac'ı), skorlar denemeler arasında doğrudan karşılaştırılabilir.
+  MinMax ölçekleyici yalnızca eğitim kısmına fit edilir.
+
+En iyi deneme models/ düzeninde kaydedilir:
+    lstm_lead_time.pt     (state_dict)
+    lstm_scaler.pkl       (MinMaxScaler)
+    lstm_lead_time.json   (hidden_size, num_layers, window, lr, skorlar)
+LSTMPredictor / StreamingLSTMPredictor mimariyi ve pencereyi bu
+sidecar'dan okur.
+
+Kullanım:
+---------
+python -m src.lstm_search --trials 27 --max-epochs 18 --workers 8
+python -m src.lstm_search --hidden 32 64 --layers 1 2 --window 10 24 \\
+       --lr 0.001 0.003 --out-dir /tmp/lstm_search --history reports/lstm_search.csv
+
+from src.lstm_search import search_lstm, save_best
+result = search_lstm(series, n_trials=12, max_epochs=12)
+save_best(result, "models")
+
+============================================================
+"""
+
+import argparse
+import io
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.windowing import iter_batches, sliding_windows
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_DATA = os.path.join(PROJECT_ROOT, "data", "simulated", "line_data.csv")
+DEFAULT_OUT_DIR = os.path.join(PROJECT_ROOT, "models")
+
+DEFAULT_SPACE = {
+    "hidden_size": [32, 64, 128],
+    "num_layers": [1, 2],
+    "window": [10, 24, 48],
+    "lr": [0.001, 0.003, 0.01],
+}
+
+
+# ============================================================
+# ARAMA UZAYI & BASAMAKLAR
+# ============================================================
+
+def sample_configs(space=None, n_trials=None, seed=0):
+    """Izgarayı açar; n_trials ızgaradan küçükse tekrarsız örnekler."""
+    from src.sweep import expand_grid
+
+    configs = expand_grid(space or DEFAULT_SPACE)
+    if n_trials is not None and n_trials < len(configs):
+        idx = np.random.default_rng(seed).choice(len(configs), n_trials, replace=False)
+        configs = [configs[i] for i in sorted(idx)]
+    return configs
+
+
+def rung_budgets(min_epochs=2, max_epochs=18, eta=3):
+    """[min, min·eta, ..., max] epoch bütçeleri (son basamak her zaman max)."""
+    if min_epochs < 1 or max_epochs < min_epochs or eta < 2:
+        raise ValueError("1 <= min_epochs <= max_epochs ve eta >= 2 olmalı")
+    budgets = []
+    e = min_epochs
+    while e < max_epochs:
+        budgets.append(e)
+        e *= eta
+    budgets.append(max_epochs)
+    return budgets
+
+
+# ============================================================
+# İŞÇİ
+# ============================================================
+
+_DATA = None      # (ölçeklenmiş seri, kesim indeksi)
+_WINDOWS = {}     # pencere → (X_tr, y_tr, X_val, y_val), işçi içi önbellek
+
+
+def _init_worker(scaled, cut, threads):
+    global _DATA
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+
+    import torch
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass   # süreçte paralel iş zaten başlamışsa değiştirilemez
+
+    _DATA = (scaled, cut)
+    _WINDOWS.clear()
+
+
+def _windows(window):
+    if window not in _WINDOWS:
+        scaled, cut = _DATA
+        X, y = sliding_windows(scaled, window=window)
+        # Hedef indeksi window + i; hedefi cut'tan önce olanlar eğitim
+        n_train = cut - window
+        if n_train <= 0:
+            raise ValueError(f"window={window} eğitim kısmı için fazla uzun")
+        _WINDOWS[window] = (X[:n_train], y[:n_train], X[n_train:], y[n_train:])
+    return _WINDOWS[window]
+
+
+def _train_trial(job):
+    """Bir denemeyi job["epochs"]'a kadar eğitir → skor + devam durumu."""
+    import torch
+    import torch.nn as nn
+    from src.lstm_torch import LSTMModel
+
+    cfg = job["config"]
+    X_tr, y_tr, X_val, y_val = _windows(cfg["window"])
+
+    torch.manual_seed(job["seed"])
+    model = LSTMModel(hidden_size=cfg["hidden_size"], num_layers=cfg["num_layers"])
+    optimizer = torch.optim.Adam(model.parameters(), lr=cfg["lr"])
+    if job["state"] is not None:
+        state = torch.load(io.BytesIO(job["state"]))
+        model.load_state_dict(state["model"])
+        optimizer.load_state_dict(state["optimizer"])
+
+    loss_fn = nn.MSELoss()
+    t0 = time.perf_counter()
+    model.train()
+    for epoch in range(job["start_epoch"], job["epochs"]):
+        # Karıştırma tohumu epoch'a bağlı: devam eden eğitim tek parça koşuyla aynı
+        for xb, yb in iter_batches(X_tr, y_tr, job["batch_size"], shuffle=True,
+                                   seed=job["seed"] * 10_000 + epoch):
+            optimizer.zero_grad()
+            loss = loss_fn(model(torch.from_numpy(xb)).squeeze(-1), torch.from_numpy(yb))
+            loss.backward()
+            optimizer.step()
+    train_s = time.perf_counter() - t0
+
+    model.eval()
+    with torch.inference_mode():
+        pred = model(torch.from_numpy(np.ascontiguousarray(X_val, dtype=np.float32)))
+    err = pred.reshape(-1).numpy().astype(np.float64) - y_val
+
+    buf = io.BytesIO()
+    torch.save({"model": model.state_dict(), "optimizer": optimizer.state_dict()}, buf)
+    return {
+        "trial": job["trial"],
+        "epochs": job["epochs"],
+        "val_mse": float(np.mean(err ** 2)),
+        "val_mae_scaled": float(np.mean(np.abs(err))),
+        "train_s": train_s,
+        "state": buf.getvalue(),
+    }
+
+
+# ============================================================
+# ARAMA
+# ============================================================
+
+def search_lstm(
+    series,
+    space=None,
+    n_trials=None,
+    min_epochs=2,
+    max_epochs=18,
+    eta=3,
+    val_frac=0.2,
+    batch_size=32,
+    n_workers=None,
+    threads_per_worker=None,
+    seed=0,
+    verbose=True,
+):
+    """
+    Ardışık yarılamalı arama. Dönüş sözlüğü:
+      best      → en iyi denemenin ayarı, skorları ve state_dict baytları
+      history   → (deneme, basamak) başına bir satırlık DataFrame
+      scaler    → eğitim kısmına fit edilmiş MinMaxScaler
+    n_workers=1 ise havuz kurulmaz, denemeler bu süreçte sırayla koşar.
+    """
+    from sklearn.preprocessing import MinMaxScaler
+
+    series = np.asarray(series, dtype=np.float64).reshape(-1)
+    cut = int(len(series) * (1 - val_frac))
+    scaler = MinMaxScaler().fit(series[:cut, None])
+    scaled = scaler.transform(series[:, None]).ravel().astype(np.float32)
+    data_range = float(scaler.data_range_[0])
+
+    configs = sample_configs(space, n_trials, seed)
+    budgets = rung_budgets(min_epochs, max_epochs, eta)
+    n_workers = n_workers or os.cpu_count() or 1
+    threads = threads_per_worker or max(1, (os.cpu_count() or 1) // n_workers)
+
+    alive = list(range(len(configs)))
+    states = {i: None for i in alive}
+    done_epochs = {i: 0 for i in alive}
+    rows = []
+    last = {}
+    trained = 0
+
+    pool = None
+    if n_workers == 1:
+        _init_worker(scaled, cut, threads)
+        run = lambda jobs: map(_train_trial, jobs)
+    else:
+        pool = ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                   initargs=(scaled, cut, threads))
+        run = lambda jobs: pool.map(_train_trial, jobs)
+
+    t0 = time.perf_counter()
+    try:
+        for rung, epochs in enumerate(budgets):
+            jobs = [{
+                "trial": i, "config": configs[i], "seed": seed + i,
+                "start_epoch": done_epochs[i], "epochs": epochs,
+                "state": states[i], "batch_size": batch_size,
+            } for i in alive]
+            trained += sum(epochs - done_epochs[i] for i in alive)
+
+            for res in run(jobs):
+                i = res["trial"]
+                states[i] = res.pop("state")
+                done_epochs[i] = epochs
+                last[i] = res
+                rows.append({"trial": i, "rung": rung, **configs[i], "epochs": epochs,
+                             "val_mse": res["val_mse"],
+                             "val_mae": res["val_mae_scaled"] * data_range,
+                             "train_s": res["train_s"]})
+
+            alive.sort(key=lambda i: last[i]["val_mse"])
+            if verbose:
+                i = alive[0]
+                print(f"Basamak {rung}: {len(alive):3d} deneme × {epochs:3d} epoch  "
+                      f"en iyi #{i} {configs[i]}  val_mse={last[i]['val_mse']:.5f}")
+            if rung < len(budgets) - 1:
+                keep = max(1, len(alive) // eta)
+                for i in alive[keep:]:
+                    states[i] = None   # elenen denemelerin durumu bırakılır
+                alive = alive[:keep]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    best = alive[0]
+    history = pd.DataFrame(rows)
+    if verbose:
+        full = len(configs) * max_epochs
+        print(f"Toplam {trained} / {full} epoch "
+              f"(seri tam bütçe), {time.perf_counter() - t0:.1f} s")
+
+    return {
+        "best": {
+            **configs[best],
+            "trial": best,
+            "epochs": done_epochs[best],
+            "val_mse": last[best]["val_mse"],
+            "val_mae": last[best]["val_mae_scaled"] * data_range,
+            "state": states[best],
+        },
+        "history": history,
+        "scaler": scaler,
+    }
+
+
+def save_best(result, out_dir=DEFAULT_OUT_DIR, name="lstm_lead_time",
+              scaler_name="lstm_scaler.pkl"):
+    """En iyi checkpoint'i, ölçekleyiciyi ve mimari sidecar'ını yazar."""
+    import torch
+    from src.lstm_torch import config_path
+
+    best = result["best"]
+    os.makedirs(out_dir, exist_ok=True)
+    model_path = os.path.join(out_dir, f"{name}.pt")
+
+    state = torch.load(io.BytesIO(best["state"]))
+    torch.save(state["model"], model_path)
+    with open(os.path.join(out_dir, scaler_name), "wb") as f:
+        pickle.dump(result["scaler"], f)
+
+    meta = {k: v for k, v in best.items() if k not in ("state", "trial")}
+    meta["scaled"] = True   # girdi/çıktı scaler uzayında
+    with open(config_path(model_path), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return model_path
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paralel LSTM hiperparametre araması")
+    parser.add_argument("--data", default=DEFAULT_DATA)
+    parser.add_argument("--column", default="lead_time")
+    parser.add_argument("--hidden", type=int, nargs="+", default=DEFAULT_SPACE["hidden_size"])
+    parser.add_argument("--layers", type=int, nargs="+", default=DEFAULT_SPACE["num_layers"])
+    parser.add_argument("--window", type=int, nargs="+", default=DEFAULT_SPACE["window"])
+    parser.add_argument("--lr", type=float, nargs="+", default=DEFAULT_SPACE["lr"])
+    parser.add_argument("--trials", type=int, default=None, help="varsayılan: tüm ızgara")
+    parser.add_argument("--min-epochs", type=int, default=2)
+    parser.add_argument("--max-epochs", type=int, default=18)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threads", type=int, default=None, help="işçi başına iş parçacığı")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR)
+    parser.add_argument("--history", default=None, help="deneme geçmişi CSV yolu")
+    args = parser.parse_args(argv)
+
+    series = pd.read_csv(args.data, usecols=[args.column])[args.column].to_numpy()
+    space = {"hidden_size": args.hidden, "num_layers": args.layers,
+             "window": args.window, "lr": args.lr}
+
+    result = search_lstm(
+        series, space, n_trials=args.trials, min_epochs=args.min_epochs,
+        max_epochs=args.max_epochs, eta=args.eta, batch_size=args.batch_size,
+        n_workers=args.workers, threads_per_worker=args.threads, seed=args.seed,
+    )
+
+    if args.history:
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        result["history"].to_csv(args.history, index=False)
+
+    best = {k: v for k, v in result["best"].items() if k != "state"}
+    print("En iyi:", best)
+    print(f"Kaydedildi: {save_best(result, args.out_dir)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,11 +1,15 @@
 import numpy as np
-from sklearn.metrics import mean_absolute_percentage_error, mean_squared_error
+
+from src.streaming_metrics import discounted_returns
 
 # ============================================================
 # METRİKLER
 # ============================================================
 
 def compute_mape_rmse(true, pred):
+    # scikit-learn yalnızca metrik ilk kez istendiğinde yüklenir
+    from sklearn.metrics import mean_absolute_percentage_error, mean_squared_error
+
     mape = mean_absolute_percentage_error(true, pred)
     rmse = np.sqrt(mean_squared_error(true, pred))
     return mape, rmse
@@ -16,7 +20,5 @@ def success_rate(success_flags):
 
 
 def discounted_reward(rewards, gamma=0.99):
-    total = 0
-    for t, r in enumerate(rewards):
-        total += (gamma ** t) * r
-    return total
+    # Vektörel: Σ γ^t · r_t (bölüm batch'leri için bkz. streaming_metrics)
+    return discounted_returns(rewards, gamma)
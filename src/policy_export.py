@@ -0,0 +1,308 @@
+"""
+============================================================
+ PPO POLİTİKASI → NUMPY (HAFİF ÇIKARIM)
+============================================================
+
+Kaydedilmiş stable-baselines3 PPO modelinin (MlpPolicy) politika
+ağını .npz dosyasına çıkarır; NumpyPolicy bu dosyayla torch/SB3
+olmadan model.predict(obs, deterministic=True) sonucunu üretir.
+
+Çıkarılanlar:
+- mlp_extractor.policy_net içindeki Linear katmanları + aktivasyon adı
+- action_net (Discrete → logit, Box → ortalama aksiyon)
+- Box için log_std (deterministic=False örnekleme), aksiyon sınırları
+- Gözlem şekli, aksiyon uzayı, squash_output
+- VecNormalize gözlem istatistikleri (obs_rms ortalama/varyans, clip_obs);
+  PPO VecNormalize(norm_obs=True) arkasında eğitildiyse NumpyPolicy
+  gözlemi aynı şekilde standartlaştırıp kırpar
+
+İstatistikler modelin yanındaki <ad>_vecnormalize.pkl'den okunur
+(src.rl_train yazar). Bulunamazsa ve --raw-obs verilmezse politika
+"normalizasyonu eksik" işaretlenir (NumpyPolicy.obs_norm_missing):
+ham gözlemle üretilen aksiyonlar anlamsızdır, çağıranlar bu politikayı
+kullanmamalıdır. Kayıtlı models/ppo_model.zip notebook'ta VecNormalize
+ile eğitildi ama istatistikleri kaydedilmedi; bu durumdadır.
+
+Yalnızca FlattenExtractor + MlpPolicy desteklenir (bu projedeki
+kurulum). Değer ağı (value_net) çıkarılmaz, aksiyon için gerekmez.
+
+Kullanım:
+---------
+python -m src.policy_export export models/ppo_model.zip models/ppo_policy.npz
+python -m src.policy_export export models/ppo_model.zip models/ppo_policy.npz \
+       --vecnormalize models/ppo_vecnormalize.pkl
+python -m src.policy_export check  models/ppo_model.zip models/ppo_policy.npz
+
+policy = NumpyPolicy("models/ppo_policy.npz")
+action, _ = policy.predict(obs, deterministic=True)
+
+============================================================
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_MODEL = os.path.join(PROJECT_ROOT, "models", "ppo_model.zip")
+DEFAULT_EXPORT = os.path.join(PROJECT_ROOT, "models", "ppo_policy.npz")
+
+_ACTIVATIONS = {
+    "Tanh": np.tanh,
+    "ReLU": lambda x: np.maximum(x, 0),
+    "ELU": lambda x: np.where(x > 0, x, np.expm1(np.minimum(x, 0))),
+    "Identity": lambda x: x,
+}
+
+
+# ============================================================
+# DIŞA AKTARMA (SB3 + torch gerekir)
+# ============================================================
+
+def vecnormalize_path(model_path):
+    """ppo_model.zip → ppo_vecnormalize.pkl (aynı dizinde)."""
+    stem = model_path[:-4] if model_path.endswith(".zip") else model_path
+    return (stem[:-6] if stem.endswith("_model") else stem) + "_vecnormalize.pkl"
+
+
+def _load_obs_norm(path):
+    """VecNormalize.save() çıktısı → (ortalama, varyans, {"clip", "epsilon"})."""
+    import pickle
+
+    with open(path, "rb") as f:
+        vec_normalize = pickle.load(f)
+    if not vec_normalize.norm_obs:
+        return None
+    rms = vec_normalize.obs_rms
+    return (np.asarray(rms.mean, dtype=np.float32), np.asarray(rms.var, dtype=np.float32),
+            {"clip": float(vec_normalize.clip_obs), "epsilon": float(vec_normalize.epsilon)})
+
+
+def export_policy(model_path=DEFAULT_MODEL, out_path=DEFAULT_EXPORT, vecnormalize=None,
+                  raw_obs=False):
+    """
+    vecnormalize: VecNormalize istatistik dosyası; None ise vecnormalize_path(model_path)
+                  varsa o kullanılır.
+    raw_obs=True: model normalizasyonsuz eğitildi (istatistik aranmaz).
+    İkisi de yoksa meta'ya obs_norm yazılmaz → NumpyPolicy.obs_norm_missing.
+    """
+    import torch.nn as nn
+    from gymnasium import spaces
+    from stable_baselines3 import PPO
+    from stable_baselines3.common.torch_layers import FlattenExtractor
+
+    model = PPO.load(model_path, device="cpu")
+    policy = model.policy
+
+    if not isinstance(policy.pi_features_extractor, FlattenExtractor):
+        raise ValueError("Yalnızca FlattenExtractor'lı MlpPolicy dışa aktarılabilir")
+
+    arrays = {}
+    activation = "Identity"
+    n_layers = 0
+    for module in policy.mlp_extractor.policy_net:
+        if isinstance(module, nn.Linear):
+            arrays[f"pi_{n_layers}_weight"] = module.weight.detach().numpy()
+            arrays[f"pi_{n_layers}_bias"] = module.bias.detach().numpy()
+            n_layers += 1
+        elif type(module).__name__ in _ACTIVATIONS:
+            activation = type(module).__name__
+        else:
+            raise ValueError(f"Desteklenmeyen katman: {module}")
+
+    arrays["action_weight"] = policy.action_net.weight.detach().numpy()
+    arrays["action_bias"] = policy.action_net.bias.detach().numpy()
+
+    space = model.action_space
+    meta = {
+        "obs_shape": list(model.observation_space.shape),
+        "n_layers": n_layers,
+        "activation": activation,
+        "squash_output": bool(policy.squash_output),
+    }
+    if raw_obs:
+        meta["obs_norm"] = None
+    else:
+        vecnormalize = vecnormalize or vecnormalize_path(model_path)
+        norm = _load_obs_norm(vecnormalize) if os.path.exists(vecnormalize) else False
+        if norm is None:
+            meta["obs_norm"] = None
+        elif norm:
+            arrays["obs_mean"], arrays["obs_var"], meta["obs_norm"] = norm
+
+    if isinstance(space, spaces.Discrete):
+        meta["action"] = {"type": "discrete", "n": int(space.n)}
+    elif isinstance(space, spaces.Box):
+        meta["action"] = {"type": "box", "shape": list(space.shape)}
+        arrays["action_low"] = space.low
+        arrays["action_high"] = space.high
+        arrays["log_std"] = policy.log_std.detach().numpy()
+    else:
+        raise ValueError(f"Desteklenmeyen aksiyon uzayı: {space}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    np.savez_compressed(out_path, meta=np.array(json.dumps(meta)), **arrays)
+    return out_path
+
+
+# ============================================================
+# NUMPY ÇIKARIM
+# ============================================================
+
+class NumpyPolicy:
+    def __init__(self, path=DEFAULT_EXPORT):
+        with np.load(path) as data:
+            self.meta = json.loads(str(data["meta"]))
+            # Ağırlıklar (out, in) → (in, out): obs @ W
+            self.layers = [
+                (np.ascontiguousarray(data[f"pi_{i}_weight"].T), data[f"pi_{i}_bias"])
+                for i in range(self.meta["n_layers"])
+            ]
+            self.action_w = np.ascontiguousarray(data["action_weight"].T)
+            self.action_b = data["action_bias"]
+            self.low = data["action_low"] if "action_low" in data else None
+            self.high = data["action_high"] if "action_high" in data else None
+            self.log_std = data["log_std"] if "log_std" in data else None
+            norm = self.meta.get("obs_norm")
+            if norm:
+                self.obs_mean = data["obs_mean"]
+                self.obs_std = np.sqrt(data["obs_var"] + norm["epsilon"]).astype(np.float32)
+                self.clip_obs = norm["clip"]
+            else:
+                self.obs_mean = self.obs_std = self.clip_obs = None
+
+        # Eğitimde VecNormalize kullanıldı mı bilinmiyor / istatistikler kayıp
+        self.obs_norm_missing = "obs_norm" not in self.meta
+        self.obs_shape = tuple(self.meta["obs_shape"])
+        self.discrete = self.meta["action"]["type"] == "discrete"
+        self._act = _ACTIVATIONS[self.meta["activation"]]
+
+    def normalize_obs(self, obs):
+        """VecNormalize.normalize_obs ile aynı: (obs - ortalama) / std, ±clip_obs."""
+        obs = np.asarray(obs, dtype=np.float32)
+        if self.obs_mean is None:
+            return obs
+        return np.clip((obs - self.obs_mean) / self.obs_std, -self.clip_obs, self.clip_obs)
+
+    def forward(self, obs):
+        """
+        Normalize edilmiş (B, *obs_shape) → Discrete: logit (B, n),
+        Box: ortalama aksiyon (B, d).
+        """
+        x = np.asarray(obs, dtype=np.float32).reshape(len(obs), -1)
+        for W, b in self.layers:
+            x = self._act(x @ W + b)
+        return x @ self.action_w + self.action_b
+
+    def predict(self, obs, state=None, episode_start=None, deterministic=True, rng=None):
+        """
+        SB3 ile aynı imza ve çıktı: (aksiyon, None). Tekil gözlemde batch boyutu yok.
+        obs ham ortam gözlemidir; normalizasyon (varsa) burada uygulanır.
+        """
+        obs = self.normalize_obs(obs)
+        single = obs.shape == self.obs_shape
+        out = self.forward(obs[None] if single else obs)
+
+        if self.discrete:
+            if deterministic:
+                actions = out.argmax(axis=1)
+            else:
+                rng = rng or np.random.default_rng()
+                p = np.exp(out - out.max(axis=1, keepdims=True))
+                p /= p.sum(axis=1, keepdims=True)
+                actions = (p.cumsum(axis=1) > rng.random((len(p), 1))).argmax(axis=1)
+        else:
+            actions = out
+            if not deterministic:
+                rng = rng or np.random.default_rng()
+                actions = actions + np.exp(self.log_std) * rng.standard_normal(actions.shape)
+            if self.meta["squash_output"]:
+                actions = np.tanh(actions)
+                actions = self.low + 0.5 * (actions + 1.0) * (self.high - self.low)
+            else:
+                actions = np.clip(actions, self.low, self.high)
+            actions = actions.astype(np.float32)
+
+        return (actions[0] if single else actions), None
+
+
+# ============================================================
+# EŞLİK KONTROLÜ
+# ============================================================
+
+def check_parity(model_path=DEFAULT_MODEL, npz_path=DEFAULT_EXPORT, obs=None, n=2048,
+                 seed=0, atol=1e-4):
+    """
+    SB3 model.predict(deterministic=True) ile NumpyPolicy.predict'i
+    karşılaştırır. obs (ham gözlem) verilmezse standart normal gözlemler
+    kullanılır; SB3 tarafına dışa aktarılmış istatistiklerle normalize
+    edilmiş hali verilir (VecNormalize'ın yaptığı gibi).
+    Dönüş: {"n", "max_abs_err" (ağ çıktısı), "action_match", "ok"}
+    """
+    import torch
+    from stable_baselines3 import PPO
+
+    model = PPO.load(model_path, device="cpu")
+    policy = NumpyPolicy(npz_path)
+
+    if obs is None:
+        obs = np.random.default_rng(seed).standard_normal((n,) + policy.obs_shape).astype(np.float32)
+    obs = np.asarray(obs, dtype=np.float32)
+    norm_obs = policy.normalize_obs(obs)
+
+    ref_actions, _ = model.predict(norm_obs, deterministic=True)
+    got_actions, _ = policy.predict(obs, deterministic=True)
+
+    with torch.no_grad():
+        features = model.policy.extract_features(torch.as_tensor(norm_obs),
+                                                 model.policy.pi_features_extractor)
+        ref_out = model.policy.action_net(model.policy.mlp_extractor.forward_actor(features)).numpy()
+    err = float(np.abs(ref_out - policy.forward(norm_obs)).max())
+
+    if policy.discrete:
+        match = float(np.mean(np.asarray(ref_actions) == got_actions))
+    else:
+        match = float(np.mean(np.all(np.abs(np.asarray(ref_actions) - got_actions) <= atol, axis=-1)))
+
+    return {"n": int(len(obs)), "max_abs_err": err, "action_match": match,
+            "ok": bool(err <= atol and match == 1.0)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PPO politikasını NumPy'a aktar / doğrula")
+    parser.add_argument("command", choices=["export", "check"])
+    parser.add_argument("model", nargs="?", default=DEFAULT_MODEL)
+    parser.add_argument("out", nargs="?", default=DEFAULT_EXPORT)
+    parser.add_argument("--vecnormalize", default=None,
+                        help="VecNormalize istatistikleri (varsayılan: <model>_vecnormalize.pkl)")
+    parser.add_argument("--raw-obs", action="store_true",
+                        help="model VecNormalize olmadan eğitildi")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        path = export_policy(args.model, args.out, args.vecnormalize, args.raw_obs)
+        print(f"Dışa aktarıldı: {path} ({os.path.getsize(path) / 1024:.1f} KB)")
+        if NumpyPolicy(path).obs_norm_missing:
+            print("UYARI: gözlem normalizasyonu istatistikleri bulunamadı; politika "
+                  "ham gözlemle kullanılamaz (bkz. --vecnormalize / --raw-obs)")
+        return 0
+
+    report = check_parity(args.model, args.out)
+    print("Eşlik:", report)
+
+    policy = NumpyPolicy(args.out)
+    obs = np.zeros(policy.obs_shape, dtype=np.float32)
+    policy.predict(obs)
+    t = time.perf_counter()
+    for _ in range(1000):
+        policy.predict(obs)
+    print(f"NumpyPolicy tek gözlem: {(time.perf_counter() - t) * 1e3:.3f} µs/aksiyon")
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+"""
+============================================================
+ ÖNCEDEN HESAPLANMIŞ TAHMİN TABLOSU
+============================================================
+
+ProductionLineEnv'de tahmin yalnızca veri penceresine bağlıdır, ajanın
+aksiyonuna değil. Bu yüzden tüm pencereler için tahminler ortam
+kurulurken tek seferde (batch halinde) hesaplanır; step() yalnızca
+tablodan O(1) okuma yapar.
+
+- predictions[i] → series[i : i+window] penceresinin tahmini,
+  yani (i + window). adımın tahmini
+- Diskte <veri özeti>_<model özeti>.npy olarak saklanır; aynı veri ve
+  aynı model checkpoint'i için sonraki kurulumlar hesaplama yapmaz
+
+Kullanım:
+---------
+env = ProductionLineEnv(
+    df, lstm_predict_fn,
+    precompute=True,
+    batch_predict_fn=lstm_batch_predict_fn,      # (B, window, 1) → (B,)
+    model_id="../models/lstm_lead_time.pt",
+)
+
+============================================================
+"""
+
+import hashlib
+import os
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache", "predictions")
+
+
+def dataset_fingerprint(series: np.ndarray, window: int) -> str:
+    arr = np.ascontiguousarray(series, dtype=np.float32)
+    h = hashlib.sha256()
+    h.update(f"{window}:{len(arr)}:".encode())
+    h.update(arr.tobytes())
+    return h.hexdigest()[:16]
+
+
+def model_fingerprint(model_id) -> str:
+    """model_id bir dosya yoluysa içeriğinin, değilse metnin özeti."""
+    h = hashlib.sha256()
+    if isinstance(model_id, (str, os.PathLike)) and os.path.isfile(model_id):
+        with open(model_id, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    else:
+        h.update(str(model_id).encode())
+    return h.hexdigest()[:16]
+
+
+def compute_prediction_table(
+    series: np.ndarray,
+    window: int,
+    batch_predict_fn=None,
+    predict_fn=None,
+    batch_size: int = 4096,
+) -> np.ndarray:
+    """
+    Tüm pencereleri (n - window adet) tahmin eder. Pencereler kayan
+    görünüm (sliding_window_view) üzerinden alınır; yalnızca o anki
+    batch kopyalanır. batch_predict_fn yoksa predict_fn pencere pencere
+    çağrılır (yine de ortam başına yalnızca bir kez).
+    """
+    if batch_predict_fn is None and predict_fn is None:
+        raise ValueError("batch_predict_fn ya da predict_fn verilmeli")
+
+    series = np.asarray(series, dtype=np.float32)
+    n = max(len(series) - window, 0)
+    windows = sliding_window_view(series, window)[:n]
+    out = np.empty(n, dtype=np.float32)
+
+    for start in range(0, n, batch_size):
+        batch = np.ascontiguousarray(windows[start:start + batch_size])[..., None]  # (B, w, 1)
+        if batch_predict_fn is not None:
+            out[start:start + len(batch)] = np.asarray(batch_predict_fn(batch)).reshape(-1)
+        else:
+            out[start:start + len(batch)] = [float(predict_fn(w)) for w in batch]
+
+    return out
+
+
+def load_or_compute(
+    series: np.ndarray,
+    window: int,
+    batch_predict_fn=None,
+    predict_fn=None,
+    model_id=None,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+) -> np.ndarray:
+    """
+    Tabloyu diskten açar (memmap) ya da hesaplayıp kaydeder.
+    model_id verilmezse disk önbelleği kullanılmaz.
+    """
+    if model_id is None:
+        return compute_prediction_table(series, window, batch_predict_fn, predict_fn)
+
+    name = f"{dataset_fingerprint(series, window)}_{model_fingerprint(model_id)}.npy"
+    path = os.path.join(cache_dir, name)
+
+    if not os.path.exists(path):
+        table = compute_prediction_table(series, window, batch_predict_fn, predict_fn)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{path}.tmp{os.getpid()}.npy"
+        np.save(tmp, table)
+        os.replace(tmp, path)
+
+    return np.load(path, mmap_mode="r")
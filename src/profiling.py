@@ -0,0 +1,313 @@
+"""
+============================================================
+ SICAK YOL PROFİLLEME (İSTEĞE BAĞLI)
+============================================================
+
+İsimli bölümlerin sürelerini toplar; sayım, toplam ve yüzdelikleri
+raporlar, Chrome trace JSON'u (chrome://tracing, Perfetto) yazar.
+
+Kapalıyken maliyet ~sıfırdır: sıcak döngüler yalnızca
+`prof = profiling.active()` ile None kontrolü yapar.
+
+İki kullanım biçimi:
+
+    # Kaba bölümler (ör. tahminci çağrısı, PPO güncellemesi)
+    with profiling.section("predictor.predict_batch"):
+        ...
+
+    # Sıcak döngüler (adım başına birkaç µs'lik kod)
+    prof = profiling.active()
+    if prof: t0 = profiling.now()
+    ...                                   # bölüm 1
+    if prof: t0 = prof.lap("env.obs", t0)
+    ...                                   # bölüm 2
+    if prof: prof.lap("env.predict", t0)
+
+Açma:
+    profiling.enable()      ya da ortam değişkeni RLVEZS_PROFILE=1
+    prof = profiling.disable()
+    print(prof.report()); prof.export_chrome_trace("trace.json")
+
+Demo: python -m src.profiling --trace reports/trace.json
+
+Bölüm adları:
+    env.obs / env.predict / env.reward / env.next_obs
+    vec_env.obs / vec_env.predict / vec_env.reward / vec_env.autoreset
+    predictor.predict / predictor.predict_batch
+    sim.arrivals / sim.machines / sim.processing / sim.record / sim.derived
+    ppo.rollout / ppo.train
+
+============================================================
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from array import array
+from collections import defaultdict
+
+import numpy as np
+
+
+now = time.perf_counter_ns
+
+_ACTIVE = None
+
+
+class Profiler:
+    def __init__(self, max_events: int = 1_000_000):
+        self.max_events = max_events
+        self.pid = os.getpid()
+        self.durations = defaultdict(lambda: array("q"))   # isim → ns süreler
+        self.events = []                                   # (isim, başlangıç ns, süre ns, pid, tid)
+        self.dropped_events = 0
+
+    # ------------------------------------------------------------
+    #  Kayıt
+    # ------------------------------------------------------------
+    def add(self, name: str, start_ns: int, end_ns: int | None = None) -> int:
+        end_ns = now() if end_ns is None else end_ns
+        dur = end_ns - start_ns
+        self.durations[name].append(dur)
+        if len(self.events) < self.max_events:
+            self.events.append((name, start_ns, dur, self.pid, threading.get_ident()))
+        else:
+            self.dropped_events += 1
+        return end_ns
+
+    def lap(self, name: str, start_ns: int) -> int:
+        """start_ns'ten şimdiye kadarki süreyi name'e yazar, şimdiki zamanı döndürür."""
+        return self.add(name, start_ns)
+
+    def section(self, name: str):
+        return _Section(self, name)
+
+    def reset(self) -> None:
+        self.durations.clear()
+        self.events.clear()
+        self.dropped_events = 0
+
+    def merge(self, other: "Profiler") -> "Profiler":
+        """Başka bir süreçten/iş parçacığından gelen kayıtları ekler."""
+        for name, durs in other.durations.items():
+            self.durations[name].extend(durs)
+        room = max(self.max_events - len(self.events), 0)
+        self.events.extend(other.events[:room])
+        self.dropped_events += other.dropped_events + max(len(other.events) - room, 0)
+        return self
+
+    # Pickle (süreçler arası): defaultdict'teki lambda taşınamaz
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["durations"] = {k: v.tobytes() for k, v in self.durations.items()}
+        return state
+
+    def __setstate__(self, state):
+        raw = state.pop("durations")
+        self.__dict__.update(state)
+        self.durations = defaultdict(lambda: array("q"))
+        for k, b in raw.items():
+            self.durations[k].frombytes(b)
+
+    # ------------------------------------------------------------
+    #  Rapor
+    # ------------------------------------------------------------
+    def stats(self) -> dict:
+        out = {}
+        for name, durs in self.durations.items():
+            if not durs:
+                continue
+            us = np.frombuffer(durs, dtype=np.int64) / 1e3
+            p50, p90, p99 = np.percentile(us, [50, 90, 99])
+            out[name] = {
+                "count": int(len(us)),
+                "total_ms": float(us.sum() / 1e3),
+                "mean_us": float(us.mean()),
+                "p50_us": float(p50),
+                "p90_us": float(p90),
+                "p99_us": float(p99),
+                "max_us": float(us.max()),
+            }
+        return out
+
+    def report(self, sort: str = "total_ms") -> str:
+        stats = self.stats()
+        lines = [f"{'bölüm':24s} {'sayı':>9s} {'toplam ms':>11s} {'ort µs':>9s} "
+                 f"{'p50 µs':>9s} {'p90 µs':>9s} {'p99 µs':>9s} {'max µs':>10s}"]
+        for name, s in sorted(stats.items(), key=lambda kv: -kv[1][sort]):
+            lines.append(
+                f"{name:24s} {s['count']:9d} {s['total_ms']:11.2f} {s['mean_us']:9.2f} "
+                f"{s['p50_us']:9.2f} {s['p90_us']:9.2f} {s['p99_us']:9.2f} {s['max_us']:10.1f}"
+            )
+        if self.dropped_events:
+            lines.append(f"(trace için {self.dropped_events} olay atlandı; istatistikler tam)")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        t0 = min((e[1] for e in self.events), default=0)
+        return {
+            "traceEvents": [
+                {"name": name, "cat": name.split(".")[0], "ph": "X",
+                 "ts": (start - t0) / 1e3, "dur": dur / 1e3, "pid": pid, "tid": tid}
+                for name, start, dur, pid, tid in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def export_chrome_trace(self, path: str) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+
+class _Section:
+    __slots__ = ("prof", "name", "start")
+
+    def __init__(self, prof, name):
+        self.prof = prof
+        self.name = name
+
+    def __enter__(self):
+        self.start = now()
+        return self
+
+    def __exit__(self, *exc):
+        self.prof.add(self.name, self.start)
+        return False
+
+
+class _NullSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullSection()
+
+
+# ============================================================
+# MODÜL DÜZEYİ API
+# ============================================================
+
+def enable(max_events: int = 1_000_000) -> Profiler:
+    global _ACTIVE
+    if _ACTIVE is None:
+        _ACTIVE = Profiler(max_events)
+    return _ACTIVE
+
+
+def disable() -> Profiler | None:
+    """Profillemeyi kapatır, toplanan kayıtları döndürür."""
+    global _ACTIVE
+    prof, _ACTIVE = _ACTIVE, None
+    return prof
+
+
+def active() -> Profiler | None:
+    return _ACTIVE
+
+
+def section(name: str):
+    prof = _ACTIVE
+    return _NULL if prof is None else _Section(prof, name)
+
+
+def profiled(name: str | None = None):
+    """Fonksiyonu bir bölüm olarak ölçen dekoratör."""
+    def wrap(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        def inner(*args, **kwargs):
+            prof = _ACTIVE
+            if prof is None:
+                return fn(*args, **kwargs)
+            t0 = now()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                prof.add(label, t0)
+
+        inner.__name__, inner.__doc__, inner.__wrapped__ = fn.__name__, fn.__doc__, fn
+        return inner
+    return wrap
+
+
+def sb3_callback():
+    """PPO için ppo.rollout ve ppo.train bölümlerini kaydeden SB3 callback'i."""
+    from stable_baselines3.common.callbacks import BaseCallback
+
+    class ProfilingCallback(BaseCallback):
+        def _on_training_start(self):
+            self._mark = None
+
+        def _on_rollout_start(self):
+            prof = _ACTIVE
+            if prof is not None and self._mark is not None:
+                prof.add("ppo.train", self._mark)    # önceki güncelleme
+            self._mark = now()
+
+        def _on_step(self):
+            return True
+
+        def _on_rollout_end(self):
+            prof = _ACTIVE
+            if prof is not None:
+                self._mark = prof.add("ppo.rollout", self._mark)
+
+        def _on_training_end(self):
+            prof = _ACTIVE
+            if prof is not None and self._mark is not None:
+                prof.add("ppo.train", self._mark)
+
+    return ProfilingCallback()
+
+
+if os.environ.get("RLVEZS_PROFILE", "") not in ("", "0"):
+    enable()
+
+
+# ============================================================
+# DEMO
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simülatör + ortam profilleme demosu")
+    parser.add_argument("--T", type=int, default=2000)
+    parser.add_argument("--episodes", type=int, default=1)
+    parser.add_argument("--trace", default=None, help="Chrome trace JSON çıktı yolu")
+    args = parser.parse_args(argv)
+
+    # -m ile çalışınca bu dosya __main__ olur; kancalar src.profiling'e bakar
+    from src import profiling
+    from src.data_simulation import simulate_production_line_advanced
+    from src.env_rl import ProductionLineEnv
+
+    prof = profiling.enable()
+
+    with profiling.section("demo.simulate"):
+        df = simulate_production_line_advanced(T=args.T)
+
+    env = ProductionLineEnv(df[["lead_time"]], lambda w: float(np.mean(w)))
+    with profiling.section("demo.episodes"):
+        for _ in range(args.episodes):
+            env.reset()
+            terminated = False
+            while not terminated:
+                _, _, terminated, _, _ = env.step(env.action_space.sample())
+
+    profiling.disable()
+    print(prof.report())
+    if args.trace:
+        print(f"Trace: {prof.export_chrome_trace(args.trace)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
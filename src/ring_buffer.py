@@ -0,0 +1,97 @@
+"""
+============================================================
+ HALKA TAMPON (RING BUFFER)
+============================================================
+
+Sabit kapasiteli, kolon bazlı (kolon başına tipli NumPy dizisi)
+dairesel tampon. Ekleme O(k), bellek sabittir; kapasite dolunca en
+eski satırların üzerine yazılır.
+
+- total : bugüne kadar eklenen satır sayısı (mutlak sayaç)
+- start : tamponda kalan en eski satırın mutlak numarası
+- since(seen) → yalnızca seen'den sonra gelen satırlar (ör. istemciye
+  yalnızca yeni noktaları göndermek için)
+
+Kullanım:
+---------
+buf = RingBuffer(1_000_000, ["time", "lead_time"])
+buf.extend({"time": t, "lead_time": lt})     # dict ya da DataFrame
+buf.column("lead_time", last=500)            # en son 500 değer (sıralı kopya)
+new_rows = buf.since(seen)                   # seen: daha önce görülen total
+
+============================================================
+"""
+
+import numpy as np
+
+
+class RingBuffer:
+    def __init__(self, capacity: int, columns, dtype=np.float64):
+        """columns: kolon isimleri listesi ya da {isim: dtype} sözlüğü."""
+        if capacity <= 0:
+            raise ValueError(f"capacity pozitif olmalı: {capacity}")
+        if not isinstance(columns, dict):
+            columns = {c: dtype for c in columns}
+
+        self.capacity = capacity
+        self.columns = list(columns)
+        self._data = {c: np.zeros(capacity, dtype=dt) for c, dt in columns.items()}
+        self.total = 0
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    @property
+    def start(self) -> int:
+        return self.total - len(self)
+
+    def clear(self) -> None:
+        self.total = 0
+
+    def extend(self, chunk) -> None:
+        """chunk: {kolon: dizi} ya da DataFrame; tüm kolonlar aynı uzunlukta."""
+        k = len(chunk[self.columns[0]])
+        if k == 0:
+            return
+
+        # Kapasiteden uzun parçada yalnızca son capacity satır kalır
+        skip = max(0, k - self.capacity)
+        pos = (self.total + skip) % self.capacity
+        n = k - skip
+        first = min(n, self.capacity - pos)
+
+        for c in self.columns:
+            values = np.asarray(chunk[c])[skip:]
+            buf = self._data[c]
+            buf[pos:pos + first] = values[:first]
+            buf[:n - first] = values[first:]
+
+        self.total += k
+
+    def append(self, row) -> None:
+        # Tek satır: dizi kurmadan doğrudan skaler yazım (tik başına çağrılır)
+        pos = self.total % self.capacity
+        for c in self.columns:
+            self._data[c][pos] = row[c]
+        self.total += 1
+
+    def column(self, name: str, last: int | None = None) -> np.ndarray:
+        """En eskiden en yeniye sıralı kopya; last verilirse yalnızca son last değer."""
+        n = len(self) if last is None else min(last, len(self))
+        end = self.total % self.capacity
+        buf = self._data[name]
+        if n <= end:
+            return buf[end - n:end].copy()
+        return np.concatenate([buf[self.capacity - (n - end):], buf[:end]])
+
+    def to_dict(self, last: int | None = None) -> dict:
+        return {c: self.column(c, last) for c in self.columns}
+
+    def latest(self, name: str):
+        if self.total == 0:
+            raise IndexError("Tampon boş")
+        return self._data[name][(self.total - 1) % self.capacity]
+
+    def since(self, seen: int) -> dict:
+        """Mutlak numarası seen ve sonrası olan (hâlâ tamponda bulunan) satırlar."""
+        return self.to_dict(last=max(0, self.total - max(seen, self.start)))
@@ -1,12 +1,392 @@
-from stable_baselines3 import PPO
+"""
+============================================================
+ PPO AJANI EĞİTİMİ
+============================================================
+
+train_ppo          → tek ortam, süreç içi (eski kullanım)
+train_ppo_parallel → N alt süreç işçisi (SubprocVecEnv)
+
+Paralel eğitimde seri ve önceden hesaplanmış tahmin tablosu ana
+süreçte bir kez multiprocessing.shared_memory'ye yazılır; işçilere
+DataFrame değil yalnızca blok tanımları gönderilir ve işçiler aynı
+belleğe kopyasız bağlanır. İşçilerde LSTM/torch çıkarımı yapılmaz,
+tahminler tablodan okunur.
+
+- Periyodik checkpoint (CheckpointCallback) + kaldığı yerden devam
+- Gözlem/ödül VecNormalize ile normalize edilir (notebook'taki kurulum);
+  istatistikler checkpoint'lerle ve modelin yanına <ad>_vecnormalize.pkl
+  olarak kaydedilir, policy_export bunları politikayla dışa aktarır
+- perf/steps_per_sec, perf/worker_util_*, perf/rollout_frac kayıtları
+- --profile: ana süreç (ppo.rollout/ppo.train) + işçi (env.*) bölümleri
+  tek Chrome trace'te (bkz. src.profiling)
+
+Kullanım:
+---------
+python -m src.rl_train --n-envs 8 --timesteps 500000 --predictor lstm
+python -m src.rl_train --n-envs 8 --timesteps 1000000 --resume      # devam
+python -m src.rl_train --n-envs 4 --timesteps 20000 --profile reports/ppo_trace.json
+
+============================================================
+"""
+
+import argparse
+import functools
+import glob
+import os
+import re
+import time
+
+import gymnasium as gym
+import numpy as np
+
+from src import profiling
 from src.env_rl import ProductionLineEnv
+from src.shared_arrays import attach, release, to_shared
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_DATA = os.path.join(PROJECT_ROOT, "data", "simulated", "line_data.csv")
+DEFAULT_OUT = os.path.join(PROJECT_ROOT, "models", "ppo_model.zip")
+DEFAULT_CHECKPOINT_DIR = os.path.join(PROJECT_ROOT, "models", "checkpoints")
+
 
 # ============================================================
-# PPO AJANI EĞİTİMİ
+# TEK ORTAM
 # ============================================================
 
-def train_ppo(env):
+def train_ppo(env, total_timesteps=50_000, save_path="ppo_model"):
+    from stable_baselines3 import PPO
+
     model = PPO("MlpPolicy", env, verbose=1)
-    model.learn(total_timesteps=50_000)   # eğitim süresi
-    model.save("ppo_model")               # model kaydı
+    model.learn(total_timesteps=total_timesteps)   # eğitim süresi
+    model.save(save_path)                          # model kaydı
     return model
+
+
+# ============================================================
+# İŞÇİ TARAFI
+# ============================================================
+
+class _SharedColumns:
+    """ProductionLineEnv'in beklediği en küçük arayüz: columns + df[kolon]."""
+
+    def __init__(self, columns: dict):
+        self._columns = columns
+        self.columns = list(columns)
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+
+class TimedEnv(gym.Wrapper):
+    """step/reset içinde geçen süreyi biriktirir (işçi doluluğu için)."""
+
+    def __init__(self, env):
+        super().__init__(env)
+        self.busy_time = 0.0
+
+    def step(self, action):
+        t = time.perf_counter()
+        try:
+            return self.env.step(action)
+        finally:
+            self.busy_time += time.perf_counter() - t
+
+    def reset(self, **kwargs):
+        t = time.perf_counter()
+        try:
+            return self.env.reset(**kwargs)
+        finally:
+            self.busy_time += time.perf_counter() - t
+
+    def profiler_snapshot(self):
+        """İşçinin profil kayıtları (env_method ile ana sürece taşınır)."""
+        return profiling.active()
+
+
+def _make_shared_env(series_spec, pred_spec, target_col, window_size, profile=False):
+    """İşçide çalışır: paylaşımlı bloklara bağlanıp ortamı kurar."""
+    from stable_baselines3.common.monitor import Monitor
+
+    if profile:
+        profiling.enable()
+
+    series_shm, series = attach(series_spec)
+    pred_shm, predictions = attach(pred_spec)
+
+    env = ProductionLineEnv(
+        _SharedColumns({target_col: series}), predict_fn=None,
+        window_size=window_size, predictions=predictions,
+    )
+    # Bloklar ortam yaşadıkça açık kalmalı
+    env._shared = (series_shm, pred_shm)
+    return TimedEnv(Monitor(env))
+
+
+# ============================================================
+# GÖZLEM: HIZ & İŞÇİ DOLULUĞU
+# ============================================================
+
+def _throughput_callback(log_every_rollouts=1, verbose=1):
+    from stable_baselines3.common.callbacks import BaseCallback
+
+    class ThroughputCallback(BaseCallback):
+        """
+        Her rollout sonunda:
+        perf/steps_per_sec  : ortam adımı / duvar saati (rollout + güncelleme)
+        perf/worker_util_*  : işçilerin step'te geçirdiği süre / rollout süresi
+        perf/rollout_frac   : duvar saatinin rollout toplamadaki payı
+        """
+
+        def __init__(self):
+            super().__init__(verbose)
+            self.n_rollouts = 0
+
+        def _on_training_start(self):
+            self._t0 = self._t_rollout = self._t_prev_end = time.perf_counter()
+            self._steps0 = self.num_timesteps
+            self._busy0 = np.array(self.training_env.get_attr("busy_time"))
+
+        def _on_rollout_start(self):
+            self._t_rollout = time.perf_counter()
+            self._busy0 = np.array(self.training_env.get_attr("busy_time"))
+
+        def _on_step(self):
+            return True
+
+        def _on_rollout_end(self):
+            self.n_rollouts += 1
+            now = time.perf_counter()
+            rollout_s = now - self._t_rollout
+            busy = np.array(self.training_env.get_attr("busy_time")) - self._busy0
+            util = busy / max(rollout_s, 1e-9)
+
+            steps = self.num_timesteps - self._steps0
+            sps = steps / max(now - self._t0, 1e-9)
+            self._t0, self._steps0 = now, self.num_timesteps
+
+            self.logger.record("perf/steps_per_sec", sps)
+            self.logger.record("perf/worker_util_mean", float(util.mean()))
+            self.logger.record("perf/worker_util_min", float(util.min()))
+            # Önceki rollout sonundan beri: (önceki güncelleme + bu rollout)
+            self.logger.record("perf/rollout_frac", rollout_s / max(now - self._t_prev_end, 1e-9))
+            self._t_prev_end = now
+
+            if self.verbose and self.n_rollouts % log_every_rollouts == 0:
+                print(f"[{self.num_timesteps:>9d}] {sps:9.0f} adım/s  "
+                      f"işçi doluluğu ort {util.mean():.0%} min {util.min():.0%}")
+
+    return ThroughputCallback()
+
+
+# ============================================================
+# PARALEL EĞİTİM
+# ============================================================
+
+def latest_checkpoint(checkpoint_dir, prefix="ppo"):
+    """checkpoint_dir içindeki en büyük adımlı <prefix>_<adım>_steps.zip."""
+    pattern = re.compile(rf"{re.escape(prefix)}_(\d+)_steps\.zip$")
+    found = []
+    for path in glob.glob(os.path.join(checkpoint_dir, f"{prefix}_*_steps.zip")):
+        m = pattern.search(os.path.basename(path))
+        if m:
+            found.append((int(m.group(1)), path))
+    return max(found)[1] if found else None
+
+
+def checkpoint_vecnormalize(checkpoint):
+    """CheckpointCallback adlandırması: ppo_<adım>_steps.zip → ppo_vecnormalize_<adım>_steps.pkl"""
+    head, name = os.path.split(checkpoint)
+    return os.path.join(head, re.sub(r"_(\d+)_steps\.zip$", r"_vecnormalize_\1_steps.pkl", name))
+
+
+def build_prediction_table(series, window_size, predictor="mean", model_path=None,
+                           scaler_path=None):
+    """
+    predictor="mean" → pencere ortalaması (notebook'taki hızlı sahte tahminci)
+    predictor="lstm" → LSTMPredictor.predict_batch (disk önbellekli); window_size
+                       sidecar'daki pencereyle aynı olmalı (yoksa ValueError). Sidecar
+                       "scaled" diyorsa pencereler scaler ile ölçeklenir ve
+                       çıktı inverse_transform ile seri birimine döndürülür
+    """
+    from src.prediction_table import load_or_compute
+
+    series = np.asarray(series, dtype=np.float64)
+    if predictor == "mean":
+        return load_or_compute(series, window_size,
+                               batch_predict_fn=lambda w: w.mean(axis=(1, 2)))
+
+    if predictor != "lstm":
+        raise ValueError(f"Bilinmeyen predictor: {predictor!r}")
+
+    import pickle
+    from src.lstm_torch import LSTMPredictor
+
+    model_path = model_path or os.path.join(PROJECT_ROOT, "models", "lstm_lead_time.pt")
+    scaler_path = scaler_path or os.path.join(PROJECT_ROOT, "models", "lstm_scaler.pkl")
+    predictor = LSTMPredictor(model_path)
+    # Tablo env penceresiyle indekslenir; model başka uzunlukta eğitildiyse
+    # tahminler yanlış pencereye hizalanır
+    if predictor.window != window_size:
+        raise ValueError(
+            f"{model_path} {predictor.window} adımlık pencereyle eğitildi "
+            f"(sidecar), ortam window_size={window_size}; --window {predictor.window} kullanın"
+        )
+
+    if not predictor.config["scaled"]:
+        # Ham seriyle eğitilmiş checkpoint: scaler uygulanmaz
+        return load_or_compute(series, window_size,
+                               batch_predict_fn=predictor.predict_batch,
+                               model_id=f"{model_path}|raw")
+
+    with open(scaler_path, "rb") as f:
+        scaler = pickle.load(f)
+
+    def batch_predict_fn(windows):
+        b, w, _ = windows.shape
+        scaled = scaler.transform(windows.reshape(-1, 1)).reshape(b, w, 1)
+        pred = np.asarray(predictor.predict_batch(scaled), dtype=np.float64).reshape(-1, 1)
+        return scaler.inverse_transform(pred).reshape(-1)
+
+    # "|inverse": seri biriminde tablo; eski (ölçekli uzaydaki) önbellekle çakışmaz
+    return load_or_compute(series, window_size, batch_predict_fn=batch_predict_fn,
+                           model_id=f"{model_path}|{scaler_path}|inverse")
+
+
+def train_ppo_parallel(
+    df,
+    n_envs=None,
+    total_timesteps=200_000,
+    target_col="lead_time",
+    window_size=10,
+    predictions=None,
+    predictor="mean",
+    checkpoint_dir=DEFAULT_CHECKPOINT_DIR,
+    checkpoint_every=50_000,
+    resume=False,
+    save_path=DEFAULT_OUT,
+    seed=0,
+    start_method=None,
+    ppo_kwargs=None,
+    verbose=1,
+    profile=None,
+):
+    """
+    df: DataFrame ya da ColumnarDataset (yalnızca target_col okunur).
+    predictions: hazır tahmin tablosu; yoksa build_prediction_table(predictor).
+    checkpoint_every: toplam ortam adımı cinsinden kayıt sıklığı.
+    resume=True: checkpoint_dir'deki en son kayıttan devam eder; total_timesteps
+                 toplam hedeftir (kalan adım kadar eğitilir).
+    profile: Chrome trace yolu; verilirse ana süreç ve işçiler profillenir,
+             rapor yazdırılır.
+    """
+    from stable_baselines3 import PPO
+    from stable_baselines3.common.callbacks import CallbackList, CheckpointCallback
+    from stable_baselines3.common.vec_env import SubprocVecEnv, VecNormalize
+
+    from src.policy_export import vecnormalize_path
+
+    n_envs = n_envs or os.cpu_count() or 1
+    series = np.asarray(df[target_col], dtype=np.float64)
+    if predictions is None:
+        predictions = build_prediction_table(series, window_size, predictor)
+
+    # float32: ProductionLineEnv gözlem matrisi olarak bloğu kopyasız kullanır
+    # (float64 paylaşılırsa her işçi kendi float32 kopyasını kurar)
+    series_shm, series_spec = to_shared(series.astype(np.float32))
+    pred_shm, pred_spec = to_shared(np.asarray(predictions, dtype=np.float32))
+
+    venv = None
+    try:
+        factory = functools.partial(_make_shared_env, series_spec, pred_spec, target_col,
+                                    window_size, profile=bool(profile))
+        venv = SubprocVecEnv([factory] * n_envs, start_method=start_method)
+        venv.seed(seed)
+
+        checkpoint = latest_checkpoint(checkpoint_dir) if resume else None
+        stats = checkpoint and checkpoint_vecnormalize(checkpoint)
+        if stats and os.path.exists(stats):
+            venv = VecNormalize.load(stats, venv)
+        else:
+            venv = VecNormalize(venv, norm_obs=True, norm_reward=True,
+                                clip_obs=10.0, clip_reward=10.0)
+
+        if checkpoint is not None:
+            model = PPO.load(checkpoint, env=venv, device="cpu")
+            if verbose:
+                print(f"Devam: {checkpoint} ({model.num_timesteps} adım)")
+        else:
+            kwargs = {"n_steps": 512, "batch_size": 128, "device": "cpu", "seed": seed,
+                      **(ppo_kwargs or {})}
+            model = PPO("MlpPolicy", venv, verbose=verbose, **kwargs)
+
+        callbacks = CallbackList([
+            CheckpointCallback(save_freq=max(checkpoint_every // n_envs, 1),
+                               save_path=checkpoint_dir, name_prefix="ppo",
+                               save_vecnormalize=True),
+            _throughput_callback(verbose=verbose),
+        ] + ([profiling.sb3_callback()] if profile else []))
+        if profile:
+            profiling.enable()
+
+        remaining = total_timesteps - model.num_timesteps
+        if remaining > 0:
+            model.learn(total_timesteps=remaining, callback=callbacks,
+                        reset_num_timesteps=checkpoint is None)
+
+        if save_path:
+            os.makedirs(os.path.dirname(os.path.abspath(save_path)), exist_ok=True)
+            model.save(save_path)
+            venv.save(vecnormalize_path(save_path))
+
+        if profile:
+            prof = profiling.disable()
+            for worker_prof in venv.env_method("profiler_snapshot"):
+                if worker_prof is not None:
+                    prof.merge(worker_prof)
+            print(prof.report())
+            print(f"Trace: {prof.export_chrome_trace(profile)}")
+        return model
+    finally:
+        if venv is not None:
+            venv.close()
+        release(series_shm, unlink=True)
+        release(pred_shm, unlink=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Çok süreçli PPO eğitimi (paylaşımlı bellek)")
+    parser.add_argument("--data", default=DEFAULT_DATA, help="CSV ya da kolon deposu dizini")
+    parser.add_argument("--column", default="lead_time")
+    parser.add_argument("--n-envs", type=int, default=None, help="varsayılan: çekirdek sayısı")
+    parser.add_argument("--timesteps", type=int, default=200_000)
+    parser.add_argument("--window", type=int, default=10)
+    parser.add_argument("--predictor", choices=["mean", "lstm"], default="mean")
+    parser.add_argument("--checkpoint-dir", default=DEFAULT_CHECKPOINT_DIR)
+    parser.add_argument("--checkpoint-every", type=int, default=50_000)
+    parser.add_argument("--resume", action="store_true")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--n-steps", type=int, default=512, help="işçi başına rollout uzunluğu")
+    parser.add_argument("--profile", default=None, help="Chrome trace JSON çıktı yolu")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.data):
+        from src.dataset_store import open_dataset
+        df = open_dataset(args.data)
+    else:
+        import pandas as pd
+        df = pd.read_csv(args.data, usecols=[args.column])
+
+    train_ppo_parallel(
+        df, n_envs=args.n_envs, total_timesteps=args.timesteps, target_col=args.column,
+        window_size=args.window, predictor=args.predictor,
+        checkpoint_dir=args.checkpoint_dir, checkpoint_every=args.checkpoint_every,
+        resume=args.resume, save_path=args.out, seed=args.seed,
+        ppo_kwargs={"n_steps": args.n_steps}, profile=args.profile,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
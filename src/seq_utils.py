@@ -1,8 +1,21 @@
 import numpy as np
 
-def prepare_sequences(series, window=10):
-    X, y = [], []
-    for i in range(len(series) - window):
-        X.append(series[i:i+window])
-        y.append(series[i+window])
-    return np.array(X), np.array(y)
+from src.windowing import sliding_windows
+
+
+def prepare_sequences(series, window=10, copy=False):
+    """
+    X: (n - window, window), y: (n - window,).
+
+    Varsayılan dönüş kopyasız, SALT-OKUNUR görünümlerdir (eskiden
+    yazılabilir kopyalardı): X/y'ye yerinde yazan kod (normalizasyon,
+    augmentation) "assignment destination is read-only" hatası alır.
+    Böyle kullanımlar için copy=True → yazılabilir, bitişik kopyalar.
+    Depodaki çağıranlar (notebooks/03) yalnızca dilimler ve torch/Keras'a
+    verir; onlar zaten kopyalar.
+    """
+    X, y = sliding_windows(np.asarray(series), window=window)
+    X = X[..., 0]
+    if copy:
+        return np.array(X), np.array(y)
+    return X, y
@@ -0,0 +1,70 @@
+"""
+============================================================
+ PAYLAŞIMLI BELLEK DİZİLERİ (multiprocessing.shared_memory)
+============================================================
+
+Ana süreç seriyi / tahmin tablosunu bir kez paylaşımlı belleğe
+kopyalar; alt süreç işçileri yalnızca küçük bir tanımı (isim, şekil,
+dtype) pickle ile alır ve aynı belleğe kopyasız bağlanır.
+
+    shm, spec = to_shared(series)          # ana süreç (sahip)
+    ...                                    # spec işçilere gönderilir
+    shm_w, arr = attach(spec)              # işçi: salt-okunur görünüm
+    ...
+    release(shm, unlink=True)              # ana süreç, iş bitince
+
+İşçi tarafındaki shm nesnesi, dizi kullanıldığı sürece canlı
+tutulmalıdır (ör. ortamın bir özniteliğinde).
+
+============================================================
+"""
+
+from multiprocessing import resource_tracker, shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+
+class SharedArraySpec(NamedTuple):
+    name: str
+    shape: tuple
+    dtype: str
+
+
+def to_shared(arr) -> tuple:
+    """arr'ı yeni bir paylaşımlı bellek bloğuna kopyalar → (shm, spec)."""
+    arr = np.ascontiguousarray(arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+    view[...] = arr
+    return shm, SharedArraySpec(shm.name, arr.shape, arr.dtype.str)
+
+
+def attach(spec: SharedArraySpec, untrack: bool = False) -> tuple:
+    """
+    Var olan bloğa bağlanır → (shm, salt-okunur ndarray).
+
+    multiprocessing ile başlatılan işçiler ana sürecin resource_tracker'ını
+    paylaşır; varsayılan yeterlidir. Bağımsız başlatılmış bir süreçten
+    bağlanırken untrack=True verin, yoksa o sürecin tracker'ı çıkışta
+    bloğu siler (Python < 3.13).
+    """
+    try:
+        shm = shared_memory.SharedMemory(name=spec.name, track=False)   # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=spec.name)
+        if untrack:
+            resource_tracker.unregister(shm._name, "shared_memory")
+
+    arr = np.ndarray(spec.shape, dtype=np.dtype(spec.dtype), buffer=shm.buf)
+    arr.flags.writeable = False
+    return shm, arr
+
+
+def release(shm, unlink: bool = False) -> None:
+    shm.close()
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,216 @@
+"""
+============================================================
+ SİMÜLASYON ÖNBELLEĞİ (İÇERİK ADRESLİ, DİSK ÜZERİNDE)
+============================================================
+
+Aynı parametrelerle tekrar tekrar çağrılan
+simulate_production_line_advanced koşularını diskte saklar.
+
+- Anahtar: tüm simülasyon parametreleri + T + seed + simülatör
+  kaynak kodunun özeti (kod değişince eski kayıtlar kendiliğinden geçersiz);
+  parçalı yazımda (chunk_size < T) chunk_size da anahtara girer
+- Kayıtlar src.dataset_store formatında tutulur → memmap ile anında açılır
+- Toplam boyut max_bytes'ı aşınca en uzun süredir kullanılmayan (LRU)
+  kayıtlar silinir
+- invalidate()/clear() ile açık geçersiz kılma, stats() ile hit/miss sayıları
+
+seed=None ya da rng verilen koşular rastgele olduğundan önbelleğe alınmaz.
+
+Kullanım:
+---------
+from src.sim_cache import cached_simulate, default_cache
+
+df = cached_simulate(T=50_000, seed=7)           # ilk çağrı: simülasyon + yazma
+df = cached_simulate(T=50_000, seed=7)           # sonraki çağrılar: diskten
+ds = cached_simulate(T=50_000, seed=7, as_frame=False)   # memmap ColumnarDataset
+default_cache().stats()
+
+============================================================
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+
+from src import data_simulation
+from src.data_simulation import _simulation_params, iter_production_line_chunks
+from src.dataset_store import META_FILE, open_dataset, write_dataset
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache", "simulations")
+
+_CODE_VERSION = None
+
+
+def code_version() -> str:
+    """Simülatör modülünün kaynak kodu özeti (kod değişince anahtarlar değişir)."""
+    global _CODE_VERSION
+    if _CODE_VERSION is None:
+        source = inspect.getsource(data_simulation)
+        _CODE_VERSION = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+    return _CODE_VERSION
+
+
+def _dir_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)
+    )
+
+
+class SimulationCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = 2 * 1024**3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ------------------------------------------------------------
+    #  Anahtar
+    # ------------------------------------------------------------
+    def key(self, T: int = 2000, seed: int | None = 42, chunk_size: int | None = None,
+            **params) -> str:
+        payload = {
+            "T": int(T),
+            "seed": seed,
+            "params": _simulation_params(params),
+            "code": code_version(),
+            # 2: T > 100_000 kayıtları eskiden sessizce parçalı yazılıyordu
+            "format": 2,
+        }
+        if chunk_size is not None and chunk_size < T:
+            # Sonuç tek parçalı koşudan ayrışır (bkz. simulate)
+            payload["chunk_size"] = int(chunk_size)
+        blob = json.dumps(payload, sort_keys=True, default=float)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    # ------------------------------------------------------------
+    #  Okuma / yazma
+    # ------------------------------------------------------------
+    def simulate(self, T: int = 2000, seed: int | None = 42, as_frame: bool = True,
+                 rng=None, chunk_size: int | None = None, **params):
+        """
+        Kayıt varsa diskten okur. as_frame=False → ColumnarDataset (memmap).
+
+        chunk_size=None → tek parça: simulate_production_line_advanced ile
+        birebir aynı sonuç. chunk_size < T yazım belleğini sınırlar, ancak
+        ilk tamamlanan işten önceki lead_time satırları tüm koşunun değil
+        ilk parçanın wip ortalamasıyla doldurulur; bu yüzden sonuç o
+        satırlarda farklıdır ve ayrı anahtarla saklanır.
+        """
+        if seed is None or rng is not None:
+            return data_simulation.simulate_production_line_advanced(
+                T=T, seed=seed, rng=rng, **params
+            )
+
+        chunk_size = chunk_size if chunk_size is not None and chunk_size < T else None
+        key = self.key(T=T, seed=seed, chunk_size=chunk_size, **params)
+        path = self._entry(key)
+
+        if os.path.isdir(path):
+            self.hits += 1
+            os.utime(os.path.join(path, META_FILE))  # LRU: son kullanım
+        else:
+            self.misses += 1
+            meta = {"T": T, "seed": seed, "code": code_version(), **_simulation_params(params)}
+            chunks = iter_production_line_chunks(
+                T=T, chunk_size=chunk_size or T, seed=seed, as_frame=False, **params
+            )
+            tmp = f"{path}.tmp{os.getpid()}"
+            write_dataset(tmp, chunks, params=meta, overwrite=True)
+            try:
+                os.replace(tmp, path)
+            except OSError:
+                # Başka bir süreç aynı kaydı önce yazdı
+                shutil.rmtree(tmp, ignore_errors=True)
+            self._evict(keep=key)
+
+        ds = open_dataset(path)
+        return ds.read() if as_frame else ds
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.isdir(self._entry(key))
+
+    # ------------------------------------------------------------
+    #  Geçersiz kılma / temizlik
+    # ------------------------------------------------------------
+    def invalidate(self, key: str | None = None, **sim_kwargs) -> bool:
+        """
+        Tek bir kaydı siler: ya anahtarla ya da simülasyon parametreleriyle
+        (invalidate(T=5000, seed=1, breakdown_prob_A=0.02)). Silindiyse True.
+        """
+        if key is None:
+            key = self.key(**sim_kwargs)
+        path = self._entry(key)
+        if not os.path.isdir(path):
+            return False
+        shutil.rmtree(path)
+        return True
+
+    def clear(self) -> int:
+        """Tüm kayıtları siler, silinen kayıt sayısını döndürür."""
+        entries = self._entries()
+        for _, _, path in entries:
+            shutil.rmtree(path, ignore_errors=True)
+        return len(entries)
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """(son kullanım, boyut, yol) listesi; en eski önce."""
+        out = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            meta = os.path.join(path, META_FILE)
+            if ".tmp" in name or not os.path.exists(meta):
+                continue
+            out.append((os.path.getmtime(meta), _dir_size(path), path))
+        return sorted(out)
+
+    def _evict(self, keep: str | None = None) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if os.path.basename(path) == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+# =====================================================================
+#  VARSAYILAN ÖNBELLEK
+# =====================================================================
+_DEFAULT_CACHE = None
+
+
+def default_cache() -> SimulationCache:
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = SimulationCache()
+    return _DEFAULT_CACHE
+
+
+def cached_simulate(T: int = 2000, seed: int | None = 42, as_frame: bool = True, **params):
+    """simulate_production_line_advanced'ın önbellekli karşılığı."""
+    return default_cache().simulate(T=T, seed=seed, as_frame=as_frame, **params)
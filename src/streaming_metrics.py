@@ -0,0 +1,186 @@
+"""
+============================================================
+ AKAN (STREAMING) VE VEKTÖREL METRİKLER
+============================================================
+
+- discounted_returns : (bölüm, adım) ödül matrisi → bölüm başına indirimli toplam
+- reward_to_go       : her adım için G_t = r_t + γ·G_{t+1} (doğrusal filtre, lfilter)
+- RunningMean        : Welford ortalama/varyans; parça parça güncellenir, birleştirilir
+- ForecastAccumulator: akan RMSE ve MAPE (sklearn MAPE'si ile aynı eps kuralı)
+- SuccessRate        : akan başarı oranı
+
+Birikimciler (accumulator) tüm diziyi bellekte tutmaz; ortamdan ya da
+akan simülatörden gelen parçalarla update() edilir. Paralel işçilerin
+sonuçları merge() ile (Chan vd. paralel varyans formülü) birleştirilir.
+Nesneler pickle'lanabilir, süreç havuzundan doğrudan döndürülebilir.
+
+Kullanım:
+---------
+acc = ForecastAccumulator()
+for chunk in iter_production_line_chunks(T=1_000_000, chunk_size=50_000):
+    acc.update(chunk["lead_time"], tahminler)
+acc.rmse, acc.mape
+
+total = ForecastAccumulator.merge_all(isci_sonuclari)
+
+============================================================
+"""
+
+import numpy as np
+
+
+# sklearn.metrics.mean_absolute_percentage_error ile aynı
+_MAPE_EPS = np.finfo(np.float64).eps
+
+
+# ============================================================
+# İNDİRİMLİ GETİRİLER
+# ============================================================
+
+def discounted_returns(rewards, gamma=0.99, mask=None):
+    """
+    rewards: (T,) ya da (E, T). mask (aynı şekil, bool) verilirse yanlış
+    olan adımlar (ör. farklı uzunluktaki bölümlerin dolgusu) sayılmaz.
+    Dönüş: skaler ya da (E,) → Σ_t γ^t · r_t
+    """
+    r = np.asarray(rewards, dtype=np.float64)
+    if mask is not None:
+        r = np.where(mask, r, 0.0)
+    weights = gamma ** np.arange(r.shape[-1], dtype=np.float64)
+    out = r @ weights
+    return float(out) if np.ndim(out) == 0 else out
+
+
+def reward_to_go(rewards, gamma=0.99):
+    """
+    Her adımın indirimli kalan getirisi, son eksen boyunca:
+    G_t = r_t + γ · G_{t+1}. Ters çevrilmiş seride IIR filtre
+    y[n] = x[n] + γ·y[n-1] olarak tek C döngüsünde hesaplanır.
+    """
+    from scipy.signal import lfilter
+
+    r = np.asarray(rewards, dtype=np.float64)
+    return lfilter([1.0], [1.0, -gamma], r[..., ::-1], axis=-1)[..., ::-1]
+
+
+# ============================================================
+# BİRİKİMCİLER
+# ============================================================
+
+class RunningMean:
+    """Welford ortalama + M2 (varyans için), batch güncelleme ve birleştirme."""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _combine(self, n_b, mean_b, m2_b):
+        n = self.n + n_b
+        if n_b == 0:
+            return
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.n * n_b / n
+        self.n = n
+
+    def update(self, values):
+        v = np.asarray(values, dtype=np.float64).ravel()
+        if len(v):
+            mean_b = v.mean()
+            self._combine(len(v), mean_b, float(((v - mean_b) ** 2).sum()))
+        return self
+
+    def merge(self, other):
+        self._combine(other.n, other.mean, other.m2)
+        return self
+
+    @property
+    def variance(self):
+        """Örneklem varyansı (ddof=1)."""
+        return self.m2 / (self.n - 1) if self.n > 1 else float("nan")
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+    @property
+    def sem(self):
+        """Ortalamanın standart hatası."""
+        return self.std / np.sqrt(self.n) if self.n > 1 else float("nan")
+
+    def __repr__(self):
+        return f"RunningMean(n={self.n}, mean={self.mean:.6g}, std={self.std:.6g})"
+
+
+class ForecastAccumulator:
+    """
+    Akan RMSE ve MAPE. Kare hata ve yüzde mutlak hata ortalamaları Welford
+    ile tutulur; sonuçlar tüm dizi üzerinde compute_mape_rmse ile aynıdır.
+    """
+
+    __slots__ = ("sq_err", "ape")
+
+    def __init__(self):
+        self.sq_err = RunningMean()
+        self.ape = RunningMean()
+
+    def update(self, true, pred):
+        true = np.asarray(true, dtype=np.float64).ravel()
+        pred = np.asarray(pred, dtype=np.float64).ravel()
+        err = true - pred
+        self.sq_err.update(err * err)
+        self.ape.update(np.abs(err) / np.maximum(np.abs(true), _MAPE_EPS))
+        return self
+
+    def merge(self, other):
+        self.sq_err.merge(other.sq_err)
+        self.ape.merge(other.ape)
+        return self
+
+    @classmethod
+    def merge_all(cls, accumulators):
+        total = cls()
+        for acc in accumulators:
+            total.merge(acc)
+        return total
+
+    @property
+    def n(self):
+        return self.sq_err.n
+
+    @property
+    def rmse(self):
+        return float(np.sqrt(self.sq_err.mean)) if self.n else float("nan")
+
+    @property
+    def mape(self):
+        return float(self.ape.mean) if self.n else float("nan")
+
+    def result(self):
+        return {"n": self.n, "mape": self.mape, "rmse": self.rmse}
+
+
+class SuccessRate:
+    __slots__ = ("n", "successes")
+
+    def __init__(self):
+        self.n = 0
+        self.successes = 0
+
+    def update(self, flags):
+        f = np.asarray(flags, dtype=bool).ravel()
+        self.n += len(f)
+        self.successes += int(f.sum())
+        return self
+
+    def merge(self, other):
+        self.n += other.n
+        self.successes += other.successes
+        return self
+
+    @property
+    def rate(self):
+        return self.successes / self.n if self.n else float("nan")
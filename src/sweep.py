@@ -0,0 +1,209 @@
+"""
+============================================================
+ SENARYO TARAMASI (PARAMETER SWEEP)
+============================================================
+
+Arıza olasılıkları, bakım aralıkları ve geliş hızları gibi
+simülasyon parametrelerinden oluşan bir ızgarayı süreç havuzuna
+(process pool) dağıtır.
+
+- Her iş kendi np.random.Generator'ını alır: SeedSequence(base_seed)
+  iş numarasıyla türetilir → sonuçlar işçi sayısından bağımsızdır
+- Sonuçlar iş başına bir bölüm (partition) klasörüne yazılır:
+      <out_dir>/sweep.json
+      <out_dir>/job=00000/    (src.dataset_store kolon deposu)
+- Yarıda kesilen tarama aynı komutla devam ettirilir; tamamlanmış
+  bölümler atlanır (bölümler geçici klasörde yazılıp atomik taşınır)
+
+Kullanım:
+---------
+python -m src.sweep --out data/sweeps/demo --T 5000 --reps 3 --workers 8 \\
+    --grid breakdown_prob_A=0.01,0.02,0.04 maintenance_interval_A=300,400
+
+from src.sweep import run_sweep, load_sweep
+run_sweep({"base_arrival": [1.5, 2.0, 2.5]}, "data/sweeps/arrival", T=5000)
+df = load_sweep("data/sweeps/arrival")
+
+============================================================
+"""
+
+import argparse
+import ast
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from src.data_simulation import _simulation_params, iter_production_line_chunks
+from src.dataset_store import open_dataset, write_dataset
+
+
+MANIFEST = "sweep.json"
+
+
+# =====================================================================
+#  IZGARA → İŞ LİSTESİ
+# =====================================================================
+def expand_grid(grid: dict) -> list[dict]:
+    """
+    {"a": [1, 2], "b": [3]} → [{"a": 1, "b": 3}, {"a": 2, "b": 3}]
+    Anahtar sırası sabitlenir (sıralı), böylece iş numaraları kararlıdır.
+    """
+    keys = sorted(grid)
+    values = [list(grid[k]) for k in keys]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def _job_dir(out_dir: str, job_id: int) -> str:
+    return os.path.join(out_dir, f"job={job_id:05d}")
+
+
+def _job_rng(base_seed: int, job_id: int) -> np.random.Generator:
+    # SeedSequence(base_seed).spawn(n)[job_id] ile aynı akış
+    return np.random.default_rng(np.random.SeedSequence(base_seed, spawn_key=(job_id,)))
+
+
+# =====================================================================
+#  TEK İŞ (işçi sürecinde çalışır)
+# =====================================================================
+def _run_job(job: dict) -> int:
+    rng = _job_rng(job["base_seed"], job["job_id"])
+    chunks = iter_production_line_chunks(
+        T=job["T"], chunk_size=job["chunk_size"], rng=rng, as_frame=False, **job["params"]
+    )
+
+    final = _job_dir(job["out_dir"], job["job_id"])
+    tmp = final + ".tmp"
+    meta = {k: job[k] for k in ("job_id", "rep", "params", "T", "base_seed")}
+    write_dataset(tmp, chunks, params=meta, overwrite=True)
+
+    os.replace(tmp, final)
+    return job["job_id"]
+
+
+# =====================================================================
+#  TARAMA
+# =====================================================================
+def run_sweep(
+    grid: dict,
+    out_dir: str,
+    T: int = 2000,
+    n_reps: int = 1,
+    base_seed: int = 42,
+    n_workers: int | None = None,
+    chunk_size: int = 50_000,
+    verbose: bool = True,
+) -> list[int]:
+    """
+    Izgaradaki her nokta için n_reps koşu üretir ve out_dir'e yazar.
+    Önceden tamamlanmış işler atlanır. Çalıştırılan iş numaralarını döndürür.
+    """
+    points = expand_grid(grid)
+    for point in points:
+        _simulation_params(point)  # bilinmeyen parametreleri erkenden yakala
+
+    config = {"grid": grid, "T": T, "n_reps": n_reps, "base_seed": base_seed}
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST)
+
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            previous = json.load(f)
+        if previous != json.loads(json.dumps(config)):
+            raise ValueError(
+                f"{out_dir} farklı bir tarama ayarıyla oluşturulmuş; "
+                "devam etmek için aynı ayarları kullanın ya da yeni klasör seçin."
+            )
+    else:
+        with open(manifest_path, "w") as f:
+            json.dump(config, f, indent=2)
+
+    jobs = []
+    for i, (point, rep) in enumerate(itertools.product(points, range(n_reps))):
+        if os.path.isdir(_job_dir(out_dir, i)):
+            continue
+        jobs.append({
+            "job_id": i, "rep": rep, "params": point,
+            "T": T, "base_seed": base_seed, "out_dir": out_dir,
+            "chunk_size": chunk_size,
+        })
+
+    total = len(points) * n_reps
+    if verbose:
+        print(f"Tarama: {total} iş, {total - len(jobs)} tamamlanmış, {len(jobs)} çalışacak")
+
+    done = []
+    if not jobs:
+        return done
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(_run_job, job) for job in jobs]
+        for fut in as_completed(futures):
+            done.append(fut.result())
+            if verbose:
+                print(f"  [{len(done)}/{len(jobs)}] job={done[-1]:05d} tamam")
+
+    return sorted(done)
+
+
+def load_sweep(out_dir: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Tamamlanmış bölümleri tek uzun DataFrame'de birleştirir
+    (job_id, rep ve taranan parametre kolonları eklenir).
+    """
+    frames = []
+    for name in sorted(os.listdir(out_dir)):
+        path = os.path.join(out_dir, name)
+        if not name.startswith("job=") or name.endswith(".tmp"):
+            continue
+
+        ds = open_dataset(path)
+        meta = ds.params
+        df = ds.read(columns)
+
+        df.insert(0, "job_id", meta["job_id"])
+        df.insert(1, "rep", meta["rep"])
+        for i, (k, v) in enumerate(meta["params"].items()):
+            df.insert(2 + i, k, v)
+        frames.append(df)
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+# =====================================================================
+#  CLI
+# =====================================================================
+def _parse_grid(items: list[str]) -> dict:
+    grid = {}
+    for item in items:
+        key, _, values = item.partition("=")
+        if not values:
+            raise argparse.ArgumentTypeError(f"Beklenen biçim anahtar=v1,v2,...: {item!r}")
+        grid[key] = [ast.literal_eval(v) for v in values.split(",")]
+    return grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Üretim hattı senaryo taraması")
+    parser.add_argument("--grid", nargs="+", required=True,
+                        help="parametre=v1,v2,... (ör. breakdown_prob_A=0.01,0.02)")
+    parser.add_argument("--out", required=True, help="çıktı klasörü")
+    parser.add_argument("--T", type=int, default=2000)
+    parser.add_argument("--reps", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    run_sweep(
+        _parse_grid(args.grid), args.out,
+        T=args.T, n_reps=args.reps, base_seed=args.seed, n_workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
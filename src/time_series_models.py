@@ -1,17 +1,21 @@
+import os
+
 import numpy as np
 import pandas as pd
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-from sklearn.metrics import mean_absolute_percentage_error, mean_squared_error
+
+from src.metrics import compute_mape_rmse
 
 # ============================================================
 # ZAMAN SERİSİ MODELLERİ
 # Amaç: lead_time tahmini yapıp MAPE & RMSE hesaplamak
 # ============================================================
+# statsmodels yalnızca model kurulurken yüklenir (içe aktarma maliyeti yüksek)
 
 def sarima_forecast(df):
     """
     lead_time değişkenini SARIMA ile tahmin eder.
     """
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
 
     # Model tanımı (örnek parametreler)
     model = SARIMAX(
@@ -31,7 +35,158 @@ def sarima_forecast(df):
     true = df["lead_time"].iloc[start:end+1]
 
     # Metrikler
-    mape = mean_absolute_percentage_error(true, preds)
-    rmse = np.sqrt(mean_squared_error(true, preds))
+    mape, rmse = compute_mape_rmse(true, preds)
 
     return preds, mape, rmse
+
+
+# ============================================================
+# ARTIMLI (ROLLING-ORIGIN) SARIMA
+# Amaç: her başlangıç noktasında sıfırdan fit etmeden
+#       yeni gözlemlerle durum-uzay modelini güncellemek
+# ============================================================
+
+class RollingSarimaForecaster:
+    """
+    Bir kez fit eder, ardından yeni gözlemleri results.extend ile
+    (parametreler sabit, yalnızca Kalman filtresi ilerler) ekler.
+
+    refit_every: bu kadar yeni gözlemden sonra tam refit (None → hiç)
+    warm_start : refit önceki parametrelerden başlar (start_params)
+    max_history: refit'te kullanılacak en fazla son gözlem sayısı
+    """
+
+    def __init__(self, order=(2, 1, 2), seasonal_order=(1, 1, 1, 12),
+                 refit_every=None, warm_start=True, max_history=None, fit_kwargs=None):
+        self.order = order
+        self.seasonal_order = seasonal_order
+        self.refit_every = refit_every
+        self.warm_start = warm_start
+        self.max_history = max_history
+        self.fit_kwargs = {"disp": False, **(fit_kwargs or {})}
+
+        self.results = None
+        self.history = np.empty(0)
+        self.n_refits = 0
+        self._since_refit = 0
+
+    def _fit(self, start_params=None):
+        from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+        y = self.history
+        if self.max_history is not None:
+            y = y[-self.max_history:]
+        model = SARIMAX(y, order=self.order, seasonal_order=self.seasonal_order)
+        self.results = model.fit(start_params=start_params, **self.fit_kwargs)
+        self.n_refits += 1
+        self._since_refit = 0
+
+    def fit(self, y):
+        self.history = np.asarray(y, dtype=float).copy()
+        self._fit()
+        return self
+
+    def update(self, y_new):
+        y_new = np.atleast_1d(np.asarray(y_new, dtype=float))
+        if len(y_new) == 0:
+            return self
+
+        self.history = np.concatenate([self.history, y_new])
+        self._since_refit += len(y_new)
+
+        if self.refit_every is not None and self._since_refit >= self.refit_every:
+            start = self.results.params if self.warm_start else None
+            self._fit(start_params=start)
+        else:
+            self.results = self.results.extend(y_new)
+        return self
+
+    def forecast(self, steps=1):
+        return np.asarray(self.results.forecast(steps))
+
+
+def rolling_origin_backtest(series, initial, horizon=1, step=1, origins=None,
+                            **forecaster_kwargs):
+    """
+    series[:initial] ile fit edip her başlangıçta (origin) horizon adımlık
+    tahmin üretir, sonra step gözlem ekleyerek ilerler.
+    Dönüş: origin, h, forecast, actual kolonlu DataFrame.
+    """
+    y = np.asarray(series, dtype=float)
+    if origins is None:
+        origins = range(initial, len(y) - horizon + 1, step)
+    origins = list(origins)
+    if not origins:
+        return pd.DataFrame(columns=["origin", "h", "forecast", "actual"])
+
+    forecaster = RollingSarimaForecaster(**forecaster_kwargs).fit(y[:origins[0]])
+    rows = []
+    pos = origins[0]
+
+    for origin in origins:
+        if origin > pos:
+            forecaster.update(y[pos:origin])
+            pos = origin
+        preds = forecaster.forecast(horizon)
+        for h in range(horizon):
+            rows.append((origin, h + 1, float(preds[h]), float(y[origin + h])))
+
+    return pd.DataFrame(rows, columns=["origin", "h", "forecast", "actual"])
+
+
+def _backtest_job(job):
+    name, series, kwargs = job
+    df = rolling_origin_backtest(series, **kwargs)
+    df.insert(0, "series", name)
+    return df
+
+
+def parallel_backtest(series, initial, horizon=1, step=1, n_workers=None,
+                      n_blocks=None, **forecaster_kwargs):
+    """
+    Rolling-origin backtest'i süreç havuzuna dağıtır.
+
+    series bir sözlükse ({"machine_A": seri, ...}) her seri ayrı iştir.
+    Tek seride başlangıçlar n_blocks ardışık bloğa bölünür; her blok kendi
+    ilk başlangıcında fit edip sonrasını artımlı günceller (bu yüzden
+    refit_every=None iken sonuçlar seri koşudan bloğa göre biraz ayrışabilir).
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    jobs = []
+    if isinstance(series, dict):
+        for name, s in series.items():
+            kwargs = dict(initial=initial, horizon=horizon, step=step, **forecaster_kwargs)
+            jobs.append((name, np.asarray(s, dtype=float), kwargs))
+    else:
+        y = np.asarray(series, dtype=float)
+        origins = np.arange(initial, len(y) - horizon + 1, step)
+        n_blocks = n_blocks or n_workers or os.cpu_count() or 1
+        for block in np.array_split(origins, n_blocks):
+            if len(block) == 0:
+                continue
+            kwargs = dict(initial=initial, horizon=horizon, origins=block.tolist(),
+                          **forecaster_kwargs)
+            # Blok yalnızca ihtiyaç duyduğu öneki (+ ufuk) alır
+            jobs.append(("series", y[: block[-1] + horizon], kwargs))
+
+    if not jobs:
+        return pd.DataFrame(columns=["series", "origin", "h", "forecast", "actual"])
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        frames = list(pool.map(_backtest_job, jobs))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def backtest_scores(df):
+    """
+    Her seri ve ufuk için MAPE & RMSE. "series" kolonu yoksa
+    (rolling_origin_backtest çıktısı) yalnızca ufuğa göre gruplar.
+    """
+    keys = ["series", "h"] if "series" in df.columns else ["h"]
+    rows = []
+    for key, g in df.groupby(keys):
+        mape, rmse = compute_mape_rmse(g["actual"], g["forecast"])
+        rows.append((*key, mape, rmse))
+    return pd.DataFrame(rows, columns=keys + ["mape", "rmse"])
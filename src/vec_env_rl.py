@@ -0,0 +1,164 @@
+"""
+============================================================
+ VEKTÖRLEŞTİRİLMİŞ ÜRETİM HATTI ORTAMI
+============================================================
+
+ProductionLineEnv'in N kopyasını tek bir NumPy durumu üzerinden
+ilerletir. Her kopyanın seride kendi konumu (offset) vardır; her
+adımda N pencere tek bir (N, window, 1) batch olarak tahminciye verilir
+(tek ileri geçiş). Rollout hızı böylece N ile ölçeklenir.
+
+Ödül, gözlem ve bitiş koşulu tek ortamla aynıdır:
+    reward = -|gerçek - tahmin * (1 + aksiyon)|
+
+- ProductionLineVectorEnv → gymnasium.vector.VectorEnv (SAME_STEP autoreset)
+- SB3 için: src.vec_env_sb3.ProductionLineSB3VecEnv
+
+Kullanım:
+---------
+venv = ProductionLineVectorEnv(df, num_envs=16, batch_predict_fn=lstm_batch_predict_fn)
+obs, info = venv.reset(seed=0)                   # (16, 10, 1)
+obs, rew, term, trunc, info = venv.step(venv.action_space.sample())
+
+============================================================
+"""
+
+import gymnasium as gym
+import numpy as np
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import batch_space
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src import profiling
+from src.env_rl import _target_column
+from src.prediction_table import load_or_compute
+
+
+class ProductionLineVectorEnv(gym.vector.VectorEnv):
+    metadata = {"autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(self, df, num_envs=8, predict_fn=None, batch_predict_fn=None,
+                 window_size=10, precompute=False, model_id=None,
+                 episode_length=None, random_offsets=True, predictions=None,
+                 target_col=None):
+        """
+        df: DataFrame ya da ColumnarDataset.
+        target_col: hedef seri; ProductionLineEnv ile aynı kural (None →
+                    "lead_time" varsa o, yoksa ilk kolon; bulunamazsa KeyError).
+        batch_predict_fn: (N, window, 1) float32 → (N,) tahmin.
+        precompute=True: tahminler kurulumda tabloya alınır (bkz. prediction_table).
+        episode_length: None ise bölüm serinin sonuna kadar sürer.
+        random_offsets: True → her bölüm rastgele konumdan, False → eşit aralıklı.
+        predictions: hazır tahmin tablosu (bkz. prediction_table); verilirse
+                     tahminci çağrılmaz.
+        """
+        if predict_fn is None and batch_predict_fn is None and predictions is None:
+            raise ValueError("predict_fn ya da batch_predict_fn verilmeli")
+
+        self.target_col = _target_column(df.columns, target_col)
+        self.series = np.asarray(df[self.target_col], dtype=np.float64)
+        self.num_envs = num_envs
+        self.window_size = window_size
+        self.predict_fn = predict_fn
+        self.batch_predict_fn = batch_predict_fn
+        self.episode_length = episode_length
+        self.random_offsets = random_offsets
+
+        n = len(self.series)
+        if n - 1 <= window_size:
+            raise ValueError("Seri pencere boyutundan uzun olmalı")
+
+        # Gözlem pencereleri: kopyasız kayan görünüm (n - w + 1, w)
+        self._windows = sliding_window_view(self.series.astype(np.float32), window_size)
+
+        self.predictions = predictions
+        if predictions is None and precompute:
+            self.predictions = load_or_compute(
+                self.series, window_size,
+                batch_predict_fn=batch_predict_fn, predict_fn=predict_fn,
+                model_id=model_id,
+            )
+
+        self.single_action_space = gym.spaces.Box(
+            low=-1.0, high=1.0, shape=(1,), dtype=np.float32
+        )
+        self.single_observation_space = gym.spaces.Box(
+            low=-np.inf, high=np.inf, shape=(window_size, 1), dtype=np.float32
+        )
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        self.current_step = np.full(num_envs, window_size, dtype=np.int64)
+        self.start_step = self.current_step.copy()
+
+    # ------------------------------------------------------------
+    #  Yardımcılar
+    # ------------------------------------------------------------
+    def _sample_starts(self, k: int) -> np.ndarray:
+        w, last = self.window_size, len(self.series) - 2
+        if self.episode_length is not None:
+            last = max(w, last - self.episode_length + 1)
+        if self.random_offsets:
+            return self.np_random.integers(w, last + 1, size=k)
+        return w + (np.arange(k) * (last - w + 1)) // max(k, 1)
+
+    def _obs(self, steps: np.ndarray) -> np.ndarray:
+        return self._windows[steps - self.window_size][..., None]   # (k, w, 1)
+
+    def _predict(self, steps: np.ndarray, obs: np.ndarray) -> np.ndarray:
+        if self.predictions is not None:
+            return np.asarray(self.predictions[steps - self.window_size], dtype=np.float64)
+        if self.batch_predict_fn is not None:
+            return np.asarray(self.batch_predict_fn(obs), dtype=np.float64).reshape(-1)
+        return np.array([float(self.predict_fn(o)) for o in obs])
+
+    # ------------------------------------------------------------
+    #  VectorEnv API
+    # ------------------------------------------------------------
+    def reset(self, *, seed=None, options=None):
+        if seed is not None:
+            self._np_random, self._np_random_seed = gym.utils.seeding.np_random(seed)
+        self.start_step = self._sample_starts(self.num_envs)
+        self.current_step = self.start_step.copy()
+        return self._obs(self.current_step), {}
+
+    def step(self, actions):
+        prof = profiling.active()
+        if prof: t0 = profiling.now()
+
+        steps = self.current_step
+        obs = self._obs(steps)
+        if prof: t0 = prof.lap("vec_env.obs", t0)
+
+        pred = self._predict(steps, obs)
+        true = self.series[steps]
+        if prof: t0 = prof.lap("vec_env.predict", t0)
+
+        a = np.asarray(actions, dtype=np.float64).reshape(self.num_envs, -1)[:, 0]
+        rewards = -np.abs(true - pred * (1.0 + a))
+
+        steps = steps + 1
+        terminated = steps >= len(self.series) - 1
+        if self.episode_length is not None:
+            truncated = ~terminated & (steps - self.start_step >= self.episode_length)
+        else:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+
+        done = terminated | truncated
+        if prof: t0 = prof.lap("vec_env.reward", t0)
+
+        next_obs = np.where(
+            terminated[:, None, None], obs, self._obs(np.minimum(steps, len(self.series) - 1))
+        )
+
+        infos = {}
+        if done.any():
+            infos = {"final_obs": next_obs.copy(), "_final_obs": done}
+            starts = self._sample_starts(int(done.sum()))
+            self.start_step[done] = starts
+            steps[done] = starts
+            next_obs[done] = self._obs(starts)
+        if prof: prof.lap("vec_env.autoreset", t0)
+
+        self.current_step = steps
+        return next_obs, rewards, terminated, truncated, infos
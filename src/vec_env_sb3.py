@@ -0,0 +1,101 @@
+"""
+ProductionLineVectorEnv için stable-baselines3 VecEnv uyarlayıcısı.
+
+SB3'ün DummyVecEnv/SubprocVecEnv'i her kopya için ayrı Python step()
+çağırır; bu sınıf ise N kopyayı tek NumPy adımında ilerletir ve
+tahminciyi adım başına bir kez (N'lik batch ile) çağırır.
+
+Kullanım:
+---------
+from stable_baselines3 import PPO
+from src.vec_env_sb3 import ProductionLineSB3VecEnv
+
+venv = ProductionLineSB3VecEnv(df, num_envs=16, batch_predict_fn=lstm_batch_predict_fn)
+model = PPO("MlpPolicy", venv, n_steps=256)
+model.learn(total_timesteps=200_000)
+"""
+
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+
+from src.vec_env_rl import ProductionLineVectorEnv
+
+
+class ProductionLineSB3VecEnv(VecEnv):
+    """
+    Kopyalar tek bir ProductionLineVectorEnv'i paylaşır. get_attr/set_attr
+    kopya başına durumu (_PER_ENV_ATTRS) indeks indeks okur/yazar; diğer
+    öznitelikler ve env_method tüm batch'e aittir, indices ile alt küme
+    verilirse ValueError.
+    """
+
+    # ProductionLineVectorEnv'de (num_envs,) dizilerde tutulan kopya durumu
+    _PER_ENV_ATTRS = ("current_step", "start_step")
+
+    def __init__(self, df, num_envs=8, **kwargs):
+        self.venv = ProductionLineVectorEnv(df, num_envs=num_envs, **kwargs)
+        self.render_mode = None
+        self._actions = None
+        super().__init__(
+            num_envs,
+            self.venv.single_observation_space,
+            self.venv.single_action_space,
+        )
+
+    def reset(self):
+        seed = self._seeds[0]
+        obs, _ = self.venv.reset(seed=seed)
+        self._reset_seeds()
+        self._reset_options()
+        return obs
+
+    def step_async(self, actions):
+        self._actions = actions
+
+    def step_wait(self):
+        obs, rewards, terminated, truncated, info = self.venv.step(self._actions)
+        dones = terminated | truncated
+
+        infos = [{"TimeLimit.truncated": bool(truncated[i])} for i in range(self.num_envs)]
+        for i in np.flatnonzero(dones):
+            infos[i]["terminal_observation"] = info["final_obs"][i]
+
+        return obs, rewards.astype(np.float32), dones, infos
+
+    def close(self):
+        self.venv.close()
+
+    def _indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+    def _require_all(self, indices, what):
+        # Ortak durum/yöntem tek batch'e aittir; alt kümeye uygulanamaz
+        if indices is not None and sorted(set(self._indices(indices))) != list(range(self.num_envs)):
+            raise ValueError(f"{what} tüm kopyalar için ortaktır; indices ile alt küme seçilemez")
+
+    def get_attr(self, attr_name, indices=None):
+        target = self if attr_name == "render_mode" else self.venv
+        value = getattr(target, attr_name)
+        if attr_name in self._PER_ENV_ATTRS:
+            return [value[i] for i in self._indices(indices)]
+        return [value for _ in self._indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        if attr_name in self._PER_ENV_ATTRS:
+            getattr(self.venv, attr_name)[list(self._indices(indices))] = value
+            return
+        self._require_all(indices, attr_name)
+        setattr(self.venv, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        """Yöntem bir kez, tüm batch üzerinde çağrılır; sonuç her kopya için döner."""
+        self._require_all(indices, method_name)
+        result = getattr(self.venv, method_name)(*method_args, **method_kwargs)
+        return [result for _ in range(self.num_envs)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._indices(indices)]
@@ -0,0 +1,168 @@
+"""
+============================================================
+ PENCERELEME (KOPYASIZ, ÇOK DEĞİŞKENLİ, ÇOK ADIMLI)
+============================================================
+
+Zaman serisini model girdisi pencerelerine böler. Pencereler
+sliding_window_view ile alınan kayan görünümlerdir: seri ne kadar
+uzun olursa olsun ek bellek O(n · özellik), window katı değil.
+Kopya yalnızca o anki batch üretilirken yapılır.
+
+- sliding_windows   → X (örnek, window, özellik), y (örnek,) ya da (örnek, horizon)
+- train_val_split   → kronolojik bölme (görünümler), isteğe bağlı boşluk (gap)
+- iter_batches      → tembel batch üreteci (yalnızca o batch bellekte)
+- WindowDataset     → torch DataLoader ile doğrudan kullanılabilir map-style veri seti
+- tf_dataset        → tf.data.Dataset (tensorflow kuruluysa)
+
+Kullanım:
+---------
+X, y = sliding_windows(df, window=10, horizon=3, stride=2,
+                       features=["lead_time", "wip_total"], target="lead_time")
+(X_tr, y_tr), (X_val, y_val) = train_val_split(X, y, val_frac=0.2)
+for xb, yb in iter_batches(X_tr, y_tr, batch_size=256, shuffle=True, seed=0):
+    ...
+loader = DataLoader(WindowDataset(X_tr, y_tr), batch_size=32, shuffle=True)
+
+============================================================
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _columns(data, features=None, target=None):
+    """data → (n, f) dizi ve (n,) hedef. DataFrame'de target varsayılanı ilk özellik."""
+    if hasattr(data, "columns"):
+        features = list(features) if features is not None else list(data.columns)
+        # Tek kolonda to_numpy kopyasız; çok kolonda bir kez (n, f) matris kurulur
+        arr = data[features].to_numpy()
+        if isinstance(target, str):
+            tgt = data[target].to_numpy()
+        elif target is None:
+            tgt = arr[:, 0]
+        else:
+            tgt = np.asarray(target) if np.ndim(target) else arr[:, target]
+        return arr, tgt
+
+    arr = np.asarray(data)
+    if arr.ndim == 1:
+        arr = arr[:, None]
+    if features is not None:
+        arr = arr[:, list(features)]
+    if target is None:
+        tgt = arr[:, 0]
+    elif np.ndim(target):
+        tgt = np.asarray(target)
+    else:
+        tgt = arr[:, target]
+    return arr, tgt
+
+
+def sliding_windows(data, window=10, horizon=1, stride=1, features=None, target=None,
+                    squeeze=True):
+    """
+    data: 1B seri, (n, f) dizi ya da DataFrame.
+    features: kullanılacak kolonlar (DataFrame'de isim, dizide indeks).
+    target: hedef kolon (isim/indeks) ya da ayrı 1B dizi; varsayılan ilk kolon.
+
+    X[i] = data[i*stride : i*stride + window]                  → (window, f)
+    y[i] = target[i*stride + window : i*stride + window + horizon]
+    horizon=1 ve squeeze=True ise y (örnek,) şeklindedir.
+
+    Dönüş salt-okunur görünümlerdir; değiştirilecekse .copy() alın.
+    """
+    if window < 1 or horizon < 1 or stride < 1:
+        raise ValueError("window, horizon ve stride pozitif olmalı")
+
+    arr, tgt = _columns(data, features, target)
+    n, f = arr.shape
+    if len(tgt) != n:
+        raise ValueError("Hedef serisi girdiyle aynı uzunlukta olmalı")
+
+    n_samples = n - window - horizon + 1
+    if n_samples <= 0:
+        X = np.empty((0, window, f), dtype=arr.dtype)
+        y = np.empty((0,) if squeeze and horizon == 1 else (0, horizon), dtype=tgt.dtype)
+        return X, y
+
+    # (n - w + 1, f, w) → (n - w + 1, w, f): transpoz da görünümdür
+    X = sliding_window_view(arr, window, axis=0).transpose(0, 2, 1)[:n_samples:stride]
+    y = sliding_window_view(tgt[window:], horizon)[::stride]
+    if squeeze and horizon == 1:
+        y = y[:, 0]
+    return X, y
+
+
+def train_val_split(X, y, val_frac=0.2, test_frac=0.0, gap=0):
+    """
+    Kronolojik bölme; karıştırma yok. Dönen parçalar görünümdür.
+    gap: bölümler arasında atlanacak örnek sayısı. Örtüşen pencerelerde
+         sızıntıyı önlemek için (window + horizon - 1) / stride verilebilir.
+    test_frac > 0 ise üç parça (train, val, test), değilse iki parça döner.
+    """
+    n = len(X)
+    n_test = int(round(n * test_frac))
+    n_val = int(round(n * val_frac))
+    n_train = n - n_val - n_test - gap * ((n_val > 0) + (n_test > 0))
+    if n_train <= 0:
+        raise ValueError("Eğitim bölümü boş kalıyor; oranları ya da gap'i küçültün")
+
+    val_start = n_train + (gap if n_val else 0)
+    test_start = val_start + n_val + (gap if n_test else 0)
+
+    parts = [(X[:n_train], y[:n_train]), (X[val_start:val_start + n_val], y[val_start:val_start + n_val])]
+    if test_frac > 0:
+        parts.append((X[test_start:test_start + n_test], y[test_start:test_start + n_test]))
+    return tuple(parts)
+
+
+def iter_batches(X, y, batch_size=32, shuffle=False, seed=None, drop_last=False,
+                 dtype=np.float32):
+    """
+    (xb, yb) batch'lerini tembel üretir. Her batch bitişik, yazılabilir bir
+    kopyadır (torch.from_numpy / model.fit'e doğrudan verilebilir).
+    """
+    n = len(X)
+    order = np.random.default_rng(seed).permutation(n) if shuffle else None
+    stop = n - n % batch_size if drop_last else n
+
+    for start in range(0, stop, batch_size):
+        if order is None:
+            xb, yb = X[start:start + batch_size], y[start:start + batch_size]
+        else:
+            idx = order[start:start + batch_size]
+            xb, yb = X[idx], y[idx]
+        yield np.array(xb, dtype=dtype), np.array(yb, dtype=dtype)
+
+
+class WindowDataset:
+    """
+    torch.utils.data.DataLoader ile kullanılabilen map-style veri seti
+    (__len__ + __getitem__). Örnekler istendikçe kopyalanır; torch import
+    edilmez, tensöre dönüşümü DataLoader'ın collate'i yapar.
+    """
+
+    def __init__(self, X, y, dtype=np.float32):
+        if len(X) != len(y):
+            raise ValueError("X ve y aynı uzunlukta olmalı")
+        self.X = X
+        self.y = y
+        self.dtype = dtype
+
+    def __len__(self):
+        return len(self.X)
+
+    def __getitem__(self, i):
+        return np.array(self.X[i], dtype=self.dtype), np.array(self.y[i], dtype=self.dtype)
+
+
+def tf_dataset(X, y, batch_size=32, shuffle=False, seed=None):
+    """iter_batches üzerine tf.data.Dataset (tensorflow gerekir)."""
+    import tensorflow as tf
+
+    x_spec = tf.TensorSpec(shape=(None,) + tuple(X.shape[1:]), dtype=tf.float32)
+    y_spec = tf.TensorSpec(shape=(None,) + tuple(y.shape[1:]), dtype=tf.float32)
+    return tf.data.Dataset.from_generator(
+        lambda: iter_batches(X, y, batch_size, shuffle=shuffle, seed=seed),
+        output_signature=(x_spec, y_spec),
+    ).prefetch(tf.data.AUTOTUNE)